@@ -3,19 +3,52 @@ FastAPI Backend for Sri Lankan Lottery ML Analyzer
 Educational project - MSc AI Applied Machine Learning Assignment
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 from pathlib import Path
+import asyncio
+import hashlib
 import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# CatBoost and SHAP
-from catboost import CatBoostClassifier
-import shap
+# CatBoost is imported when the model loads and the SHAP engine (the 'tree'
+# engine imports shap: several seconds) when it is first needed, keeping
+# worker boot fast
+if TYPE_CHECKING:
+    from catboost import CatBoostClassifier
+    from src.explainability import ShapEngine
+
+# Project storage layer (Parquet with CSV fallback)
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.storage import (
+    DatasetCatalog, DatasetStore, DrawDatabase, FeatureSnapshotStore, MODEL_FEATURES,
+    ResultCache, ShapStore, SplitIndex, TREND_CODES
+)
+
+RAW_DATA_DIR = PROJECT_ROOT / "data" / "raw"
+raw_catalog = DatasetCatalog(RAW_DATA_DIR)
+processed_store = DatasetStore(PROJECT_ROOT / "data" / "processed")
+split_index = SplitIndex(PROJECT_ROOT / "data" / "splits", PROJECT_ROOT / "data" / "processed")
+
+# Indexed draw database (built with: python -m src.storage.draw_db)
+DRAW_DB_PATH = PROJECT_ROOT / "data" / "lottery.db"
+draw_db: Optional[DrawDatabase] = None
+
+# /lotteries response, rebuilt when a raw or featured file changes; file
+# signatures are rechecked at most every LOTTERIES_REVALIDATE_SECONDS
+LOTTERIES_REVALIDATE_SECONDS = 2.0
+lotteries_cache = {"checked_at": 0.0, "signature": None, "body": None, "etag": None}
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -34,18 +67,78 @@ app.add_middleware(
 )
 
 # Global variables for model and explainer
-MODEL_PATH = Path(__file__).parent.parent / "models" / "best_model.cbm"
-model: Optional[CatBoostClassifier] = None
-shap_explainer: Optional[shap.TreeExplainer] = None
+MODEL_PATH = PROJECT_ROOT / "models" / "best_model.cbm"
+
+# The model being served (model, fingerprint and SHAP engine). A reload builds
+# and warms up a new ServingModel, then swaps it in with one assignment;
+# requests take a single reference when they start, so in-flight requests
+# finish on the version they started with
+serving: Optional["ServingModel"] = None
+reload_lock = threading.Lock()
+
+# Reload when MODEL_PATH changes, checked every MODEL_WATCH_INTERVAL_SECONDS
+# (0 = off); POST /admin/reload-model reloads on demand
+MODEL_WATCH_INTERVAL_SECONDS = 5.0
+RELOAD_WARMUP_ROWS = 8  # Synthetic rows scored and explained before a swap
+model_watcher: Optional[asyncio.Task] = None
+
+# SHAP engine: 'catboost' (CatBoost's native SHAP values, no shap import) or
+# 'tree' (shap.TreeExplainer); both give identical values for this model
+SHAP_ENGINE = "catboost"
+
+# The SHAP explainer is built on the first explanation that is neither cached
+# nor precomputed; with EXPLAINER_WARMUP it is also built in the background
+# once the model is ready, so /predict is served without waiting for it
+EXPLAINER_WARMUP = True
+
+# CatBoost and SHAP run on this bounded pool so they never block the event loop
+INFERENCE_WORKERS = 4
+inference_executor: Optional[ThreadPoolExecutor] = None
 
 # Feature columns (must match training)
-FEATURE_COLS = [
-    'draw_id', 'draw_sequence', 'current_gap', 'mean_gap', 'std_gap',
-    'min_gap', 'max_gap', 'days_since_last', 'appearance_rate',
-    'frequency_last_10', 'frequency_last_30', 'frequency_last_50',
-    'frequency_all_time', 'temperature_score', 'trend', 'is_hot',
-    'is_cold', 'day_of_week', 'month', 'week_of_year', 'is_weekend'
-]
+FEATURE_COLS = MODEL_FEATURES
+
+# Categorical 'trend' encoded to numeric (must match training)
+TREND_MAPPING = TREND_CODES
+
+# Granular confidence levels based on visual scale (lower bound of each label)
+# 0-30%: High/Very High (Unlikely)
+# 30-40%: Medium (Unlikely)
+# 40-60%: Low (Unsure)
+# 60-70%: Medium (Likely)
+# 70-100%: High/Very High (Likely)
+CONFIDENCE_THRESHOLDS = np.array([0.25, 0.30, 0.40, 0.60, 0.70, 0.75])
+CONFIDENCE_LABELS = np.array([
+    "Very High (Unlikely)", "High (Unlikely)", "Medium (Unlikely)", "Low",
+    "Medium (Likely)", "High (Likely)", "Very High (Likely)"
+])
+
+# Latest test-split feature row per number, as float32 matrices built on first use.
+# Snapshots published to SNAPSHOT_SHARED_DIR (python -m src.utils.publish_snapshots,
+# or `python main.py` before starting its workers) are memory-mapped and shared
+# by all worker processes instead of being built per worker
+SNAPSHOT_MEMORY_BUDGET_MB = 64
+SNAPSHOT_SHARED_DIR = PROJECT_ROOT / FeatureSnapshotStore.DEFAULT_SHARED_DIR
+snapshot_store = FeatureSnapshotStore(
+    split_index,
+    FEATURE_COLS,
+    categorical_maps={'trend': TREND_MAPPING},
+    memory_budget_mb=SNAPSHOT_MEMORY_BUDGET_MB,
+    shared_dir=SNAPSHOT_SHARED_DIR
+)
+
+# Per-number /predict probabilities and /explain results, keyed on
+# (model fingerprint, lottery, snapshot data version, number) so a new model
+# or new feature data never serves a stale entry
+RESULT_CACHE_SIZE = 10_000
+RESULT_CACHE_TTL_SECONDS = 3600
+prediction_cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL_SECONDS)
+explanation_cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL_SECONDS)
+
+# SHAP values precomputed per (lottery, number) (python -m src.utils.precompute_shap);
+# rows computed from another model or older data fall back to on-demand SHAP
+SHAP_PRECOMPUTED_PATH = PROJECT_ROOT / ShapStore.DEFAULT_PATH
+shap_store = ShapStore(SHAP_PRECOMPUTED_PATH)
 
 
 # Pydantic models for request/response
@@ -92,6 +185,36 @@ class ExplanationResponse(BaseModel):
     top_5_features: List[FeatureContribution]
 
 
+class ExplainBatchRequest(BaseModel):
+    lottery: str = Field(..., description="Lottery name (e.g., 'nlb_mahajana_sampatha')")
+    numbers: List[int] = Field(..., description="List of numbers to explain (0-80)", min_items=1, max_items=80)
+    top_k: int = Field(5, description="Top contributing features returned per number", ge=1, le=len(FEATURE_COLS))
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "lottery": "nlb_mahajana_sampatha",
+                "numbers": [0, 1, 5, 7, 9],
+                "top_k": 5
+            }
+        }
+
+
+class NumberExplanation(BaseModel):
+    number: int
+    prediction: str
+    probability: float
+    feature_contributions: Dict[str, float]
+    top_features: List[FeatureContribution]
+
+
+class ExplainBatchResponse(BaseModel):
+    lottery: str
+    explanations: List[NumberExplanation]
+    not_found: List[int]  # Requested numbers without test data in this lottery
+    timestamp: str
+
+
 class LotteryInfo(BaseModel):
     name: str
     display_name: str
@@ -102,6 +225,14 @@ class LotteryInfo(BaseModel):
     draw_format: str  # e.g., "6 numbers + letter" or "4 numbers"
 
 
+class DrawRecord(BaseModel):
+    draw_id: int
+    draw_date: str
+    draw_sequence: Optional[int]
+    letter: Optional[str]
+    numbers: List[int]
+
+
 class ModelStats(BaseModel):
     model_type: str
     f1_score: float
@@ -112,116 +243,349 @@ class ModelStats(BaseModel):
     top_5_features: List[str]
 
 
+class ServingModel:
+    """A loaded model with its fingerprint and SHAP engine, replaced as a whole on reload"""
+
+    def __init__(self, blob: bytes):
+        """
+        Load a model from the bytes of a .cbm file
+
+        Loading from one read of the file guarantees the fingerprint matches the loaded model
+        """
+        from catboost import CatBoostClassifier
+
+        self.fingerprint = model_fingerprint_of(blob)
+        self.loaded_at = datetime.now().isoformat()
+        self.model: "CatBoostClassifier" = CatBoostClassifier()
+        self.model.load_model(blob=blob)
+        self.shap_explainer: Optional["ShapEngine"] = None
+        self._explainer_lock = threading.Lock()
+
+        if len(self.model.feature_names_) != len(FEATURE_COLS):
+            raise ValueError(
+                f"Model expects {len(self.model.feature_names_)} features, backend serves {len(FEATURE_COLS)}"
+            )
+
+    def explainer(self) -> "ShapEngine":
+        """SHAP engine of this model, built on first use (blocking, run on the inference pool)"""
+        if self.shap_explainer is None:
+            with self._explainer_lock:
+                if self.shap_explainer is None:
+                    from src.explainability import create_shap_engine
+
+                    self.shap_explainer = create_shap_engine(self.model, SHAP_ENGINE)
+                    print(f"✓ SHAP explainer initialized ({SHAP_ENGINE})")
+        return self.shap_explainer
+
+    def warm_up(self, rows: int = RELOAD_WARMUP_ROWS):
+        """Score and explain synthetic rows, so no request pays for lazy initialization"""
+        features = np.random.default_rng(0).random((rows, len(FEATURE_COLS)), dtype=np.float32)
+        self.model.predict_proba(features)
+        self.explainer().shap_values(features)
+
+
+def model_fingerprint_of(blob: bytes) -> str:
+    """Content hash of a model file (same as file_hash(path)[:16] used by precompute_shap)"""
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
 # Startup event - load model
 @app.on_event("startup")
 async def load_model():
-    """Load CatBoost model and SHAP explainer on startup"""
-    global model, shap_explainer
+    """Load CatBoost model on startup; the SHAP explainer follows in the background"""
+    global serving, inference_executor, model_watcher
+
+    inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
 
     try:
         if not MODEL_PATH.exists():
             raise FileNotFoundError(f"Model not found at {MODEL_PATH}")
 
-        model = CatBoostClassifier()
-        model.load_model(str(MODEL_PATH))
-
-        # Create SHAP explainer
-        shap_explainer = shap.TreeExplainer(model)
+        serving = ServingModel(MODEL_PATH.read_bytes())
 
         print(f"✓ Model loaded successfully from {MODEL_PATH}")
-        print(f"✓ SHAP explainer initialized")
 
     except Exception as e:
         print(f"✗ Error loading model: {e}")
         raise
 
+    if EXPLAINER_WARMUP:
+        inference_executor.submit(_warm_up_explainer, serving)
+
+    if MODEL_WATCH_INTERVAL_SECONDS:
+        model_watcher = asyncio.create_task(watch_model_file())
+
+
+def _warm_up_explainer(current: ServingModel):
+    try:
+        current.explainer()
+    except Exception as e:
+        # Retried (and reported) by the first explanation that needs it
+        print(f"✗ Error initializing SHAP explainer: {e}")
+
+
+def reload_model(force: bool = False) -> Dict:
+    """
+    Load MODEL_PATH, warm it up and swap it in (blocking; the current model keeps serving meanwhile)
+
+    Args:
+        force: Reload even if the file content did not change
+
+    Returns:
+        Reload status with the active and previous model fingerprints
+    """
+    global serving
+
+    with reload_lock:
+        previous = serving
+        blob = MODEL_PATH.read_bytes()
+
+        if not force and previous is not None and model_fingerprint_of(blob) == previous.fingerprint:
+            return {"status": "unchanged", "model_fingerprint": previous.fingerprint}
+
+        candidate = ServingModel(blob)
+        candidate.warm_up()
+
+        # Atomic swap: requests already holding `previous` finish with it
+        serving = candidate
+
+    print(f"✓ Model reloaded: {previous.fingerprint if previous else None} -> {candidate.fingerprint}")
+    return {
+        "status": "reloaded",
+        "model_fingerprint": candidate.fingerprint,
+        "previous_fingerprint": previous.fingerprint if previous else None,
+        "loaded_at": candidate.loaded_at
+    }
+
+
+def _model_file_signature() -> Optional[Tuple[int, int]]:
+    try:
+        stat = MODEL_PATH.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+async def watch_model_file():
+    """Reload the model whenever MODEL_PATH changes on disk"""
+    signature = _model_file_signature()
+
+    while True:
+        await asyncio.sleep(MODEL_WATCH_INTERVAL_SECONDS)
+
+        current = _model_file_signature()
+        if current is None or current == signature:
+            continue
+        signature = current
+
+        try:
+            await asyncio.to_thread(reload_model)
+        except Exception as e:
+            # Keep serving the current model; a file still being written is
+            # retried once its signature changes again
+            print(f"✗ Model reload failed, still serving {serving.fingerprint if serving else None}: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    """Stop the model watcher and the inference pool"""
+    if model_watcher is not None:
+        model_watcher.cancel()
+    if inference_executor is not None:
+        inference_executor.shutdown(wait=False)
+
+
+async def run_inference(func, *args):
+    """Run CPU-bound model/SHAP work on the inference pool and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(inference_executor, func, *args)
+
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Check API and model status"""
+    current = serving
     return {
         "status": "healthy",
-        "model_loaded": model is not None,
-        "shap_loaded": shap_explainer is not None,
+        "model_loaded": current is not None,
+        "shap_loaded": current is not None and current.shap_explainer is not None,
+        "model_fingerprint": current.fingerprint if current else None,
+        "model_loaded_at": current.loaded_at if current else None,
         "timestamp": datetime.now().isoformat()
     }
 
 
+# Model hot reload
+@app.post("/admin/reload-model")
+async def reload_model_endpoint(force: bool = False):
+    """
+    Load the model file again, warm it up and swap it in without dropping requests
+
+    Unchanged files are skipped unless force=true
+    """
+    try:
+        return await asyncio.to_thread(reload_model, force)
+    except Exception as e:
+        current = serving
+        raise HTTPException(
+            status_code=500,
+            detail=f"Model reload failed, still serving {current.fingerprint if current else None}: {e}"
+        )
+
+
+# Result cache statistics
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters of the result caches and feature snapshot memory use"""
+    return {
+        "model_fingerprint": serving.fingerprint if serving else None,
+        "predict": prediction_cache.stats(),
+        "explain": explanation_cache.stats(),
+        "precomputed_shap": shap_store.stats(),
+        "snapshots": snapshot_store.stats()
+    }
+
+
 # Get available lotteries
 @app.get("/lotteries", response_model=List[LotteryInfo])
-async def get_lotteries():
-    """Get list of available lotteries"""
+async def get_lotteries(request: Request):
+    """
+    Get list of available lotteries
+
+    Served from memory with an ETag; clients sending a matching If-None-Match get 304
+    """
+    body, etag = await _cached_lotteries()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag in [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _cached_lotteries() -> Tuple[bytes, str]:
+    """Serialized /lotteries body and its ETag, rebuilt only when the underlying files change"""
+    now = time.monotonic()
+    if lotteries_cache["body"] is not None and now - lotteries_cache["checked_at"] < LOTTERIES_REVALIDATE_SECONDS:
+        return lotteries_cache["body"], lotteries_cache["etag"]
+
+    signature = await asyncio.to_thread(_lotteries_signature)
+    if signature != lotteries_cache["signature"]:
+        lotteries = await asyncio.to_thread(_load_lotteries)
+        body = json.dumps(jsonable_encoder(lotteries), separators=(",", ":")).encode("utf-8")
+        lotteries_cache.update(
+            signature=signature,
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        )
+    lotteries_cache["checked_at"] = now
+    return lotteries_cache["body"], lotteries_cache["etag"]
+
 
-    # Load lottery metadata from data
-    data_dir = Path(__file__).parent.parent / "data" / "raw"
-    processed_dir = Path(__file__).parent.parent / "data" / "processed"
+def _lotteries_signature() -> Tuple:
+    """mtime and size of every raw and featured file /lotteries is built from"""
+    signature = []
+    for file in sorted(RAW_DATA_DIR.glob("*.csv")):
+        for path in (file, processed_store.source_path(f"{file.stem}_featured")):
+            if path.exists():
+                stat = path.stat()
+                signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _load_lotteries() -> List[LotteryInfo]:
+    """Build lottery metadata from the raw data catalog and featured data (blocking file I/O)"""
+
+    # Draw count, numbers per draw and letter of each raw file (read only when
+    # the catalog manifest is stale)
+    summaries = raw_catalog.summaries(include_prizes=True)
 
     lotteries = []
-    if data_dir.exists():
-        for file in sorted(data_dir.glob("*.csv")):
-            lottery_name = file.stem
-
-            # Load raw file to get draw count, numbers per draw, and letter
-            df_raw = pd.read_csv(file)
-
-            # Extract numbers_per_draw and has_letter from first row
-            numbers_per_draw = 6  # Default
-            has_letter = False
-            if len(df_raw) > 0:
-                if 'numbers' in df_raw.columns:
-                    first_numbers = df_raw['numbers'].iloc[0]
-                    if isinstance(first_numbers, str):
-                        numbers_per_draw = len(first_numbers.split(';'))
-
-                # Check if lottery has a letter column with non-empty values
-                if 'letter' in df_raw.columns:
-                    first_letter = df_raw['letter'].iloc[0]
-                    has_letter = pd.notna(first_letter) and str(first_letter).strip() != ''
-
-            # Get actual number range from processed featured data
-            featured_file = processed_dir / f"{lottery_name}_featured.csv"
-            number_range = "0-9"  # Default
-            if featured_file.exists():
-                df_featured = pd.read_csv(featured_file)
-                if 'number' in df_featured.columns:
-                    min_num = int(df_featured['number'].min())
-                    max_num = int(df_featured['number'].max())
-                    number_range = f"{min_num}-{max_num}"
-
-            # Create format string
-            if has_letter:
-                draw_format = f"{numbers_per_draw} numbers + letter"
-            else:
-                draw_format = f"{numbers_per_draw} numbers"
-
-            lotteries.append(LotteryInfo(
-                name=lottery_name,
-                display_name=lottery_name.replace("_", " ").title(),
-                number_range=number_range,  # Actual range from processed data
-                draws_in_dataset=len(df_raw),
-                numbers_per_draw=numbers_per_draw,
-                has_letter=has_letter,
-                draw_format=draw_format
-            ))
+    for lottery_name in sorted(summaries):
+        summary = summaries[lottery_name]
+
+        # numbers_per_draw and has_letter come from the first row
+        numbers_per_draw = summary.get("numbers_per_draw") or 6  # Default
+        has_letter = summary["has_letter"]
+
+        # Get actual number range from processed featured data (Parquet statistics, no data read)
+        featured_name = f"{lottery_name}_featured"
+        number_range = "0-9"  # Default
+        if processed_store.exists(featured_name):
+            min_num, max_num = processed_store.column_range(featured_name, "number")
+            if min_num is not None:
+                number_range = f"{int(min_num)}-{int(max_num)}"
+
+        # Create format string
+        if has_letter:
+            draw_format = f"{numbers_per_draw} numbers + letter"
+        else:
+            draw_format = f"{numbers_per_draw} numbers"
+
+        lotteries.append(LotteryInfo(
+            name=lottery_name,
+            display_name=lottery_name.replace("_", " ").title(),
+            number_range=number_range,  # Actual range from processed data
+            draws_in_dataset=summary["rows"],
+            numbers_per_draw=numbers_per_draw,
+            has_letter=has_letter,
+            draw_format=draw_format
+        ))
 
     return lotteries
 
 
+# Get draw history from the indexed draw database
+@app.get("/draws/{lottery}", response_model=List[DrawRecord])
+async def get_draws(
+    lottery: str,
+    start_sequence: Optional[int] = None,
+    end_sequence: Optional[int] = None,
+    limit: Optional[int] = 50
+):
+    """
+    Get draws of a lottery by draw_sequence range (latest `limit` draws by default)
+    """
+    global draw_db
+
+    if not DRAW_DB_PATH.exists():
+        raise HTTPException(
+            status_code=503,
+            detail="Draw database not built. Run: python -m src.storage.draw_db"
+        )
+    if draw_db is None:
+        draw_db = DrawDatabase(DRAW_DB_PATH)
+
+    df = await asyncio.to_thread(draw_db.draws, lottery.lower(), start_sequence, end_sequence, limit)
+    if len(df) == 0:
+        raise HTTPException(status_code=404, detail=f"No draws found for lottery: {lottery}")
+
+    return [
+        DrawRecord(
+            draw_id=int(row.draw_id),
+            draw_date=row.draw_date,
+            draw_sequence=None if pd.isna(row.draw_sequence) else int(row.draw_sequence),
+            letter=row.letter,
+            numbers=[int(n) for n in row.numbers.split(';')]
+        )
+        for row in df.itertuples(index=False)
+    ]
+
+
 # Get model statistics
 @app.get("/statistics", response_model=ModelStats)
 async def get_statistics():
     """Get model performance statistics"""
 
-    if model is None:
+    if serving is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
     # Load SHAP results for top features
-    shap_file = Path(__file__).parent.parent / "outputs" / "explainability" / "shap" / "shap_feature_importance.csv"
+    shap_file = PROJECT_ROOT / "outputs" / "explainability" / "shap" / "shap_feature_importance.csv"
 
     top_features = []
     if shap_file.exists():
-        df = pd.read_csv(shap_file)
+        df = await asyncio.to_thread(pd.read_csv, shap_file)
         top_features = df.head(5)['feature'].tolist()
 
     return ModelStats(
@@ -244,7 +608,8 @@ async def predict(request: PredictionRequest):
     Returns probability of each number appearing in the next draw
     """
 
-    if model is None:
+    current = serving
+    if current is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
     # Validate input
@@ -261,80 +626,16 @@ async def predict(request: PredictionRequest):
     }
 
     lottery_file = lottery_name_map.get(request.lottery, request.lottery.lower())
-    test_data_path = Path(__file__).parent.parent / "data" / "splits" / f"{lottery_file}_test.csv"
 
-    if not test_data_path.exists():
+    if not snapshot_store.exists(lottery_file):
         raise HTTPException(
             status_code=404,
             detail=f"Test data not found for lottery: {request.lottery}. "
                    f"Available lotteries can be fetched from /lotteries endpoint."
         )
 
-    # Load test data
-    df_test = pd.read_csv(test_data_path)
-
-    # Encode categorical 'trend' column to numeric if present
-    if 'trend' in df_test.columns:
-        trend_mapping = {
-            'heating_up': 1,
-            'cooling_down': -1,
-            'stable': 0
-        }
-        df_test['trend'] = df_test['trend'].map(trend_mapping).fillna(0)
-
-    predictions = []
-
-    # Note: Different lotteries have different number ranges:
-    # - NLB lotteries: Single digits 0-9
-    # - DLB lotteries: Two-digit numbers 1-80
-
-    for number in request.numbers:
-        # Get most recent features for this number from test data
-        number_data = df_test[df_test['number'] == number].tail(1)
-
-        if len(number_data) == 0:
-            # Number not found in test data - skip this number
-            # This can happen if user selects a number outside the lottery's range
-            continue
-
-        # Extract features in correct order
-        features = number_data[FEATURE_COLS].copy()
-
-        # Get prediction
-        proba = model.predict_proba(features)[0]
-        prob_appear = proba[1]
-
-        # Determine prediction and confidence with directional granularity
-        prediction = "Appear" if prob_appear > 0.5 else "Not Appear"
-
-        # Granular confidence levels based on visual scale
-        # 0-30%: High/Very High (Unlikely)
-        # 30-40%: Medium (Unlikely)
-        # 40-60%: Low (Unsure)
-        # 60-70%: Medium (Likely)
-        # 70-100%: High/Very High (Likely)
-
-        if prob_appear >= 0.75:
-            confidence = "Very High (Likely)"
-        elif prob_appear >= 0.70:
-            confidence = "High (Likely)"
-        elif prob_appear >= 0.60:
-            confidence = "Medium (Likely)"
-        elif prob_appear >= 0.40:
-            confidence = "Low"
-        elif prob_appear >= 0.30:
-            confidence = "Medium (Unlikely)"
-        elif prob_appear >= 0.25:
-            confidence = "High (Unlikely)"
-        else:
-            confidence = "Very High (Unlikely)"
-
-        predictions.append(NumberPrediction(
-            number=number,  # Return original number
-            probability=round(prob_appear, 4),
-            prediction=prediction,
-            confidence=confidence
-        ))
+    # Score off the event loop
+    predictions = await run_inference(_score_numbers, current, lottery_file, request.numbers)
 
     # Sort by probability and get top 5
     sorted_predictions = sorted(predictions, key=lambda x: x.probability, reverse=True)
@@ -349,6 +650,51 @@ async def predict(request: PredictionRequest):
     )
 
 
+def _score_numbers(current: ServingModel, lottery_file: str, requested: List[int]) -> List[NumberPrediction]:
+    """Predictions for the requested numbers of a lottery (CPU-bound, runs on the inference pool)"""
+
+    # Latest test data features per number (built once per lottery)
+    snapshot = snapshot_store.get(lottery_file)
+
+    # Note: Different lotteries have different number ranges:
+    # - NLB lotteries: Single digits 0-9
+    # - DLB lotteries: Two-digit numbers 1-80
+
+    # Features of all requested numbers in correct order; numbers not found in
+    # test data (outside the lottery's range) are skipped
+    numbers, features = snapshot.rows(requested)
+
+    predictions = []
+    if numbers:
+        # Cached probabilities first; score the rest in one call
+        keys = [(current.fingerprint, lottery_file, snapshot.version, number) for number in numbers]
+        cached = [prediction_cache.get(key) for key in keys]
+        missing = [i for i, prob in enumerate(cached) if prob is None]
+
+        prob_appear = np.array([0.0 if prob is None else prob for prob in cached])
+        if missing:
+            prob_appear[missing] = current.model.predict_proba(features[missing])[:, 1]
+            for i in missing:
+                prediction_cache.put(keys[i], float(prob_appear[i]))
+
+        # Determine prediction and confidence with directional granularity
+        prediction = np.where(prob_appear > 0.5, "Appear", "Not Appear")
+        confidence = CONFIDENCE_LABELS[np.searchsorted(CONFIDENCE_THRESHOLDS, prob_appear, side='right')]
+        probability = np.round(prob_appear, 4)
+
+        predictions = [
+            NumberPrediction(
+                number=number,  # Return original number
+                probability=float(probability[i]),
+                prediction=str(prediction[i]),
+                confidence=str(confidence[i])
+            )
+            for i, number in enumerate(numbers)
+        ]
+
+    return predictions
+
+
 # Explanation endpoint
 @app.get("/explain/{number}", response_model=ExplanationResponse)
 async def explain_prediction(number: int, lottery: str = "MAHAJANA_SAMPATHA"):
@@ -356,8 +702,9 @@ async def explain_prediction(number: int, lottery: str = "MAHAJANA_SAMPATHA"):
     Get SHAP explanation for a number prediction
     """
 
-    if model is None or shap_explainer is None:
-        raise HTTPException(status_code=503, detail="Model or explainer not loaded")
+    current = serving
+    if current is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
 
     if not 0 <= number <= 80:
         raise HTTPException(status_code=400, detail="Number must be between 0 and 80")
@@ -371,75 +718,171 @@ async def explain_prediction(number: int, lottery: str = "MAHAJANA_SAMPATHA"):
     }
 
     lottery_file = lottery_name_map.get(lottery, lottery.lower())
-    test_data_path = Path(__file__).parent.parent / "data" / "splits" / f"{lottery_file}_test.csv"
 
-    if not test_data_path.exists():
+    if not snapshot_store.exists(lottery_file):
         raise HTTPException(
             status_code=404,
             detail=f"Test data not found for lottery: {lottery}. Using default lottery."
         )
 
-    # Load test data and get features for this number
-    df_test = pd.read_csv(test_data_path)
-
-    # Encode categorical 'trend' column to numeric if present
-    if 'trend' in df_test.columns:
-        trend_mapping = {
-            'heating_up': 1,
-            'cooling_down': -1,
-            'stable': 0
-        }
-        df_test['trend'] = df_test['trend'].map(trend_mapping).fillna(0)
-
     # Convert to single digit (0-9) for model compatibility
     digit = number % 10
 
-    number_data = df_test[df_test['number'] == digit].tail(1)
+    # Predict and explain off the event loop
+    explained = await run_inference(_explain_digit, current, lottery_file, digit)
 
-    if len(number_data) == 0:
+    if explained is None:
         raise HTTPException(
             status_code=404,
             detail=f"No historical data found for digit {digit} (from number {number}) in {lottery}."
         )
 
-    # Extract features in correct order
-    features = number_data[FEATURE_COLS].copy()
-
-    # Get prediction
-    proba = model.predict_proba(features)[0]
-    prob_appear = proba[1]
+    prob_appear, contributions = explained
     prediction = "Appear" if prob_appear > 0.5 else "Not Appear"
 
-    # Get SHAP values
-    shap_values = shap_explainer.shap_values(features)
+    return ExplanationResponse(
+        number=number,
+        prediction=prediction,
+        probability=round(prob_appear, 4),
+        feature_contributions=contributions,
+        top_5_features=_top_features(contributions, 5)
+    )
 
-    # Extract feature contributions for class 1 (Appear)
-    # For binary classification, shap_values is a 2D array [1 sample, n features]
-    contributions = {}
-    if isinstance(shap_values, list):
-        # If shap_values is a list (one array per class), use class 1
-        shap_array = shap_values[1] if len(shap_values) > 1 else shap_values[0]
-    else:
-        # For binary classification, CatBoost returns values for class 1 directly
-        shap_array = shap_values
 
-    for i, feature in enumerate(FEATURE_COLS):
-        contributions[feature] = float(shap_array[0][i])
+# Batch explanation endpoint
+@app.post("/explain/batch", response_model=ExplainBatchResponse)
+async def explain_batch(request: ExplainBatchRequest):
+    """
+    Get SHAP explanations for several numbers in one call
+
+    All numbers without a cached or precomputed explanation are explained
+    with a single vectorized SHAP call
+    """
+
+    current = serving
+    if current is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
+    if not all(0 <= num <= 80 for num in request.numbers):
+        raise HTTPException(status_code=400, detail="Numbers must be between 0 and 80")
+
+    lottery_name_map = {
+        'MAHAJANA_SAMPATHA': 'nlb_mahajana_sampatha',
+        'nlb_mahajana_sampatha': 'nlb_mahajana_sampatha',
+        'dlb_lagna_wasana': 'dlb_lagna_wasana',
+        'DLB_LAGNA_WASANA': 'dlb_lagna_wasana'
+    }
+
+    lottery_file = lottery_name_map.get(request.lottery, request.lottery.lower())
+
+    if not snapshot_store.exists(lottery_file):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Test data not found for lottery: {request.lottery}. "
+                   f"Available lotteries can be fetched from /lotteries endpoint."
+        )
+
+    # Convert to single digits (0-9) for model compatibility, as /explain does
+    digits = [number % 10 for number in request.numbers]
+
+    # Predict and explain off the event loop
+    explained = await run_inference(_explain_digits, current, lottery_file, digits)
+
+    explanations = []
+    not_found = []
+    for number, digit in zip(request.numbers, digits):
+        if digit not in explained:
+            not_found.append(number)
+            continue
+
+        prob_appear, contributions = explained[digit]
+        explanations.append(NumberExplanation(
+            number=number,
+            prediction="Appear" if prob_appear > 0.5 else "Not Appear",
+            probability=round(prob_appear, 4),
+            feature_contributions=contributions,
+            top_features=_top_features(contributions, request.top_k)
+        ))
+
+    return ExplainBatchResponse(
+        lottery=request.lottery,
+        explanations=explanations,
+        not_found=not_found,
+        timestamp=datetime.now().isoformat()
+    )
+
 
-    # Get top 5 absolute contributions
+def _top_features(contributions: Dict[str, float], k: int) -> List[FeatureContribution]:
+    """The k largest absolute SHAP contributions"""
     sorted_contributions = sorted(contributions.items(), key=lambda x: abs(x[1]), reverse=True)
-    top_5_features = [
+    return [
         FeatureContribution(feature=feat, contribution=round(contrib, 4))
-        for feat, contrib in sorted_contributions[:5]
+        for feat, contrib in sorted_contributions[:k]
     ]
 
-    return ExplanationResponse(
-        number=number,
-        prediction=prediction,
-        probability=round(prob_appear, 4),
-        feature_contributions=contributions,
-        top_5_features=top_5_features
-    )
+
+def _explain_digit(
+    current: ServingModel,
+    lottery_file: str,
+    digit: int
+) -> Optional[Tuple[float, Dict[str, float]]]:
+    """Probability and SHAP contributions for a digit (CPU-bound, runs on the inference pool)"""
+    return _explain_digits(current, lottery_file, [digit]).get(digit)
+
+
+def _explain_digits(
+    current: ServingModel,
+    lottery_file: str,
+    digits: List[int]
+) -> Dict[int, Tuple[float, Dict[str, float]]]:
+    """
+    Probability and SHAP contributions per digit (CPU-bound, runs on the inference pool)
+
+    Digits without test data are left out; those not cached or precomputed
+    are scored and explained together in one predict_proba / shap_values call
+    """
+
+    # Latest test data features for the distinct digits, in correct order
+    snapshot = snapshot_store.get(lottery_file)
+    found, features = snapshot.rows(list(dict.fromkeys(digits)))
+
+    explained = {}
+    missing = []
+    for i, digit in enumerate(found):
+        key = (current.fingerprint, lottery_file, snapshot.version, digit)
+        cached = explanation_cache.get(key)
+
+        if cached is None:
+            precomputed = shap_store.lookup(lottery_file, digit, snapshot.version, current.fingerprint)
+            if precomputed is not None:
+                prob_appear, shap_row = precomputed
+                cached = (prob_appear, dict(zip(FEATURE_COLS, shap_row.tolist())))
+                explanation_cache.put(key, cached)
+
+        if cached is None:
+            missing.append(i)
+        else:
+            explained[digit] = cached
+
+    if not missing:
+        return explained
+
+    rows = features[missing]
+
+    # Get predictions
+    prob_appear = current.model.predict_proba(rows)[:, 1]
+
+    # Get SHAP values: feature contributions for class 1 (Appear), [n samples, n features]
+    shap_array = current.explainer().shap_values(rows)
+
+    for row, i in enumerate(missing):
+        digit = found[i]
+        contributions = {feature: float(shap_array[row][j]) for j, feature in enumerate(FEATURE_COLS)}
+
+        explained[digit] = (prob_appear[row], contributions)
+        explanation_cache.put((current.fingerprint, lottery_file, snapshot.version, digit), explained[digit])
+
+    return explained
 
 
 # File viewer endpoint
@@ -455,7 +898,7 @@ async def get_file(file_path: str):
     - docs/*.md
     """
     # Define project root (parent of backend folder)
-    project_root = Path(__file__).parent.parent
+    project_root = PROJECT_ROOT
 
     # Security: only allow certain directories
     allowed_dirs = ['src/preprocessing', 'notebooks', 'outputs', 'docs']
@@ -486,8 +929,7 @@ async def get_file(file_path: str):
 
     # Read and return file contents
     try:
-        with open(file_full_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = await asyncio.to_thread(file_full_path.read_text, encoding='utf-8')
         return PlainTextResponse(content)
     except UnicodeDecodeError:
         raise HTTPException(
@@ -512,10 +954,14 @@ async def root():
         "warning": "NOT intended for commercial gambling use",
         "endpoints": {
             "health": "/health",
+            "reload_model": "/admin/reload-model (POST)",
+            "cache_stats": "/cache/stats",
             "lotteries": "/lotteries",
+            "draws": "/draws/{lottery}",
             "statistics": "/statistics",
             "predict": "/predict (POST)",
             "explain": "/explain/{number}",
+            "explain_batch": "/explain/batch (POST)",
             "files": "/api/files/{file_path:path}",
             "docs": "/docs"
         }
@@ -523,5 +969,24 @@ async def root():
 
 
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    parser = argparse.ArgumentParser(description="Lottery ML Analyzer API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    args = parser.parse_args()
+
+    # Publish the feature snapshots once, so every worker maps the same arrays
+    try:
+        manifest = snapshot_store.publish()
+        print(f"✓ Feature snapshots published to {manifest}")
+    except Exception as e:
+        print(f"✗ Feature snapshots not published, workers build their own: {e}")
+
+    if args.workers > 1:
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers,
+                    app_dir=str(Path(__file__).parent))
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,166 @@
+"""
+Request latency of the FastAPI backend.
+
+Drives the app in-process with FastAPI's TestClient (no server needed) and
+reports p50/p99 latency per endpoint:
+- POST /predict with 80 numbers
+- GET /explain/{number}
+- POST /explain/batch with 20 numbers
+
+With --concurrency N, N clients instead send /explain and /predict requests
+back to back on one event loop (httpx ASGI transport) while a probe polls
+/health, so any handler that blocks the loop shows up as /health tail latency.
+
+Usage (from the project root):
+    python benchmarks/backend_bench.py
+    python benchmarks/backend_bench.py --lotteries dlb_ada_kotipathi --requests 200
+    python benchmarks/backend_bench.py --concurrency 8 --duration 5
+    python benchmarks/backend_bench.py --output outputs/benchmarks/backend.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'backend'))
+
+warnings.filterwarnings('ignore')
+
+
+def _latencies(call, requests: int, warmup: int = 3) -> np.ndarray:
+    for _ in range(warmup):
+        call()
+    times = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = call()
+        times.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.status_code}: {response.text}")
+    return np.array(times) * 1000
+
+
+async def _mixed_load(app, lottery: str, concurrency: int, duration: float) -> dict:
+    """Latencies (ms) per endpoint while `concurrency` clients keep /explain and /predict busy."""
+    import httpx
+
+    latencies = {'health': [], 'explain': [], 'predict_80': []}
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            deadline = time.perf_counter() + duration
+
+            async def timed(endpoint, request):
+                start = time.perf_counter()
+                response = await request
+                latencies[endpoint].append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{response.status_code}: {response.text}")
+
+            async def client_loop(worker: int):
+                while time.perf_counter() < deadline:
+                    if worker % 2 == 0:
+                        await timed('explain', client.get('/explain/3', params={'lottery': lottery}))
+                    else:
+                        await timed('predict_80', client.post(
+                            '/predict', json={'lottery': lottery, 'numbers': list(range(80))}))
+
+            async def health_probe():
+                while time.perf_counter() < deadline:
+                    await timed('health', client.get('/health'))
+                    await asyncio.sleep(0.005)
+
+            await asyncio.gather(health_probe(), *(client_loop(worker) for worker in range(concurrency)))
+
+    return {endpoint: np.array(times) for endpoint, times in latencies.items()}
+
+
+def _sequential(backend, lotteries, requests: int) -> list:
+    """p50/p99 of back-to-back requests per lottery and endpoint."""
+    from fastapi.testclient import TestClient
+
+    rows = []
+    with TestClient(backend.app) as client:
+        for lottery in lotteries:
+            endpoints = {
+                'predict_80': lambda: client.post(
+                    '/predict', json={'lottery': lottery, 'numbers': list(range(80))}),
+                'explain': lambda: client.get('/explain/3', params={'lottery': lottery}),
+                'explain_batch_20': lambda: client.post(
+                    '/explain/batch', json={'lottery': lottery, 'numbers': list(range(20))}),
+            }
+            for endpoint, call in endpoints.items():
+                times = _latencies(call, requests)
+                rows.append({
+                    'lottery': lottery,
+                    'endpoint': endpoint,
+                    'requests': len(times),
+                    'p50_ms': float(np.percentile(times, 50)),
+                    'p99_ms': float(np.percentile(times, 99)),
+                    'mean_ms': float(times.mean()),
+                })
+    return rows
+
+
+def _print_rows(rows: list):
+    print(f"\n{'Lottery':<28} {'Endpoint':<18} {'Requests':>8} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    print("-"*83)
+    for row in rows:
+        print(f"{row['lottery']:<28} {row['endpoint']:<18} {row['requests']:>8} "
+              f"{row['p50_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['mean_ms']:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backend request latency benchmark')
+    parser.add_argument('--lotteries', nargs='*', default=['dlb_ada_kotipathi', 'nlb_mahajana_sampatha'])
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=0,
+                        help='Concurrent clients for the mixed-load run (0 = sequential requests only)')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per mixed-load run')
+    parser.add_argument('--output', type=str, help='Write results as JSON')
+    args = parser.parse_args()
+
+    import main as backend
+
+    rows = []
+    if args.concurrency:
+        for lottery in args.lotteries:
+            results = asyncio.run(_mixed_load(backend.app, lottery, args.concurrency, args.duration))
+            for endpoint, times in results.items():
+                # An endpoint starved for the whole run has no samples
+                rows.append({
+                    'lottery': lottery,
+                    'endpoint': f"{endpoint}@{args.concurrency}",
+                    'requests': len(times),
+                    'p50_ms': float(np.percentile(times, 50)) if len(times) else float('nan'),
+                    'p99_ms': float(np.percentile(times, 99)) if len(times) else float('nan'),
+                    'mean_ms': float(times.mean()) if len(times) else float('nan'),
+                })
+    else:
+        rows = _sequential(backend, args.lotteries, args.requests)
+
+    _print_rows(rows)
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'results': rows
+        }, indent=2))
+        print(f"\nResults saved to: {output_path}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Cold start of the FastAPI backend.
+
+Boots the backend in fresh interpreter processes and reports, per phase:
+- import: `import main` (module load)
+- startup: startup hook (model load)
+- first_predict: first POST /predict with 80 numbers
+- time_to_first_prediction: process start to first /predict response
+- first_explain: first GET /explain served with on-demand SHAP (precomputed
+  explanations disabled), which includes building the explainer unless the
+  background warm-up already did
+
+With --importtime, also prints the slowest top-level imports of `main`
+(from `python -X importtime`).
+
+Usage (from the project root):
+    python benchmarks/cold_start_bench.py
+    python benchmarks/cold_start_bench.py --runs 5 --importtime
+    python benchmarks/cold_start_bench.py --no-warmup
+    python benchmarks/cold_start_bench.py --output outputs/benchmarks/cold_start.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BACKEND_DIR = PROJECT_ROOT / 'backend'
+
+PHASES = ['import', 'startup', 'first_predict', 'time_to_first_prediction', 'first_explain']
+
+
+def _child(lottery: str, warmup: bool):
+    """Boot the backend in this (fresh) process and print phase timings as JSON."""
+    process_start = time.perf_counter()
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    import warnings
+    warnings.filterwarnings('ignore')
+
+    start = time.perf_counter()
+    import main as backend
+    timings = {'import': time.perf_counter() - start}
+
+    from fastapi.testclient import TestClient
+    from src.storage import ShapStore
+
+    backend.EXPLAINER_WARMUP = warmup
+    backend.shap_store = ShapStore(PROJECT_ROOT / 'outputs' / 'benchmarks' / 'no_precomputed_shap.npz')
+
+    start = time.perf_counter()
+    with TestClient(backend.app) as client:
+        timings['startup'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = client.post('/predict', json={'lottery': lottery, 'numbers': list(range(80))})
+        timings['first_predict'] = time.perf_counter() - start
+        timings['time_to_first_prediction'] = time.perf_counter() - process_start
+        response.raise_for_status()
+
+        start = time.perf_counter()
+        response = client.get('/explain/3', params={'lottery': lottery})
+        timings['first_explain'] = time.perf_counter() - start
+        response.raise_for_status()
+
+    print(json.dumps(timings))
+
+
+def _import_profile(top: int = 12) -> list:
+    """(module, cumulative seconds) of the slowest top-level imports of main."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Direct imports of main are indented by exactly two spaces
+        name = name[1:]
+        if name.startswith('  ') and not name.startswith('   '):
+            modules.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(modules, key=lambda module: -module[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backend cold start benchmark')
+    parser.add_argument('--lottery', default='nlb_mahajana_sampatha')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--no-warmup', action='store_true',
+                        help='Disable the background SHAP explainer warm-up')
+    parser.add_argument('--importtime', action='store_true', help='Print the import-time profile of main')
+    parser.add_argument('--output', type=str, help='Write results as JSON')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.lottery, not args.no_warmup)
+        return 0
+
+    runs = []
+    for _ in range(args.runs):
+        command = [sys.executable, __file__, '--child', '--lottery', args.lottery]
+        if args.no_warmup:
+            command.append('--no-warmup')
+        result = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    summary = {phase: float(np.median([run[phase] for run in runs])) for phase in PHASES}
+
+    print(f"\nCold start ({args.runs} runs, explainer warm-up {'off' if args.no_warmup else 'on'})")
+    print(f"{'Phase':<28} {'median s':>9} {'min s':>9} {'max s':>9}")
+    print("-"*58)
+    for phase in PHASES:
+        values = [run[phase] for run in runs]
+        print(f"{phase:<28} {summary[phase]:>9.3f} {min(values):>9.3f} {max(values):>9.3f}")
+
+    profile = []
+    if args.importtime:
+        profile = _import_profile()
+        print(f"\n{'Import of main':<28} {'cumulative s':>12}")
+        print("-"*41)
+        for module, seconds in profile:
+            print(f"{module:<28} {seconds:>12.3f}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({
+            'lottery': args.lottery,
+            'explainer_warmup': not args.no_warmup,
+            'median_seconds': summary,
+            'runs': runs,
+            'import_profile': profile
+        }, indent=2))
+        print(f"\nResults saved to: {output_path}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
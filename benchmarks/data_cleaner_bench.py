@@ -0,0 +1,172 @@
+"""
+Parity and speed benchmark for DataCleaner.
+
+Compares the vectorized cleaner with the previous row-wise implementation
+(kept below as the reference) on every raw lottery file and on a synthetic
+frame with malformed rows. Outputs must match exactly; the reference's
+YYYY-MM-DD strings are compared against the cleaner's datetime64 dates.
+
+Usage (from the project root):
+    python benchmarks/data_cleaner_bench.py
+    python benchmarks/data_cleaner_bench.py --scale 50   # tile each file 50x
+    python benchmarks/data_cleaner_bench.py --repeat 10 --output outputs/benchmarks/cleaner.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.preprocessing.data_cleaner import DataCleaner  # noqa: E402
+
+
+def reference_clean(df: pd.DataFrame) -> pd.DataFrame:
+    """Row-wise cleaning path that DataCleaner used before vectorization."""
+    df_clean = df.copy()
+
+    df_clean['draw_date'] = pd.to_datetime(df_clean['draw_date'], errors='coerce')
+    df_clean = df_clean[df_clean['draw_date'].notnull()]
+    df_clean['draw_date'] = df_clean['draw_date'].dt.strftime('%Y-%m-%d')
+
+    def validate_numbers(numbers_str):
+        try:
+            numbers = [int(n.strip()) for n in str(numbers_str).split(';')]
+            return ';'.join([f"{n:02d}" for n in numbers])
+        except:  # noqa: E722
+            return None
+
+    df_clean['numbers'] = df_clean['numbers'].apply(validate_numbers)
+    df_clean = df_clean[df_clean['numbers'].notnull()]
+
+    df_clean = df_clean.drop_duplicates(subset=['draw_id', 'numbers'], keep='first')
+
+    if 'letter' in df_clean.columns:
+        df_clean['letter'] = df_clean['letter'].fillna('')
+    df_clean = df_clean.dropna(subset=['draw_date', 'draw_id', 'numbers'])
+
+    df_clean = df_clean.sort_values('draw_date').reset_index(drop=True)
+    df_clean['draw_sequence'] = range(1, len(df_clean) + 1)
+
+    return df_clean
+
+
+def synthetic_frame() -> pd.DataFrame:
+    """Raw rows covering the malformed inputs the cleaner has to drop or repair."""
+    return pd.DataFrame({
+        'draw_date': ['2024-01-03', '2024-01-01', 'not a date', '2024-01-02',
+                      '2024-01-02', '2024-01-04', None, '2024-01-05', '2024-01-06'],
+        'draw_id': [3, 1, 9, 2, 2, 4, 7, None, 6],
+        'letter': ['A', None, 'B', 'C', 'C', 'D', 'E', 'F', None],
+        'numbers': ['5;12;33', '1; 2 ;3', '4;5;6', '7;8;9', '07;08;09',
+                    '10;x;12', '1;2;3', '3;4;5', None],
+    })
+
+
+def tile(df: pd.DataFrame, scale: int) -> pd.DataFrame:
+    """Repeat a raw frame with fresh draw ids and consecutive dates to measure scaling."""
+    if scale <= 1:
+        return df
+
+    tiled = pd.concat([df] * scale, ignore_index=True)
+    tiled['draw_id'] = range(1, len(tiled) + 1)
+    dates = pd.Timestamp('1900-01-01') + pd.to_timedelta(range(len(tiled)), unit='D')
+    tiled['draw_date'] = dates.strftime('%Y-%m-%d')
+    return tiled
+
+
+def _timed(func, df: pd.DataFrame, repeat: int):
+    times = []
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func(df)
+            times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def _compare(expected: pd.DataFrame, actual: pd.DataFrame) -> List[str]:
+    if len(expected) != len(actual):
+        return [f"rows {len(expected)} != {len(actual)}"]
+
+    errors = []
+    actual = actual.copy()
+    actual['draw_date'] = actual['draw_date'].dt.strftime('%Y-%m-%d')
+
+    for col in expected.columns:
+        left = expected[col].astype(str).to_numpy()
+        right = actual[col].astype(str).to_numpy()
+        mismatches = (left != right).sum()
+        if mismatches:
+            errors.append(f"{col}: {mismatches} mismatches")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DataCleaner parity and speed benchmark')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=int, default=1,
+                        help='Tile each raw file this many times (default: 1)')
+    parser.add_argument('--output', type=str, help='Write results as JSON')
+    args = parser.parse_args()
+
+    cleaner = DataCleaner(str(PROJECT_ROOT / 'data' / 'raw'), str(PROJECT_ROOT / 'data' / 'processed'))
+    vectorized = lambda df: cleaner._clean_lottery(df, '')  # noqa: E731
+
+    inputs = {'synthetic': synthetic_frame()}
+    for raw_file in sorted((PROJECT_ROOT / 'data' / 'raw').glob('*.csv')):
+        if '_with_prizes' not in raw_file.name:
+            inputs[raw_file.stem] = tile(pd.read_csv(raw_file), args.scale)
+
+    print(f"{'Lottery':<30} {'Rows':>6} {'Reference':>10} {'Vectorized':>11} {'Speedup':>8}  Parity")
+    print("-"*80)
+
+    rows = []
+    failures = 0
+    for name, df in inputs.items():
+        expected, reference_s = _timed(reference_clean, df, args.repeat)
+        actual, vectorized_s = _timed(vectorized, df, args.repeat)
+        errors = _compare(expected, actual)
+        failures += bool(errors)
+
+        speedup = reference_s / vectorized_s if vectorized_s else 0.0
+        status = 'OK' if not errors else 'FAIL ' + '; '.join(errors)
+        print(f"{name:<30} {len(df):>6} {reference_s * 1000:>8.2f}ms {vectorized_s * 1000:>9.2f}ms "
+              f"{speedup:>7.1f}x  {status}")
+
+        rows.append({
+            'lottery': name,
+            'rows': len(df),
+            'reference_ms': round(reference_s * 1000, 3),
+            'vectorized_ms': round(vectorized_s * 1000, 3),
+            'speedup': round(speedup, 2),
+            'parity': not errors,
+        })
+
+    total_ref = sum(r['reference_ms'] for r in rows)
+    total_vec = sum(r['vectorized_ms'] for r in rows)
+    print("-"*80)
+    print(f"{'TOTAL':<30} {sum(r['rows'] for r in rows):>6} {total_ref:>8.2f}ms {total_vec:>9.2f}ms "
+          f"{total_ref / total_vec:>7.1f}x")
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"\nResults saved to {output}")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
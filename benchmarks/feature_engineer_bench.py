@@ -0,0 +1,351 @@
+"""
+Parity and speed benchmark for FeatureEngineer.
+
+Runs each feature group on fixed snapshots of the cleaned lottery data,
+compares the columns it produces against a golden reference, and records
+wall time and peak memory per group and per lottery. Exits non-zero when a
+group drifts from the golden reference, breaks a leakage invariant, or
+becomes slower / hungrier than the recorded baseline.
+
+Usage (from the project root):
+    python benchmarks/feature_engineer_bench.py                  # check
+    python benchmarks/feature_engineer_bench.py --make-snapshots # refresh inputs
+    python benchmarks/feature_engineer_bench.py --update-golden  # accept outputs
+    python benchmarks/feature_engineer_bench.py --update-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.preprocessing.feature_engineer import FeatureEngineer  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+SNAPSHOT_DIR = BENCH_DIR / 'snapshots'
+GOLDEN_DIR = BENCH_DIR / 'golden'
+BASELINE_PATH = BENCH_DIR / 'feature_engineer_baseline.json'
+
+KEY_COLS = ['number', 'draw_sequence']
+
+# Fixed workload timed next to every run of a group; baseline times are scaled
+# by how much slower or faster it runs now than when the baseline was recorded
+CALIBRATION_NUMBERS = 80
+CALIBRATION_DRAWS = 5000
+
+# Feature groups in pipeline order, with the columns each one adds
+FEATURE_GROUPS = [
+    ('frequency', '_add_frequency_features', [
+        'frequency_last_10', 'frequency_last_30', 'frequency_last_50',
+        'frequency_all_time', 'appearance_rate', 'days_since_last'
+    ]),
+    ('temporal', '_add_temporal_features', [
+        'day_of_week', 'is_weekend', 'month', 'week_of_year'
+    ]),
+    ('statistical', '_add_statistical_features', [
+        'mean_gap', 'std_gap', 'min_gap', 'max_gap', 'current_gap'
+    ]),
+    ('hot_cold', '_add_hot_cold_features', [
+        'temperature_score', 'is_hot', 'is_cold', 'trend'
+    ]),
+]
+
+
+def make_snapshots(draws: int):
+    """Freeze the first `draws` cleaned draws of every lottery as benchmark inputs."""
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+
+    for csv_file in sorted((PROJECT_ROOT / 'data' / 'processed').glob('*_cleaned.csv')):
+        df = pd.read_csv(csv_file).head(draws)
+        df.to_csv(SNAPSHOT_DIR / csv_file.name, index=False)
+        print(f"  [OK] {csv_file.name}: {len(df)} draws")
+
+
+def _to_arrays(df: pd.DataFrame, columns: List[str]) -> Dict[str, np.ndarray]:
+    """Convert columns to plain numpy arrays that np.savez can store without pickling."""
+    arrays = {}
+    for col in columns:
+        series = df[col]
+        if series.dtype == object:
+            arrays[col] = series.to_numpy(dtype=str)
+        elif series.dtype.kind in 'iub' or str(series.dtype).startswith(('Int', 'UInt')):
+            arrays[col] = series.to_numpy(dtype=np.int64)
+        else:
+            arrays[col] = series.to_numpy(dtype=np.float64)
+    return arrays
+
+
+def _expand(engineer: FeatureEngineer, snapshot: Path) -> pd.DataFrame:
+    """Expand a snapshot into (draw, number) rows, sorted by number then draw."""
+    lottery_name = snapshot.stem.replace('_cleaned', '')
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_expanded = engineer._expand_draws(pd.read_csv(snapshot), lottery_name)
+    return df_expanded.sort_values(KEY_COLS).reset_index(drop=True)
+
+
+def _group_input(df_expanded: pd.DataFrame, golden: Dict[str, np.ndarray], group_idx: int) -> pd.DataFrame:
+    """Build the input of a group from the golden outputs of the groups before it."""
+    df_input = df_expanded.copy()
+    for _, _, columns in FEATURE_GROUPS[:group_idx]:
+        for col in columns:
+            df_input[col] = golden[col]
+    if 'draw_date' in df_input.columns:
+        df_input['draw_date'] = pd.to_datetime(df_input['draw_date'])
+    return df_input
+
+
+def _calibration_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'number': np.repeat(np.arange(CALIBRATION_NUMBERS), CALIBRATION_DRAWS),
+        'appeared': rng.integers(0, 2, CALIBRATION_NUMBERS * CALIBRATION_DRAWS),
+    })
+
+
+def _calibrate(df_calibration: pd.DataFrame) -> float:
+    """Wall time of a fixed pandas and pure-Python workload, like the feature groups run."""
+    start = time.perf_counter()
+    df_calibration.groupby('number')['appeared'].rolling(window=30, min_periods=1).sum()
+    for _, group in df_calibration.groupby('number')['appeared']:
+        sum(value for value in group.tolist())
+    return time.perf_counter() - start
+
+
+def _expected_seconds(base: Dict, calibration_s: float) -> float:
+    """Baseline time of a group, scaled to the speed of the machine in this run."""
+    if base.get('calibration_s'):
+        return base['seconds'] * calibration_s / base['calibration_s']
+    return base['seconds']
+
+
+def _time(func, df_input: pd.DataFrame, df_calibration: pd.DataFrame, repeat: int) -> Tuple[float, float]:
+    """
+    Time a feature group, returning (best wall time, best calibration time).
+
+    Each timed run follows a calibration run, so both minimums are taken at
+    the same machine load and short bursts of load are dropped.
+    """
+    times, calibrations = [], []
+    for _ in range(repeat):
+        calibrations.append(_calibrate(df_calibration))
+        start = time.perf_counter()
+        func(df_input)
+        times.append(time.perf_counter() - start)
+    return min(times), min(calibrations)
+
+
+def _measure(func, df_input: pd.DataFrame, df_calibration: pd.DataFrame, repeat: int):
+    """Run a feature group, returning (output, wall time, calibration time, peak traced MB)."""
+    seconds, calibration_s = _time(func, df_input, df_calibration, repeat)
+
+    tracemalloc.start()
+    df_output = func(df_input)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return df_output, seconds, calibration_s, peak / 1024 / 1024
+
+
+def _compare(actual: Dict[str, np.ndarray], expected: Dict[str, np.ndarray], rtol: float, atol: float) -> List[str]:
+    """Return a list of human-readable mismatches between two column sets."""
+    errors = []
+    for col, expected_values in expected.items():
+        actual_values = actual[col]
+        if actual_values.shape != expected_values.shape:
+            errors.append(f"{col}: shape {actual_values.shape} != {expected_values.shape}")
+        elif expected_values.dtype.kind == 'f':
+            bad = ~np.isclose(actual_values, expected_values, rtol=rtol, atol=atol, equal_nan=True)
+            if bad.any():
+                errors.append(f"{col}: {int(bad.sum())} values outside tolerance")
+        else:
+            bad = actual_values != expected_values
+            if bad.any():
+                errors.append(f"{col}: {int(bad.sum())} values differ")
+    return errors
+
+
+def _check_invariants(df_expanded: pd.DataFrame, outputs: Dict[str, np.ndarray]) -> List[str]:
+    """Check leakage invariants that must hold regardless of the golden reference."""
+    errors = []
+    first_rows = ~df_expanded['number'].duplicated().to_numpy()
+
+    for col in ['frequency_last_10', 'frequency_last_30', 'frequency_last_50', 'frequency_all_time']:
+        if col in outputs and (outputs[col][first_rows] != 0).any():
+            errors.append(f"{col}: non-zero on a number's first draw (leaks across numbers)")
+
+    if 'days_since_last' in outputs and (outputs['days_since_last'][first_rows] != 999).any():
+        errors.append("days_since_last: set on a number's first draw")
+
+    return errors
+
+
+def run(args) -> int:
+    warnings.filterwarnings('ignore', category=FutureWarning)
+
+    engineer = FeatureEngineer()
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    new_baseline = {}
+    results = {}
+    failures = []
+
+    snapshots = sorted(SNAPSHOT_DIR.glob('*_cleaned.csv'))
+    if args.lotteries:
+        snapshots = [s for s in snapshots if s.stem.replace('_cleaned', '') in args.lotteries]
+    if not snapshots:
+        print("No snapshots found. Run with --make-snapshots first.")
+        return 1
+
+    GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+    df_calibration = _calibration_frame()
+
+    print(f"\n{'Lottery':<30} {'Group':<12} {'Time (s)':>10} {'Base (s)':>10} {'Peak MB':>9} {'Base MB':>9}  Status")
+    print("-" * 100)
+
+    for snapshot in snapshots:
+        lottery_name = snapshot.stem.replace('_cleaned', '')
+        golden_path = GOLDEN_DIR / f"{lottery_name}.npz"
+        df_expanded = _expand(engineer, snapshot)
+
+        if args.update_golden or not golden_path.exists():
+            # Chain the groups to produce the reference outputs
+            df_chain = df_expanded.copy()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _, method, _ in FEATURE_GROUPS:
+                    df_chain = getattr(engineer, method)(df_chain)
+            df_chain = df_chain.sort_values(KEY_COLS).reset_index(drop=True)
+            all_cols = KEY_COLS + [c for _, _, cols in FEATURE_GROUPS for c in cols]
+            np.savez_compressed(golden_path, **_to_arrays(df_chain, all_cols))
+            print(f"{lottery_name:<30} {'(golden)':<12} written to {golden_path.relative_to(PROJECT_ROOT)}")
+
+        with np.load(golden_path) as npz:
+            golden = {key: npz[key] for key in npz.files}
+
+        keys = _to_arrays(df_expanded, KEY_COLS)
+        if any(not np.array_equal(keys[k], golden[k]) for k in KEY_COLS):
+            failures.append(f"{lottery_name}: snapshot rows do not match golden keys (re-run --update-golden)")
+            continue
+
+        results[lottery_name] = {}
+        new_baseline[lottery_name] = {}
+
+        for group_idx, (group, method, columns) in enumerate(FEATURE_GROUPS):
+            df_input = _group_input(df_expanded, golden, group_idx)
+            with contextlib.redirect_stdout(io.StringIO()):
+                df_output, seconds, calibration_s, peak_mb = _measure(
+                    getattr(engineer, method), df_input, df_calibration, args.repeat
+                )
+
+            df_output = df_output.sort_values(KEY_COLS).reset_index(drop=True)
+            outputs = _to_arrays(df_output, columns)
+
+            errors = _compare(outputs, {c: golden[c] for c in columns}, args.rtol, args.atol)
+            errors += _check_invariants(df_expanded, outputs)
+
+            base = baseline.get(lottery_name, {}).get(group)
+            if base:
+                if seconds > _expected_seconds(base, calibration_s) * (1 + args.time_tolerance) + args.time_floor:
+                    # Time again before reporting: a real slowdown persists, a burst of load does not
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        retry_s, retry_calibration_s = _time(getattr(engineer, method), df_input, df_calibration, args.repeat)
+                    seconds, calibration_s = min(seconds, retry_s), min(calibration_s, retry_calibration_s)
+
+                expected_s = _expected_seconds(base, calibration_s)
+                if seconds > expected_s * (1 + args.time_tolerance) + args.time_floor:
+                    scaled = ' (scaled)' if base.get('calibration_s') else ''
+                    errors.append(f"slower: {seconds:.3f}s vs baseline {expected_s:.3f}s{scaled}")
+                if peak_mb > base['peak_mb'] * (1 + args.memory_tolerance) + args.memory_floor:
+                    errors.append(f"more memory: {peak_mb:.1f} MB vs baseline {base['peak_mb']:.1f} MB")
+
+            status = 'OK' if not errors else 'FAIL'
+            base_seconds = f"{_expected_seconds(base, calibration_s):.3f}" if base else '-'
+            base_mb = f"{base['peak_mb']:.1f}" if base else '-'
+            print(f"{lottery_name:<30} {group:<12} {seconds:>10.3f} {base_seconds:>10} {peak_mb:>9.1f} {base_mb:>9}  {status}")
+            for error in errors:
+                print(f"    - {error}")
+                failures.append(f"{lottery_name}/{group}: {error}")
+
+            results[lottery_name][group] = {
+                'seconds': round(seconds, 4),
+                'calibration_s': round(calibration_s, 4),
+                'peak_mb': round(peak_mb, 2),
+                'errors': errors
+            }
+            new_baseline[lottery_name][group] = {
+                'seconds': round(seconds, 4),
+                'calibration_s': round(calibration_s, 4),
+                'peak_mb': round(peak_mb, 2)
+            }
+
+    print("-" * 100)
+
+    if args.update_baseline:
+        baseline.update(new_baseline)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline saved to: {BASELINE_PATH.relative_to(PROJECT_ROOT)}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(results, indent=2))
+        print(f"Results saved to: {output_path}")
+
+    if failures:
+        print(f"\n[FAIL] {len(failures)} regression(s)")
+        return 1
+
+    print("\n[PASS] All feature groups match the golden reference within budget")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FeatureEngineer parity and speed benchmark')
+    parser.add_argument('--make-snapshots', action='store_true',
+                        help='Freeze the first --draws cleaned draws of each lottery and exit')
+    parser.add_argument('--draws', type=int, default=60,
+                        help='Draws per snapshot (default: 60, must exceed the largest window)')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='Accept the current outputs as the golden reference')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Record the current timings and memory as the baseline')
+    parser.add_argument('--lotteries', nargs='*',
+                        help='Only benchmark these lotteries')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per group and calibration; the fastest is compared (default: 3)')
+    parser.add_argument('--rtol', type=float, default=1e-7)
+    parser.add_argument('--atol', type=float, default=1e-9)
+    parser.add_argument('--time-tolerance', type=float, default=0.5,
+                        help='Allowed relative slowdown before failing (default: 0.5 = +50%%)')
+    parser.add_argument('--time-floor', type=float, default=0.05,
+                        help='Absolute slack in seconds to absorb timer noise (default: 0.05)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.5,
+                        help='Allowed relative peak memory growth before failing (default: 0.5)')
+    parser.add_argument('--memory-floor', type=float, default=1.0,
+                        help='Absolute slack in MB (default: 1.0)')
+    parser.add_argument('--output', type=str,
+                        help='Write per-lottery, per-group results as JSON')
+    args = parser.parse_args()
+
+    if args.repeat < 3:
+        parser.error('--repeat must be at least 3 for a stable timing check')
+
+    if args.make_snapshots:
+        make_snapshots(args.draws)
+        return 0
+
+    return run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Parity and latency of the SHAP engines (src/explainability/shap_engines.py).
+
+Explains the served feature row of every number of every lottery (the
+backend's feature snapshots) with each engine and checks that:
+- contributions match the 'tree' engine (shap.TreeExplainer) within --tolerance
+- expected value + contributions reproduce the model's raw log-odds
+
+and reports, per engine, the build time (including imports: the 'tree'
+engine imports shap), per-row latency (one row per call, as GET /explain
+does) and batch latency (all rows in one call).
+
+Usage (from the project root):
+    python benchmarks/shap_engine_bench.py              # exit code 1 on a parity failure
+    python benchmarks/shap_engine_bench.py --rows 200 --repeat 5
+    python benchmarks/shap_engine_bench.py --output outputs/benchmarks/shap_engines.json
+"""
+
+import argparse
+import json
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.explainability import SHAP_ENGINES, create_shap_engine  # noqa: E402
+from src.storage import FeatureSnapshotStore, MODEL_FEATURES, SplitIndex, TREND_CODES  # noqa: E402
+
+warnings.filterwarnings('ignore')
+
+REFERENCE_ENGINE = 'tree'
+
+
+def _feature_rows() -> np.ndarray:
+    """Served feature rows of every lottery, as the backend builds them."""
+    split_index = SplitIndex(PROJECT_ROOT / 'data' / 'splits', PROJECT_ROOT / 'data' / 'processed')
+    snapshots = FeatureSnapshotStore(split_index, MODEL_FEATURES, categorical_maps={'trend': TREND_CODES})
+    return np.concatenate([snapshots.get(name).matrix for name in split_index.lotteries('test')])
+
+
+def _best_of(call, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SHAP engine parity and latency benchmark')
+    parser.add_argument('--model', type=str, default=str(PROJECT_ROOT / 'models' / 'best_model.cbm'))
+    parser.add_argument('--rows', type=int, default=100, help='Rows explained one at a time (default: 100)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=1e-6)
+    parser.add_argument('--output', type=str, help='Write results as JSON')
+    args = parser.parse_args()
+
+    from catboost import CatBoostClassifier
+
+    model = CatBoostClassifier()
+    model.load_model(args.model)
+
+    features = _feature_rows()
+    raw = model.predict(features, prediction_type='RawFormulaVal')
+
+    # The native engine first, so the tree engine's build time includes the shap import
+    engines, build_s = {}, {}
+    for name in sorted(SHAP_ENGINES, key=lambda name: name == REFERENCE_ENGINE):
+        start = time.perf_counter()
+        engines[name] = create_shap_engine(model, name)
+        build_s[name] = time.perf_counter() - start
+
+    reference = engines[REFERENCE_ENGINE].shap_values(features)
+    single_rows = features[:args.rows]
+
+    print(f"{len(features)} rows, {features.shape[1]} features\n")
+    print(f"{'Engine':<10} {'Build s':>8} {'Per-row ms':>11} {'Batch ms':>9} {'Max diff':>10} {'Additivity':>11}  Parity")
+    print("-"*75)
+
+    rows = []
+    failures = 0
+    for name, engine in engines.items():
+        values = engine.shap_values(features)
+        max_diff = float(np.abs(values - reference).max())
+        additivity = float(np.abs(engine.expected_value + values.sum(axis=1) - raw).max())
+        parity = max_diff <= args.tolerance and additivity <= args.tolerance
+        failures += not parity
+
+        per_row_s = _best_of(lambda: [engine.shap_values(row[None, :]) for row in single_rows], args.repeat)
+        batch_s = _best_of(lambda: engine.shap_values(features), args.repeat)
+
+        per_row_ms = per_row_s / len(single_rows) * 1000
+        print(f"{name:<10} {build_s[name]:>8.3f} {per_row_ms:>11.3f} {batch_s * 1000:>9.2f} "
+              f"{max_diff:>10.2e} {additivity:>11.2e}  {'OK' if parity else 'FAIL'}")
+
+        rows.append({
+            'engine': name,
+            'build_s': round(build_s[name], 4),
+            'per_row_ms': round(per_row_ms, 4),
+            'batch_ms': round(batch_s * 1000, 3),
+            'batch_rows': len(features),
+            'max_diff': max_diff,
+            'additivity_error': additivity,
+            'parity': parity,
+        })
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"\nResults saved to {output}")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Load time and disk footprint of CSV vs Parquet datasets.
+
+For each featured and split dataset that exists in both formats (run
+`python -m src.utils.migrate_to_parquet` first), measures:
+- full load
+- column projection (model features only)
+- predicate pushdown (rows for a handful of numbers)
+
+Usage (from the project root):
+    python benchmarks/storage_bench.py
+    python benchmarks/storage_bench.py --repeat 5 --output outputs/benchmarks/storage.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.storage import DatasetStore  # noqa: E402
+
+FEATURE_COLS = [
+    'draw_id', 'draw_sequence', 'current_gap', 'mean_gap', 'std_gap',
+    'min_gap', 'max_gap', 'days_since_last', 'appearance_rate',
+    'frequency_last_10', 'frequency_last_30', 'frequency_last_50',
+    'frequency_all_time', 'temperature_score', 'trend', 'is_hot',
+    'is_cold', 'day_of_week', 'month', 'week_of_year', 'is_weekend'
+]
+
+
+def _best_time(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV vs Parquet storage benchmark')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', type=str, help='Write results as JSON')
+    args = parser.parse_args()
+
+    rows = []
+
+    for subdir in ['processed', 'splits']:
+        directory = PROJECT_ROOT / 'data' / subdir
+        csv_store = DatasetStore(directory, storage_format='csv')
+        parquet_store = DatasetStore(directory, storage_format='parquet')
+
+        for name in csv_store.names():
+            if name.endswith('_cleaned'):
+                continue
+            parquet_path = parquet_store.path(name, 'parquet')
+            if not parquet_path.exists():
+                continue
+
+            csv_path = csv_store.path(name, 'csv')
+            csv_read = lambda **kw: pd.read_csv(csv_path, **kw)
+            pq_read = lambda **kw: parquet_store.read(name, **kw)
+
+            rows.append({
+                'dataset': f"{subdir}/{name}",
+                'csv_mb': csv_path.stat().st_size / 1024 / 1024,
+                'parquet_mb': parquet_path.stat().st_size / 1024 / 1024,
+                'csv_full_s': _best_time(lambda: csv_read(), args.repeat),
+                'parquet_full_s': _best_time(lambda: pq_read(), args.repeat),
+                'csv_projected_s': _best_time(lambda: csv_read(usecols=FEATURE_COLS), args.repeat),
+                'parquet_projected_s': _best_time(lambda: pq_read(columns=FEATURE_COLS), args.repeat),
+                'csv_filtered_s': _best_time(
+                    lambda: (lambda df: df[df['number'].isin([1, 2, 3])])(csv_read()), args.repeat),
+                'parquet_filtered_s': _best_time(lambda: pq_read(numbers=[1, 2, 3]), args.repeat),
+            })
+
+    if not rows:
+        print("No datasets found in both formats. Run: python -m src.utils.migrate_to_parquet")
+        return 1
+
+    df = pd.DataFrame(rows)
+    pd.set_option('display.width', 200)
+    print(df.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+
+    totals = df.drop(columns='dataset').sum()
+    print("\nTotals:")
+    print(f"  Disk:      CSV {totals['csv_mb']:.1f} MB vs Parquet {totals['parquet_mb']:.1f} MB "
+          f"({totals['csv_mb'] / totals['parquet_mb']:.1f}x)")
+    for kind in ['full', 'projected', 'filtered']:
+        csv_s, pq_s = totals[f'csv_{kind}_s'], totals[f'parquet_{kind}_s']
+        print(f"  {kind.title():<10} CSV {csv_s:.3f}s vs Parquet {pq_s:.3f}s ({csv_s / pq_s:.1f}x)")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({'datasets': rows, 'totals': totals.to_dict()}, indent=2))
+        print(f"\nResults saved to: {output_path}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Memory per backend worker for 1, 4 and 16 workers.
+
+Starts N worker processes at once. Each one boots backend/main.py like a
+uvicorn worker (module import + startup hook) and serves POST /predict and
+GET /explain for every lottery, so it holds all of its feature snapshots.
+While all N are alive, the script reads each worker's memory from
+/proc/<pid>/smaps_rollup (Linux only):
+- RSS: resident pages, counting shared pages in full for every worker
+- PSS: resident pages with each shared page split between the processes
+  mapping it (the sum over workers is the real footprint)
+- USS: pages private to the worker
+
+Two modes:
+- shared: snapshots mapped from data/serving (python -m src.utils.publish_snapshots)
+- private: every worker builds its own snapshots from the splits
+
+Usage (from the project root):
+    python benchmarks/worker_memory_bench.py
+    python benchmarks/worker_memory_bench.py --workers 1 4 --modes shared
+    python benchmarks/worker_memory_bench.py --output outputs/benchmarks/worker_memory.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BACKEND_DIR = PROJECT_ROOT / 'backend'
+
+MODES = ['shared', 'private']
+READY = 'READY '
+
+
+def _child(mode: str):
+    """Boot one worker, touch every lottery, report ready and wait for stdin to close."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    warnings.filterwarnings('ignore')
+
+    import main as backend
+    from fastapi.testclient import TestClient
+
+    backend.MODEL_WATCH_INTERVAL_SECONDS = 0
+    if mode == 'private':
+        backend.snapshot_store.shared = None
+
+    with TestClient(backend.app) as client:
+        lotteries = backend.split_index.lotteries('test')
+        for lottery in lotteries:
+            client.post('/predict', json={'lottery': lottery, 'numbers': list(range(80))}).raise_for_status()
+            client.get('/explain/3', params={'lottery': lottery})
+
+        snapshots = client.get('/cache/stats').json()['snapshots']
+        print(READY + json.dumps({
+            'lotteries': len(lotteries),
+            'shared_lotteries': len(snapshots['shared_lotteries']),
+        }), flush=True)
+        sys.stdin.read()
+
+
+def _memory(pid: int) -> dict:
+    """RSS, PSS and USS (MB) of a process."""
+    fields = {}
+    for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines()[1:]:
+        key, value = line.split(':', 1)
+        fields[key] = int(value.split()[0]) / 1024
+    return {
+        'rss_mb': fields['Rss'],
+        'pss_mb': fields['Pss'],
+        'uss_mb': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
+
+
+def _wait_ready(process, stderr) -> dict:
+    """Status line of a worker once it is serving (skipping the backend's own output)."""
+    for line in process.stdout:
+        if line.startswith(READY):
+            return json.loads(line[len(READY):])
+    stderr.seek(0)
+    raise RuntimeError(f"Worker exited before becoming ready:\n{stderr.read()[-2000:]}")
+
+
+def _run(workers: int, mode: str) -> dict:
+    """Start `workers` processes, measure them together, then stop them."""
+    processes = []
+    with tempfile.TemporaryFile('w+') as stderr:
+        try:
+            for _ in range(workers):
+                processes.append(subprocess.Popen(
+                    [sys.executable, __file__, '--child', mode],
+                    cwd=PROJECT_ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                    stderr=stderr, text=True
+                ))
+            ready = [_wait_ready(process, stderr) for process in processes]
+            memory = [_memory(process.pid) for process in processes]
+        finally:
+            for process in processes:
+                process.stdin.close()
+            for process in processes:
+                process.wait()
+
+    return {
+        'workers': workers,
+        'mode': mode,
+        'shared_lotteries': min(r['shared_lotteries'] for r in ready),
+        'lotteries': ready[0]['lotteries'],
+        **{f"mean_{key}": float(np.mean([m[key] for m in memory])) for key in memory[0]},
+        'total_pss_mb': float(sum(m['pss_mb'] for m in memory)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backend memory per worker')
+    parser.add_argument('--workers', type=int, nargs='*', default=[1, 4, 16])
+    parser.add_argument('--modes', nargs='*', choices=MODES, default=MODES)
+    parser.add_argument('--output', type=str, help='Write results as JSON')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child)
+        return 0
+
+    print(f"{'Workers':>7} {'Mode':<8} {'Shared':>7} {'RSS MB':>8} {'PSS MB':>8} {'USS MB':>8} {'Total PSS MB':>13}")
+    print("-"*66)
+
+    rows = []
+    for workers in args.workers:
+        for mode in args.modes:
+            row = _run(workers, mode)
+            rows.append(row)
+            print(f"{workers:>7} {mode:<8} {row['shared_lotteries']:>3}/{row['lotteries']:<3} "
+                  f"{row['mean_rss_mb']:>8.1f} {row['mean_pss_mb']:>8.1f} {row['mean_uss_mb']:>8.1f} "
+                  f"{row['total_pss_mb']:>13.1f}")
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"\nResults saved to {output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,7 @@ import type {
   ModelStats,
   PredictionResponse,
   ExplanationResponse,
+  ExplainBatchResponse,
 } from '../types/api'
 
 const API_BASE_URL = 'http://localhost:8000'
@@ -54,6 +55,19 @@ export const apiService = {
     })
     return response.data
   },
+
+  explainNumbers: async (
+    numbers: number[],
+    lottery: string = 'MAHAJANA_SAMPATHA',
+    topK: number = 5
+  ): Promise<ExplainBatchResponse> => {
+    const response = await api.post<ExplainBatchResponse>('/explain/batch', {
+      lottery,
+      numbers,
+      top_k: topK,
+    })
+    return response.data
+  },
 }
 
 export default apiService
@@ -31,6 +31,24 @@ export interface ExplanationResponse {
   }>
 }
 
+export interface NumberExplanation {
+  number: number
+  prediction: string
+  probability: number
+  feature_contributions: Record<string, number>
+  top_features: Array<{
+    feature: string
+    contribution: number
+  }>
+}
+
+export interface ExplainBatchResponse {
+  lottery: string
+  explanations: NumberExplanation[]
+  not_found: number[]
+  timestamp: string
+}
+
 export interface LotteryInfo {
   name: string
   display_name: string
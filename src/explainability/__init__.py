@@ -0,0 +1,19 @@
+"""
+Explainability helpers for the trained model.
+"""
+
+from .shap_engines import (
+    SHAP_ENGINES,
+    CatBoostShapEngine,
+    ShapEngine,
+    TreeShapEngine,
+    create_shap_engine,
+)
+
+__all__ = [
+    'SHAP_ENGINES',
+    'CatBoostShapEngine',
+    'ShapEngine',
+    'TreeShapEngine',
+    'create_shap_engine',
+]
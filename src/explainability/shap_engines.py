@@ -0,0 +1,123 @@
+"""
+Interchangeable SHAP engines for the CatBoost model.
+
+Both engines return class-1 (Appear) contributions in log-odds space as a
+(rows x features) array, plus the expected value they are added to:
+- 'catboost': CatBoost's own `get_feature_importance(type='ShapValues')`,
+  with no extra dependency
+- 'tree': `shap.TreeExplainer`, whose import (sklearn, scipy, matplotlib)
+  takes seconds
+
+For CatBoost models TreeExplainer delegates to CatBoost, so both engines give
+identical values; benchmarks/shap_engine_bench.py checks this and compares
+their latency.
+"""
+
+from typing import Dict, Type
+
+import numpy as np
+
+
+class ShapEngine:
+    """SHAP values of one loaded CatBoost model."""
+
+    name = ''
+
+    def __init__(self, model):
+        """
+        Args:
+            model: Loaded CatBoostClassifier
+        """
+        self.model = model
+
+    @property
+    def expected_value(self) -> float:
+        """Base value (log-odds) the contributions of every row add up from."""
+        raise NotImplementedError
+
+    def shap_values(self, features: np.ndarray) -> np.ndarray:
+        """
+        Contributions of every feature to the class-1 log-odds.
+
+        Args:
+            features: (rows x features) matrix, in model feature order
+
+        Returns:
+            (rows x features) float64 array
+        """
+        raise NotImplementedError
+
+
+class CatBoostShapEngine(ShapEngine):
+    """CatBoost's native SHAP values."""
+
+    name = 'catboost'
+
+    def __init__(self, model):
+        super().__init__(model)
+        self._expected_value = None
+
+    @property
+    def expected_value(self) -> float:
+        if self._expected_value is None:
+            features = np.zeros((1, len(self.model.feature_names_)), dtype=np.float32)
+            self._shap_matrix(features)
+        return self._expected_value
+
+    def shap_values(self, features: np.ndarray) -> np.ndarray:
+        return self._shap_matrix(features)[:, :-1]
+
+    def _shap_matrix(self, features: np.ndarray) -> np.ndarray:
+        from catboost import Pool
+
+        # One column per feature plus the expected value as the last column
+        matrix = self.model.get_feature_importance(Pool(features), type='ShapValues')
+        self._expected_value = float(matrix[0, -1])
+        return matrix
+
+
+class TreeShapEngine(ShapEngine):
+    """shap.TreeExplainer (imports the shap package)."""
+
+    name = 'tree'
+
+    def __init__(self, model):
+        import shap
+
+        super().__init__(model)
+        self.explainer = shap.TreeExplainer(model)
+
+    @property
+    def expected_value(self) -> float:
+        expected_value = np.atleast_1d(self.explainer.expected_value)
+        return float(expected_value[-1])
+
+    def shap_values(self, features: np.ndarray) -> np.ndarray:
+        shap_values = self.explainer.shap_values(features)
+
+        # Older shap versions return one array per class: use class 1
+        if isinstance(shap_values, list):
+            shap_values = shap_values[1] if len(shap_values) > 1 else shap_values[0]
+        return np.asarray(shap_values)
+
+
+SHAP_ENGINES: Dict[str, Type[ShapEngine]] = {
+    CatBoostShapEngine.name: CatBoostShapEngine,
+    TreeShapEngine.name: TreeShapEngine,
+}
+
+
+def create_shap_engine(model, engine: str = 'catboost') -> ShapEngine:
+    """
+    Build a SHAP engine for a loaded CatBoost model.
+
+    Args:
+        model: Loaded CatBoostClassifier
+        engine: One of SHAP_ENGINES ('catboost' or 'tree')
+
+    Returns:
+        ShapEngine
+    """
+    if engine not in SHAP_ENGINES:
+        raise ValueError(f"Unknown SHAP engine '{engine}'. Choose from: {sorted(SHAP_ENGINES)}")
+    return SHAP_ENGINES[engine](model)
@@ -0,0 +1,7 @@
+"""
+Pipeline orchestration for scraping, validation, cleaning, features and splits.
+"""
+
+from .orchestrator import PipelineOrchestrator, STAGES
+
+__all__ = ['PipelineOrchestrator', 'STAGES']
@@ -0,0 +1,439 @@
+"""
+Content-hash pipeline orchestrator.
+
+Models the pipeline as a small DAG per lottery:
+
+    scrape -> validate
+           -> clean -> features -> split
+
+Each (stage, lottery) gets a fingerprint made of the content hashes of its
+input files, a hash of the code that implements the stage, and the stage
+parameters. A stage is skipped when its fingerprint matches the last
+successful run and its outputs are still on disk unchanged, so a refresh in
+which only one lottery got a new draw only recomputes that lottery.
+Independent lotteries run in parallel worker processes.
+"""
+
+import hashlib
+import json
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+STAGES = ['scrape', 'validate', 'clean', 'features', 'split']
+
+STAGE_DEPENDENCIES = {
+    'scrape': [],
+    'validate': ['scrape'],
+    'clean': ['scrape'],
+    'features': ['clean'],
+    'split': ['features'],
+}
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+STORAGE_CODE = ['storage/dataset_store.py', 'storage/schema.py']
+
+STAGE_CODE = {
+    'scrape': ['scrapers/base_scraper.py', 'scrapers/nlb_scraper.py',
+               'scrapers/dlb_scraper.py', 'scrapers/scraper_manager.py'],
+    'validate': ['preprocessing/data_validator.py', 'preprocessing/data_cleaner.py', 'storage/catalog.py'],
+    'clean': ['preprocessing/data_cleaner.py', 'storage/catalog.py', 'storage/draw_db.py'] + STORAGE_CODE,
+    'features': ['preprocessing/feature_engineer.py', 'storage/draw_db.py'] + STORAGE_CODE,
+    'split': ['preprocessing/data_splitter.py', 'storage/split_index.py'] + STORAGE_CODE,
+}
+
+SPLIT_NAMES = ['train', 'val', 'test']
+
+
+def file_hash(path: Path) -> Optional[str]:
+    """SHA-256 of a file's content, or None if it does not exist."""
+    if not path.exists():
+        return None
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_version(stage: str) -> str:
+    """Hash of the source files that implement a stage."""
+    digest = hashlib.sha256()
+    for rel_path in STAGE_CODE[stage]:
+        digest.update(rel_path.encode())
+        digest.update((SRC_DIR / rel_path).read_bytes())
+    return digest.hexdigest()
+
+
+class PipelineOrchestrator:
+    """Run the lottery pipeline incrementally, one DAG per lottery."""
+
+    def __init__(
+        self,
+        data_dir: str = 'data',
+        state_path: Optional[str] = None,
+        scrape: bool = False,
+        force: bool = False,
+        max_workers: Optional[int] = None,
+        incremental: bool = False,
+        streaming: bool = False,
+        chunk_size: int = 500,
+        storage_format: str = 'parquet',
+        export_csv: bool = True,
+        export_splits: bool = True,
+        db_path: Optional[str] = None,
+        split_params: Optional[Dict] = None,
+        stats_path: Optional[str] = None
+    ):
+        """
+        Initialize the orchestrator.
+
+        Args:
+            data_dir: Data root containing raw/, processed/ and splits/
+            state_path: JSON file recording fingerprints (default: <data_dir>/pipeline_state.json)
+            scrape: Include the (network) scrape stage
+            force: Ignore recorded fingerprints and rerun every stage
+            max_workers: Parallel lottery workers (default: CPU count, 1 = in-process)
+            incremental: Clean only newly scraped draws (and, with hash splits, hash
+                only new draws and append them to the split index and exported
+                split files) when the stage code and parameters are unchanged
+                since the last run
+            streaming: Use chunked streaming feature engineering
+            chunk_size: Draws per chunk in streaming mode
+            storage_format: 'parquet' or 'csv' for processed and split data
+            export_csv: Also write CSV copies when storing Parquet
+            export_splits: Also write materialized train/val/test files next to the split index
+            db_path: Also load cleaned draws and features into this draw database
+            split_params: Overrides of train_ratio / val_ratio / test_ratio / random_state /
+                split_method for DataSplitter
+            stats_path: JSON file for the split statistics
+                (default: outputs/statistics/split_stats.json next to data_dir)
+        """
+        self.data_dir = Path(data_dir)
+        self.state_path = Path(state_path) if state_path else self.data_dir / 'pipeline_state.json'
+        self.stats_path = (Path(stats_path) if stats_path
+                           else self.data_dir.parent / 'outputs' / 'statistics' / 'split_stats.json')
+        self.scrape = scrape
+        self.force = force
+        self.max_workers = max_workers
+
+        self.config = {
+            'data_dir': str(self.data_dir),
+            'scrape': scrape,
+            'force': force,
+            'incremental': incremental,
+            'streaming': streaming,
+            'chunk_size': chunk_size,
+            'storage_format': storage_format,
+            'export_csv': export_csv,
+            'export_splits': export_splits,
+            'db_path': db_path,
+            'split_params': {
+                'train_ratio': 0.70,
+                'val_ratio': 0.15,
+                'test_ratio': 0.15,
+                'random_state': 42,
+                'split_method': 'stratified',
+                **(split_params or {})
+            },
+        }
+
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict:
+        if self.state_path.exists():
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, 'w') as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+
+    def lotteries(self) -> List[str]:
+        """Lotteries known to the pipeline: raw files on disk, plus scraper configs when scraping."""
+        names = {f.stem for f in (self.data_dir / 'raw').glob('*.csv') if '_with_prizes' not in f.name}
+
+        if self.scrape:
+            from ..scrapers import NLBScraper, DLBScraper
+            names.update(f"nlb_{game}" for game in NLBScraper.LOTTERIES)
+            names.update(f"dlb_{game}" for game in DLBScraper.LOTTERIES)
+
+        return sorted(names)
+
+    def run(self, lotteries: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Run the pipeline for the given lotteries (default: all).
+
+        Returns:
+            Per-lottery, per-stage results with status ('ran', 'skipped',
+            'failed', 'blocked') and seconds
+        """
+        lotteries = lotteries or self.lotteries()
+
+        print("="*70)
+        print("PIPELINE")
+        print("="*70)
+        print(f"Lotteries: {len(lotteries)} | Workers: {self.max_workers or 'auto'} | "
+              f"Scrape: {self.scrape} | Force: {self.force}")
+
+        results = {}
+        split_stats = {}
+
+        if self.max_workers == 1:
+            outcomes = (_run_lottery(lottery, self.config, self.state.get(lottery, {}))
+                        for lottery in lotteries)
+            for lottery, state, stage_results, stats in outcomes:
+                self._collect(lottery, state, stage_results, stats, results, split_stats)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(_run_lottery, lottery, self.config, self.state.get(lottery, {}))
+                    for lottery in lotteries
+                ]
+                for future in as_completed(futures):
+                    lottery, state, stage_results, stats = future.result()
+                    self._collect(lottery, state, stage_results, stats, results, split_stats)
+
+        self._save_state()
+        if split_stats:
+            self._save_split_statistics(split_stats)
+
+        self._print_summary(results)
+        return results
+
+    def _collect(self, lottery, state, stage_results, stats, results, split_stats):
+        self.state[lottery] = state
+        results[lottery] = stage_results
+        if stats:
+            split_stats[lottery] = stats
+
+    def _save_split_statistics(self, split_stats: Dict):
+        """Merge new per-lottery split statistics into the split statistics file."""
+        from ..preprocessing.data_splitter import DataSplitter
+
+        splitter = DataSplitter(
+            input_dir=str(self.data_dir / 'processed'),
+            output_dir=str(self.data_dir / 'splits'),
+            **self.config['split_params'],
+            stats_path=str(self.stats_path)
+        )
+
+        if self.stats_path.exists():
+            with open(self.stats_path, 'r') as f:
+                splitter.split_stats = json.load(f).get('lotteries', {})
+
+        splitter.split_stats.update(split_stats)
+        splitter._save_statistics()
+
+    def _print_summary(self, results: Dict[str, Dict]):
+        print("\n" + "="*70)
+        print("PIPELINE SUMMARY")
+        print("="*70)
+
+        header = ''.join(f"{stage:<11}" for stage in STAGES)
+        print(f"\n{'Lottery':<30} {header}")
+        print("-"*(31 + 11 * len(STAGES)))
+
+        counts = {}
+        for lottery in sorted(results):
+            row = ''
+            for stage in STAGES:
+                status = results[lottery].get(stage, {}).get('status', '-')
+                counts[status] = counts.get(status, 0) + 1
+                row += f"{status:<11}"
+            print(f"{lottery:<30} {row}")
+
+        print("-"*(31 + 11 * len(STAGES)))
+        print("  ".join(f"{status}: {count}" for status, count in sorted(counts.items())))
+        print(f"State saved to: {self.state_path}")
+
+
+def _stage_paths(stage: str, lottery: str, config: Dict) -> Dict[str, List[Path]]:
+    """Input and output files of a (stage, lottery)."""
+    data_dir = Path(config['data_dir'])
+    fmt = config['storage_format']
+
+    raw = data_dir / 'raw' / f"{lottery}.csv"
+    # Incremental cleaning appends new draws as part files next to the cleaned dataset
+    cleaned = [data_dir / 'processed' / f"{lottery}_cleaned.{fmt}"]
+    cleaned += sorted((data_dir / 'processed' / f"{lottery}_cleaned.parts").glob('*.parquet'))
+    featured = data_dir / 'processed' / f"{lottery}_featured.{fmt}"
+    # Incremental hash splits append new draws as part files as well
+    split_names = [f"{lottery}_split_index"]
+    if config.get('export_splits', True):
+        split_names += [f"{lottery}_{name}" for name in SPLIT_NAMES]
+    splits = []
+    for name in split_names:
+        splits.append(data_dir / 'splits' / f"{name}.{fmt}")
+        splits += sorted((data_dir / 'splits' / f"{name}.parts").glob('*.parquet'))
+
+    return {
+        'scrape': {'inputs': [], 'outputs': [raw]},
+        'validate': {'inputs': [raw], 'outputs': []},
+        'clean': {'inputs': [raw], 'outputs': cleaned},
+        'features': {'inputs': cleaned, 'outputs': [featured]},
+        'split': {'inputs': [featured], 'outputs': splits},
+    }[stage]
+
+
+def _stage_params(stage: str, config: Dict) -> Dict:
+    """Parameters that change a stage's output."""
+    storage = {'storage_format': config['storage_format'], 'export_csv': config['export_csv']}
+    return {
+        'scrape': {},
+        'validate': {},
+        'clean': {**storage, 'db_path': config['db_path']},
+        'features': {**storage, 'db_path': config['db_path'], 'streaming': config['streaming']},
+        'split': {**storage, 'export_splits': config.get('export_splits', True), **config['split_params']},
+    }[stage]
+
+
+def _fingerprint(stage: str, lottery: str, config: Dict) -> str:
+    paths = _stage_paths(stage, lottery, config)
+    payload = {
+        'inputs': {p.name: file_hash(p) for p in paths['inputs']},
+        'code': code_version(stage),
+        'params': _stage_params(stage, config),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _outputs_intact(stage: str, lottery: str, config: Dict, recorded: Dict) -> bool:
+    """Check that the outputs recorded for a stage still exist unchanged."""
+    outputs = _stage_paths(stage, lottery, config)['outputs']
+    recorded_hashes = recorded.get('outputs', {})
+    return all(recorded_hashes.get(p.name) is not None and recorded_hashes.get(p.name) == file_hash(p)
+               for p in outputs)
+
+
+def _execute_stage(stage: str, lottery: str, config: Dict, stages: Dict, incremental: bool = False) -> Dict:
+    """Run one stage for one lottery; returns extra info to record."""
+    data_dir = Path(config['data_dir'])
+
+    if stage == 'scrape':
+        source, game = lottery.split('_', 1)
+        stages['scrape'].scrape_single_lottery(source, game, save=True)
+        return {}
+
+    if stage == 'validate':
+        result = stages['validate'].validate_lottery(lottery)
+        if 'error' in result:
+            raise RuntimeError(result['error'])
+        return {'validation_status': result['status']}
+
+    if stage == 'clean':
+        stages['clean'].clean_lottery(lottery, incremental=incremental)
+        return {}
+
+    if stage == 'features':
+        stages['features'].engineer_lottery(lottery, config['streaming'], config['chunk_size'])
+        return {}
+
+    if stage == 'split':
+        return {'split_stats': stages['split'].split_lottery(lottery, incremental=incremental)}
+
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def _build_stages(config: Dict) -> Dict:
+    """Construct the stage objects used by a worker."""
+    from ..preprocessing.data_validator import DataValidator
+    from ..preprocessing.data_cleaner import DataCleaner
+    from ..preprocessing.feature_engineer import FeatureEngineer
+    from ..preprocessing.data_splitter import DataSplitter
+
+    data_dir = Path(config['data_dir'])
+    raw_dir = str(data_dir / 'raw')
+    processed_dir = str(data_dir / 'processed')
+    splits_dir = str(data_dir / 'splits')
+    storage = {'storage_format': config['storage_format'], 'export_csv': config['export_csv']}
+
+    stages = {
+        'validate': DataValidator(raw_dir),
+        'clean': DataCleaner(raw_dir, processed_dir, db_path=config['db_path'], **storage),
+        'features': FeatureEngineer(processed_dir, processed_dir, db_path=config['db_path'], **storage),
+        'split': DataSplitter(
+            processed_dir, splits_dir, **config['split_params'], **storage,
+            export_splits=config.get('export_splits', True)
+        ),
+    }
+
+    if config['scrape']:
+        from ..scrapers import ScraperManager
+        stages['scrape'] = ScraperManager(raw_dir, db_path=config['db_path'])
+
+    return stages
+
+
+def _run_lottery(lottery: str, config: Dict, state: Dict):
+    """
+    Run the DAG of one lottery (executed in a worker process).
+
+    Returns:
+        Tuple of (lottery, updated state, stage results, split stats or None)
+    """
+    state = dict(state)
+    stage_results = {}
+    split_stats = None
+    stages = None
+
+    for stage in STAGES:
+        if stage == 'scrape' and not config['scrape']:
+            continue
+
+        upstream = [stage_results.get(dep, {}).get('status') for dep in STAGE_DEPENDENCIES[stage]]
+        if any(status in ('failed', 'blocked') for status in upstream):
+            stage_results[stage] = {'status': 'blocked'}
+            continue
+
+        start = time.perf_counter()
+        recorded = state.get(stage, {})
+
+        # The scrape stage has no local inputs, so it always runs when enabled
+        fingerprint = None if stage == 'scrape' else _fingerprint(stage, lottery, config)
+
+        if (not config['force'] and fingerprint is not None
+                and recorded.get('fingerprint') == fingerprint
+                and _outputs_intact(stage, lottery, config, recorded)):
+            stage_results[stage] = {'status': 'skipped', 'seconds': 0.0}
+            continue
+
+        # Appending to earlier outputs is only safe if they came from the same code and parameters
+        incremental = (config['incremental']
+                       and recorded.get('code') == code_version(stage)
+                       and recorded.get('params') == _stage_params(stage, config)
+                       and _outputs_intact(stage, lottery, config, recorded))
+
+        try:
+            if stages is None:
+                stages = _build_stages(config)
+            info = _execute_stage(stage, lottery, config, stages, incremental)
+        except Exception as e:
+            print(f"  [ERROR] {stage} failed for {lottery}: {e}")
+            traceback.print_exc()
+            stage_results[stage] = {'status': 'failed', 'error': str(e)}
+            state.pop(stage, None)
+            continue
+
+        if 'split_stats' in info:
+            split_stats = info.pop('split_stats')
+
+        outputs = _stage_paths(stage, lottery, config)['outputs']
+        state[stage] = {
+            'fingerprint': fingerprint,
+            'code': code_version(stage),
+            'params': _stage_params(stage, config),
+            'outputs': {p.name: file_hash(p) for p in outputs},
+            'completed_at': datetime.now().isoformat(),
+            **info
+        }
+        stage_results[stage] = {'status': 'ran', 'seconds': round(time.perf_counter() - start, 3)}
+
+    return lottery, state, stage_results, split_stats
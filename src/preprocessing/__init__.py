@@ -4,5 +4,6 @@ Preprocessing module for lottery data validation, cleaning, and feature engineer
 
 from .data_validator import DataValidator
 from .data_cleaner import DataCleaner
+from .walk_forward import WalkForwardSplitter
 
-__all__ = ['DataValidator', 'DataCleaner']
+__all__ = ['DataValidator', 'DataCleaner', 'WalkForwardSplitter']
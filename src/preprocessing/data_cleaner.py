@@ -7,208 +7,480 @@ Standardizes formats, handles missing values, and prepares data for feature engi
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from ..storage import DatasetCatalog, DatasetStore, DrawDatabase, compact
+from ..storage.dataset_store import HAS_PYARROW
+
+# Date format written by the NLB and DLB scrapers
+DATE_FORMAT = '%Y-%m-%d'
+
+# Semicolon-separated integers, e.g. '05;12;33' (whitespace around entries allowed)
+NUMBERS_PATTERN = r'\s*[+-]?\d+\s*(?:;\s*[+-]?\d+\s*)*'
+
+# Arrow-backed strings run the regex and splitting in C++ when pyarrow is installed
+STRING_DTYPE = 'string[pyarrow]' if HAS_PYARROW else object
+
+# Zero-padded text for the common number range
+TWO_DIGITS = np.array([f"{n:02d}" for n in range(100)], dtype=object)
+
+
+def parse_draw_dates(raw_dates: pd.Series) -> pd.Series:
+    """
+    Parse draw dates to datetime64.
+
+    Dates are parsed with the explicit DATE_FORMAT; only values that do not
+    match it fall back to format inference.
+
+    Args:
+        raw_dates: Series of date strings
+
+    Returns:
+        datetime64 Series with NaT for unparseable dates
+    """
+    draw_dates = pd.to_datetime(raw_dates, format=DATE_FORMAT, errors='coerce')
+
+    unparsed = draw_dates.isna() & raw_dates.notna()
+    if unparsed.any():
+        draw_dates[unparsed] = pd.to_datetime(raw_dates[unparsed].astype(str), format='mixed', errors='coerce')
+
+    return draw_dates
+
+
+def number_matrix(numbers: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split semicolon-separated number strings into an integer matrix.
+
+    Args:
+        numbers: Series of strings such as '05;12;33'
+
+    Returns:
+        Tuple of (int64 matrix with one row per valid draw, zero-padded on
+        the right for draws with fewer numbers; count of numbers per valid
+        draw; boolean mask of valid rows in the input)
+    """
+    values = numbers.astype(STRING_DTYPE)
+    valid = values.str.fullmatch(NUMBERS_PATTERN).fillna(False).to_numpy(dtype=bool)
+
+    strings = values[valid].tolist()
+    if len(strings) == 0:
+        return np.zeros((0, 0), dtype=np.int64), np.zeros(0, dtype=np.int64), valid
+
+    counts = np.char.count(np.array(strings, dtype=str), ';').astype(np.int64) + 1
+    flat = np.fromstring(' '.join(strings).replace(';', ' '), dtype=np.int64, sep=' ')
+
+    if (counts == counts[0]).all():
+        return flat.reshape(len(strings), counts[0]), counts, valid
+
+    matrix = np.zeros((len(strings), counts.max()), dtype=np.int64)
+    matrix[np.arange(counts.max()) < counts[:, None]] = flat
+    return matrix, counts, valid
+
+
+def parse_draws(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Parse the dates and numbers of raw draws into arrays aligned with the rows.
+
+    Args:
+        df: Raw DataFrame with draw_date and numbers columns
+
+    Returns:
+        Dictionary with 'dates' (datetime64, NaT if unparseable), 'numbers'
+        (int64 matrix, zero-padded), 'counts' (numbers per draw, 0 if
+        unparseable) and 'numbers_valid' (parseable rows)
+    """
+    matrix, counts, numbers_valid = number_matrix(df['numbers'])
+
+    full_matrix = np.zeros((len(df), matrix.shape[1]), dtype=np.int64)
+    full_matrix[numbers_valid] = matrix
+    full_counts = np.zeros(len(df), dtype=np.int64)
+    full_counts[numbers_valid] = counts
+
+    return {
+        'dates': parse_draw_dates(df['draw_date']).to_numpy(),
+        'numbers': full_matrix,
+        'counts': full_counts,
+        'numbers_valid': numbers_valid,
+    }
+
 
 class DataCleaner:
     """Cleans and standardizes lottery data."""
 
-    def __init__(self, input_dir: str = 'data/raw', output_dir: str = 'data/processed'):
+    def __init__(
+        self,
+        input_dir: str = 'data/raw',
+        output_dir: str = 'data/processed',
+        storage_format: str = 'parquet',
+        export_csv: bool = True,
+        db_path: Optional[str] = None
+    ):
         """
         Initialize the data cleaner.
 
         Args:
             input_dir: Directory containing raw CSV files
             output_dir: Directory to save cleaned data
+            storage_format: 'parquet' or 'csv' for the cleaned files
+            export_csv: Also write CSV copies when storing Parquet
+            db_path: Also load cleaned draws into this draw database
         """
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.store = DatasetStore(self.output_dir, storage_format, export_csv)
+        self.db = DrawDatabase(db_path) if db_path else None
+        self.catalog = DatasetCatalog(input_dir)
+        self.memory_stats = {}
+
+    def clean_all(self, incremental: bool = False):
+        """
+        Clean all lottery CSV files.
 
-    def clean_all(self):
-        """Clean all lottery CSV files."""
+        Args:
+            incremental: Only clean draws not yet in the cleaned datasets
+                (see clean_lottery)
+        """
         print("="*70)
-        print("DATA CLEANING")
+        print("DATA CLEANING" + (" (incremental)" if incremental else ""))
         print("="*70)
 
-        csv_files = list(self.input_dir.glob('*.csv'))
-        # Exclude prize files
-        csv_files = [f for f in csv_files if '_with_prizes' not in f.name]
+        lotteries = self.catalog.lotteries()
 
         cleaned_count = 0
 
-        for csv_file in sorted(csv_files):
-            lottery_name = csv_file.stem
-            print(f"\nCleaning {lottery_name}...")
-
+        for lottery_name in lotteries:
             try:
-                df = pd.read_csv(csv_file)
-                df_cleaned = self._clean_lottery(df, lottery_name)
-
-                # Save cleaned data
-                output_path = self.output_dir / f"{lottery_name}_cleaned.csv"
-                df_cleaned.to_csv(output_path, index=False)
-
-                print(f"  [OK] Cleaned {len(df)} -> {len(df_cleaned)} rows")
-                print(f"  [OK] Saved to {output_path}")
+                self.clean_lottery(lottery_name, incremental)
                 cleaned_count += 1
 
             except Exception as e:
                 print(f"  [ERROR] Failed to clean: {e}")
 
         print(f"\n" + "="*70)
-        print(f"Cleaned {cleaned_count}/{len(csv_files)} lotteries")
+        print(f"Cleaned {cleaned_count}/{len(lotteries)} lotteries")
         print("="*70)
 
+    def clean_lottery(self, lottery_name: str, incremental: bool = False) -> Path:
+        """
+        Clean one raw lottery CSV and save the cleaned dataset.
+
+        In incremental mode only raw draws whose draw_id is not yet in the
+        cleaned dataset are cleaned and appended with continuing
+        draw_sequence values (DatasetStore.append, without rewriting the
+        stored draws). It falls back to a full rebuild when the new
+        draws do not sort after the last cleaned date, or when historical
+        raw rows were corrected or removed.
+
+        Args:
+            lottery_name: Name of the lottery (raw file stem)
+            incremental: Append only new draws to the existing cleaned dataset
+
+        Returns:
+            Path of the cleaned dataset written
+        """
+        print(f"\nCleaning {lottery_name}...")
+
+        df = self.catalog.frame(lottery_name)
+        cleaned_name = f"{lottery_name}_cleaned"
+
+        df_new = None
+        existing_rows = 0
+        if incremental and self.store.exists(cleaned_name):
+            df_existing = self.store.read(cleaned_name)
+            df_new, reason = self._clean_new_draws(df, df_existing, lottery_name)
+
+            if df_new is None:
+                print(f"  [INFO] Full rebuild: {reason}")
+            elif df_new.empty:
+                print(f"  [OK] Up to date ({len(df_existing)} rows)")
+                return self.store.path(cleaned_name)
+            else:
+                existing_rows = len(df_existing)
+
+        if df_new is None:
+            df_new = self._clean_lottery(df, lottery_name)
+
+        df_new, self.memory_stats[lottery_name] = compact(df_new, 'cleaned')
+
+        # Save cleaned data: new draws are appended, a rebuild replaces the dataset
+        if existing_rows:
+            output_path = self.store.append(df_new, cleaned_name)
+        else:
+            output_path = self.store.write(df_new, cleaned_name)
+        if self.db is not None:
+            self.db.load_draws(df_new, lottery_name, replace=not existing_rows)
+
+        appended = f" ({len(df_new)} new)" if existing_rows else ""
+        print(f"  [OK] Cleaned {len(df)} -> {existing_rows + len(df_new)} rows{appended}")
+        print(f"  [OK] Memory: {self.memory_stats[lottery_name]['before_mb']:.2f} MB -> "
+              f"{self.memory_stats[lottery_name]['after_mb']:.2f} MB")
+        print(f"  [OK] Saved to {output_path}")
+
+        return output_path
+
+    def _clean_new_draws(
+        self,
+        df_raw: pd.DataFrame,
+        df_existing: pd.DataFrame,
+        lottery_name: str
+    ) -> Tuple[Optional[pd.DataFrame], str]:
+        """
+        Clean the raw draws that are not yet in the cleaned dataset.
+
+        Args:
+            df_raw: Full raw DataFrame
+            df_existing: Current cleaned DataFrame
+            lottery_name: Name of the lottery
+
+        Returns:
+            Tuple of (cleaned new draws with continuing draw_sequence, or
+            None when a full rebuild is needed; reason for the rebuild)
+        """
+        if df_existing.empty:
+            return None, "no cleaned draws yet"
+
+        known = df_raw['draw_id'].isin(df_existing['draw_id']).to_numpy()
+
+        # Historical draws must be unchanged and still present in the raw data
+        if not df_existing['draw_id'].isin(df_raw['draw_id']).all():
+            return None, "cleaned draws missing from raw data"
+
+        corrected = self._count_corrected(df_raw[known], df_existing)
+        if corrected:
+            return None, f"{corrected} corrected historical rows"
+
+        if known.all():
+            return df_existing.iloc[:0], ""
+
+        df_new = self._clean_lottery(df_raw[~known], lottery_name)
+        if df_new.empty:
+            return df_new, ""
+
+        # New draws must come after everything already cleaned
+        last_date = df_existing['draw_date'].max()
+        out_of_order = (df_new['draw_date'] <= last_date).sum()
+        if out_of_order:
+            return None, f"{out_of_order} new draws dated on or before {last_date:%Y-%m-%d}"
+
+        df_new['draw_sequence'] += int(df_existing['draw_sequence'].max())
+        return df_new, ""
+
+    def _count_corrected(self, df_raw: pd.DataFrame, df_existing: pd.DataFrame) -> int:
+        """
+        Count raw rows whose date, numbers or letter differ from the cleaned draw.
+
+        Compares parsed values (parse_draws on both sides) rather than text, so
+        formatting that cleaning normalizes, such as zero-padding, whitespace
+        or the date format, is not counted as a correction.
+
+        Args:
+            df_raw: Raw rows whose draw_id is already cleaned
+            df_existing: Current cleaned DataFrame
+
+        Returns:
+            Number of differing raw rows
+        """
+        cleaned = df_existing.drop_duplicates('draw_id').set_index('draw_id')
+        cleaned = cleaned.reindex(df_raw['draw_id']).reset_index()
+
+        raw_draws = parse_draws(df_raw)
+        cleaned_draws = parse_draws(cleaned)
+
+        # Unparseable raw dates (NaT) never match, so they count as corrected
+        differs = raw_draws['dates'] != cleaned_draws['dates']
+        differs |= raw_draws['counts'] != cleaned_draws['counts']
+
+        width = max(raw_draws['numbers'].shape[1], cleaned_draws['numbers'].shape[1])
+        raw_numbers, cleaned_numbers = (
+            np.pad(draws['numbers'], ((0, 0), (0, width - draws['numbers'].shape[1])))
+            for draws in (raw_draws, cleaned_draws)
+        )
+        differs |= (raw_numbers != cleaned_numbers).any(axis=1)
+
+        if 'letter' in df_raw.columns:
+            expected = cleaned['letter'].astype(object).fillna('').astype(str)
+            actual = df_raw['letter'].astype(object).fillna('').astype(str)
+            differs |= expected.to_numpy() != actual.to_numpy()
+
+        return int(differs.sum())
+
     def _clean_lottery(self, df: pd.DataFrame, lottery_name: str) -> pd.DataFrame:
         """
         Clean a single lottery dataset.
 
+        All steps work on one copy of the raw frame: each assigns its parsed
+        columns in place and narrows a shared keep-mask, and rows are
+        filtered once at the end.
+
         Args:
             df: DataFrame containing lottery data
             lottery_name: Name of the lottery
 
         Returns:
-            Cleaned DataFrame
+            Cleaned DataFrame with draw_date as datetime64
         """
         df_clean = df.copy()
+        keep = np.ones(len(df_clean), dtype=bool)
 
-        # 1. Standardize date format
-        df_clean = self._standardize_dates(df_clean)
+        # 1. Parse dates (kept as datetime64)
+        keep = self._standardize_dates(df_clean, keep)
 
         # 2. Parse and validate numbers
-        df_clean = self._parse_numbers(df_clean)
+        keep = self._parse_numbers(df_clean, keep)
 
         # 3. Remove duplicates
-        df_clean = self._remove_duplicates(df_clean)
+        keep = self._remove_duplicates(df_clean, keep)
 
         # 4. Handle missing values
-        df_clean = self._handle_missing_values(df_clean)
+        keep = self._handle_missing_values(df_clean, keep)
 
         # 5. Sort by date (oldest first)
-        df_clean = df_clean.sort_values('draw_date').reset_index(drop=True)
+        df_clean = df_clean[keep].sort_values('draw_date', kind='stable', ignore_index=True)
 
         # 6. Add draw sequence number
-        df_clean['draw_sequence'] = range(1, len(df_clean) + 1)
+        df_clean['draw_sequence'] = np.arange(1, len(df_clean) + 1)
 
         return df_clean
 
-    def _standardize_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _standardize_dates(self, df: pd.DataFrame, keep: np.ndarray) -> np.ndarray:
         """
-        Standardize date formats to YYYY-MM-DD.
+        Parse draw dates to datetime64.
 
         Args:
-            df: DataFrame with draw_date column
+            df: DataFrame with draw_date column (modified in place)
+            keep: Boolean mask of rows still kept
 
         Returns:
-            DataFrame with standardized dates
+            Updated keep mask without rows with invalid dates
         """
-        df_clean = df.copy()
-
-        # Convert to datetime
-        df_clean['draw_date'] = pd.to_datetime(df_clean['draw_date'], errors='coerce')
+        draw_dates = parse_draw_dates(df['draw_date'])
+        df['draw_date'] = draw_dates
 
         # Remove rows with invalid dates
-        invalid_dates = df_clean['draw_date'].isnull().sum()
-        if invalid_dates > 0:
-            print(f"    Removing {invalid_dates} rows with invalid dates")
-            df_clean = df_clean[df_clean['draw_date'].notnull()]
+        invalid_dates = draw_dates.isna().to_numpy() & keep
+        if invalid_dates.any():
+            print(f"    Removing {invalid_dates.sum()} rows with invalid dates")
 
-        # Convert back to string format (YYYY-MM-DD)
-        df_clean['draw_date'] = df_clean['draw_date'].dt.strftime('%Y-%m-%d')
+        return keep & ~invalid_dates
 
-        return df_clean
-
-    def _parse_numbers(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _parse_numbers(self, df: pd.DataFrame, keep: np.ndarray) -> np.ndarray:
         """
         Parse and validate winning numbers.
 
+        Splits the semicolon-separated strings into an integer matrix in one
+        vectorized pass and re-formats them zero-padded.
+
         Args:
-            df: DataFrame with numbers column
+            df: DataFrame with numbers column (modified in place)
+            keep: Boolean mask of rows still kept
 
         Returns:
-            DataFrame with validated numbers
+            Updated keep mask without rows with invalid numbers
         """
-        df_clean = df.copy()
+        matrix, counts, valid = number_matrix(df['numbers'])
 
-        # Ensure numbers are properly formatted (semicolon-separated)
-        def validate_numbers(numbers_str):
-            try:
-                # Split and convert to integers
-                numbers = [int(n.strip()) for n in str(numbers_str).split(';')]
-                # Re-format with zero-padding
-                return ';'.join([f"{n:02d}" for n in numbers])
-            except:
-                return None
-
-        df_clean['numbers'] = df_clean['numbers'].apply(validate_numbers)
+        # Re-format with zero-padding
+        formatted = np.full(len(df), None, dtype=object)
+        formatted[valid] = self._format_numbers(matrix, counts)
+        df['numbers'] = formatted
 
         # Remove rows with invalid numbers
-        invalid_numbers = df_clean['numbers'].isnull().sum()
-        if invalid_numbers > 0:
-            print(f"    Removing {invalid_numbers} rows with invalid numbers")
-            df_clean = df_clean[df_clean['numbers'].notnull()]
+        invalid_numbers = ~valid & keep
+        if invalid_numbers.any():
+            print(f"    Removing {invalid_numbers.sum()} rows with invalid numbers")
 
-        return df_clean
+        return keep & ~invalid_numbers
 
-    def _remove_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _format_numbers(matrix: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Format an integer matrix back to zero-padded '05;12;33' strings.
+
+        Args:
+            matrix: Numbers per draw (from _number_matrix)
+            counts: Count of numbers per draw
+
+        Returns:
+            Object array of formatted strings
+        """
+        formatted = np.empty(len(matrix), dtype=object)
+
+        for count in np.unique(counts):
+            rows = counts == count
+            columns = []
+            for col in matrix[rows, :count].T:
+                in_range = (col >= 0) & (col < len(TWO_DIGITS))
+                text = TWO_DIGITS[np.where(in_range, col, 0)]
+                if not in_range.all():
+                    text[~in_range] = [f"{n:02d}" for n in col[~in_range]]
+                columns.append(text)
+
+            joined = columns[0]
+            for text in columns[1:]:
+                joined = joined + ';' + text
+            formatted[rows] = joined
+
+        return formatted
+
+    def _remove_duplicates(self, df: pd.DataFrame, keep: np.ndarray) -> np.ndarray:
         """
         Remove duplicate draws based on draw_id and numbers.
 
         Args:
             df: DataFrame
+            keep: Boolean mask of rows still kept
 
         Returns:
-            DataFrame without duplicates
+            Updated keep mask without duplicate draws
         """
-        df_clean = df.copy()
-
-        # Remove exact duplicates (draw_id + numbers)
-        before_count = len(df_clean)
-        df_clean = df_clean.drop_duplicates(subset=['draw_id', 'numbers'], keep='first')
-        after_count = len(df_clean)
+        # Remove exact duplicates (draw_id + numbers) among the kept rows
+        duplicates = np.zeros(len(df), dtype=bool)
+        duplicates[keep] = df.loc[keep, ['draw_id', 'numbers']].duplicated(keep='first').to_numpy()
 
-        if before_count != after_count:
-            print(f"    Removed {before_count - after_count} duplicate draws")
+        if duplicates.any():
+            print(f"    Removed {duplicates.sum()} duplicate draws")
 
-        return df_clean
+        return keep & ~duplicates
 
-    def _handle_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _handle_missing_values(self, df: pd.DataFrame, keep: np.ndarray) -> np.ndarray:
         """
         Handle missing values in the dataset.
 
         Args:
-            df: DataFrame
+            df: DataFrame (modified in place)
+            keep: Boolean mask of rows still kept
 
         Returns:
-            DataFrame with handled missing values
+            Updated keep mask without rows missing critical data
         """
-        df_clean = df.copy()
-
         # Fill missing letters with empty string (some lotteries don't have letters)
-        if 'letter' in df_clean.columns:
-            df_clean['letter'] = df_clean['letter'].fillna('')
+        if 'letter' in df.columns:
+            df['letter'] = df['letter'].fillna('')
 
         # Critical columns should not have missing values
         # If they do, remove those rows
         critical_cols = ['draw_date', 'draw_id', 'numbers']
-        missing_critical = df_clean[critical_cols].isnull().any(axis=1).sum()
+        missing_critical = df[critical_cols].isna().any(axis=1).to_numpy() & keep
 
-        if missing_critical > 0:
-            print(f"    Removing {missing_critical} rows with missing critical data")
-            df_clean = df_clean.dropna(subset=critical_cols)
+        if missing_critical.any():
+            print(f"    Removing {missing_critical.sum()} rows with missing critical data")
 
-        return df_clean
+        return keep & ~missing_critical
 
     def generate_cleaning_report(self):
-        """Generate a report comparing raw vs cleaned data."""
+        """
+        Generate a report comparing raw vs cleaned data.
+
+        Raw row counts come from the dataset catalog manifest and cleaned row
+        counts from the file metadata, so unchanged data is not read again.
+        """
         print("\n" + "="*70)
         print("CLEANING REPORT")
         print("="*70)
 
-        raw_files = list(self.input_dir.glob('*.csv'))
-        raw_files = [f for f in raw_files if '_with_prizes' not in f.name]
+        summaries = self.catalog.summaries()
 
         total_raw = 0
         total_cleaned = 0
@@ -216,13 +488,12 @@ class DataCleaner:
         print(f"\n{'Lottery':<30} {'Raw':<10} {'Cleaned':<10} {'Removed':<10}")
         print("-"*70)
 
-        for raw_file in sorted(raw_files):
-            lottery_name = raw_file.stem
-            cleaned_file = self.output_dir / f"{lottery_name}_cleaned.csv"
+        for lottery_name, summary in summaries.items():
+            cleaned_name = f"{lottery_name}_cleaned"
 
-            if cleaned_file.exists():
-                raw_count = len(pd.read_csv(raw_file))
-                cleaned_count = len(pd.read_csv(cleaned_file))
+            if self.store.exists(cleaned_name):
+                raw_count = summary['rows']
+                cleaned_count = self.store.count_rows(cleaned_name)
                 removed = raw_count - cleaned_count
 
                 total_raw += raw_count
@@ -236,6 +507,8 @@ class DataCleaner:
 
 
 if __name__ == '__main__':
+    import sys
+
     cleaner = DataCleaner('data/raw', 'data/processed')
-    cleaner.clean_all()
+    cleaner.clean_all(incremental='--incremental' in sys.argv)
     cleaner.generate_cleaning_report()
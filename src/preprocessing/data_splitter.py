@@ -2,23 +2,78 @@
 Data Splitter for lottery datasets.
 
 Splits data into train/validation/test sets with stratification to maintain class balance.
+Splits are persisted as row indices into the featured data (see src/storage/split_index.py);
+materialized train/val/test files are an optional export.
+
+With split_method='hash', each (lottery, draw_id) is assigned to a split by a
+stable hash instead, so assignments never change between runs; incremental
+runs hash only draws missing from the stored index and append them.
 """
 
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from sklearn.model_selection import train_test_split
+import hashlib
 import json
-from typing import Dict, Tuple
+from typing import Dict, Optional, Sequence, Tuple
+
+from ..storage import DatasetStore, SplitIndex, SplitView
+from ..storage.schema import SPLIT_NAMES
+
+
+def hash_fraction(lottery_name: str, draw_id) -> float:
+    """
+    Stable position of a draw in [0, 1).
+
+    Uses BLAKE2b rather than hash(), which is salted per process.
+
+    Args:
+        lottery_name: Name of the lottery
+        draw_id: Draw identifier
+
+    Returns:
+        Fraction derived from the hash of '<lottery>:<draw_id>'
+    """
+    digest = hashlib.blake2b(f"{lottery_name}:{int(draw_id)}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') / 2**64
+
+
+def hash_folds(lottery_name: str, draw_ids: np.ndarray, ratios: Sequence[float]) -> np.ndarray:
+    """
+    Fold code (index into SPLIT_NAMES) of every row, by hashing its draw.
+
+    Each distinct draw_id is hashed once, so all rows of a draw share a fold.
+
+    Args:
+        lottery_name: Name of the lottery
+        draw_ids: draw_id of every row
+        ratios: Train, val and test proportions
+
+    Returns:
+        uint8 array of fold codes aligned with draw_ids
+    """
+    draws, inverse = np.unique(draw_ids, return_inverse=True)
+    fractions = np.array([hash_fraction(lottery_name, draw_id) for draw_id in draws])
+    cutoffs = np.cumsum(ratios)[:-1]
+    return np.searchsorted(cutoffs, fractions, side='right').astype(np.uint8)[inverse]
+
+
+def _by_key(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows of a split file ordered by (draw_id, number), to compare regardless of append order."""
+    return df.sort_values(['draw_id', 'number'], kind='stable').reset_index(drop=True)
 
 
 class DataSplitter:
     """
     Split lottery datasets into train/validation/test sets.
 
-    Uses stratified splitting to maintain class balance across splits.
+    Uses stratified splitting to maintain class balance across splits, or
+    stable hash-based assignment of whole draws.
     """
 
+    SPLIT_METHODS = ('stratified', 'hash')
+
     def __init__(
         self,
         input_dir: str = 'data/processed',
@@ -26,7 +81,12 @@ class DataSplitter:
         train_ratio: float = 0.70,
         val_ratio: float = 0.15,
         test_ratio: float = 0.15,
-        random_state: int = 42
+        random_state: int = 42,
+        storage_format: str = 'parquet',
+        export_csv: bool = True,
+        export_splits: bool = True,
+        split_method: str = 'stratified',
+        stats_path: str = 'outputs/statistics/split_stats.json'
     ):
         """
         Initialize the data splitter.
@@ -38,10 +98,25 @@ class DataSplitter:
             val_ratio: Proportion for validation set (default 0.15)
             test_ratio: Proportion for test set (default 0.15)
             random_state: Random seed for reproducibility
+            storage_format: 'parquet' or 'csv' for the split files
+            export_csv: Also write CSV copies when storing Parquet
+            export_splits: Also write materialized train/val/test files, which
+                the notebooks read (the split index is always written)
+            split_method: 'stratified' (random, class-balanced) or 'hash'
+                (stable per (lottery, draw_id), ignores random_state)
+            stats_path: JSON file for the split statistics
         """
+        if split_method not in self.SPLIT_METHODS:
+            raise ValueError(f"Unknown split method: {split_method}. Use one of {self.SPLIT_METHODS}")
+
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.input_store = DatasetStore(self.input_dir, storage_format, export_csv)
+        self.output_store = DatasetStore(self.output_dir, storage_format, export_csv)
+        self.index = SplitIndex(self.output_dir, self.input_dir, storage_format)
+        self.export_splits = export_splits
+        self.stats_path = Path(stats_path)
 
         assert abs(train_ratio + val_ratio + test_ratio - 1.0) < 0.01, \
             "Train, val, and test ratios must sum to 1.0"
@@ -50,6 +125,7 @@ class DataSplitter:
         self.val_ratio = val_ratio
         self.test_ratio = test_ratio
         self.random_state = random_state
+        self.split_method = split_method
 
         self.split_stats = {}
 
@@ -59,27 +135,20 @@ class DataSplitter:
         print("DATA SPLITTING")
         print("="*70)
         print(f"Split ratios: Train={self.train_ratio}, Val={self.val_ratio}, Test={self.test_ratio}")
-        print(f"Random state: {self.random_state}")
+        print(f"Split method: {self.split_method}")
+        if self.split_method == 'stratified':
+            print(f"Random state: {self.random_state}")
         print("="*70)
 
-        csv_files = list(self.input_dir.glob('*_featured.csv'))
+        featured_names = self.input_store.names('*_featured')
 
         split_count = 0
 
-        for csv_file in sorted(csv_files):
-            lottery_name = csv_file.stem.replace('_featured', '')
-            print(f"\nSplitting {lottery_name}...")
+        for featured_name in featured_names:
+            lottery_name = featured_name.replace('_featured', '')
 
             try:
-                df = pd.read_csv(csv_file)
-                splits = self._split_lottery(df, lottery_name)
-
-                # Save splits
-                for split_name, split_df in splits.items():
-                    output_path = self.output_dir / f"{lottery_name}_{split_name}.csv"
-                    split_df.to_csv(output_path, index=False)
-                    print(f"  [OK] {split_name:5s}: {len(split_df):6d} records -> {output_path.name}")
-
+                self.split_lottery(lottery_name)
                 split_count += 1
 
             except Exception as e:
@@ -88,28 +157,148 @@ class DataSplitter:
                 traceback.print_exc()
 
         print(f"\n" + "="*70)
-        print(f"Splitting complete: {split_count}/{len(csv_files)} lotteries")
+        print(f"Splitting complete: {split_count}/{len(featured_names)} lotteries")
         print("="*70)
 
         # Save split statistics
         self._save_statistics()
 
-    def _split_lottery(self, df: pd.DataFrame, lottery_name: str) -> Dict[str, pd.DataFrame]:
+    def split_lottery(self, lottery_name: str, incremental: bool = False) -> Dict:
+        """
+        Split one featured lottery dataset and save its split index.
+
+        Only the 'appeared' (and for hash splits 'draw_id') column is read to
+        assign rows; the featured frame is loaded in full only when
+        materialized split files are exported.
+
+        Args:
+            lottery_name: Name of the lottery
+            incremental: With hash splits, hash only draws missing from the
+                stored index and append them (and their rows in exported
+                split files) instead of rewriting the split
+
+        Returns:
+            Split statistics for the lottery
+        """
+        print(f"\nSplitting {lottery_name}...")
+
+        featured_name = f"{lottery_name}_featured"
+        columns = ['appeared', 'draw_id'] if self.split_method == 'hash' else ['appeared']
+        df_target = self.input_store.read(featured_name, columns=columns)
+
+        if self.split_method == 'hash':
+            folds, output_path = self._hash_index(lottery_name, df_target['draw_id'].to_numpy(), incremental)
+            rows = self._split_rows(df_target, lottery_name, folds)
+        else:
+            rows = self._split_rows(df_target, lottery_name)
+            output_path = self.index.write(lottery_name, rows)
+
+        for split_name, split_rows in rows.items():
+            print(f"  [OK] {split_name:5s}: {len(split_rows):6d} records")
+        print(f"  [OK] Index -> {output_path.name}")
+
+        if self.export_splits:
+            df = self.input_store.read(featured_name)
+            for split_name, split_rows in rows.items():
+                self._export_split(df.take(split_rows), lottery_name, split_name, incremental)
+
+        return self.split_stats[lottery_name]
+
+    def _ratios(self) -> Tuple[float, float, float]:
+        return (self.train_ratio, self.val_ratio, self.test_ratio)
+
+    def _hash_index(self, lottery_name: str, draw_ids: np.ndarray, incremental: bool) -> Tuple[np.ndarray, Path]:
         """
-        Split a single lottery dataset with stratification.
+        Fold code of every row under hash splitting, updating the draw index.
 
         Args:
-            df: Featured lottery DataFrame
             lottery_name: Name of the lottery
+            draw_ids: draw_id of every featured row
+            incremental: Reuse the stored draw index and append only new draws
 
         Returns:
-            Dictionary with 'train', 'val', 'test' DataFrames
+            Tuple of (fold codes aligned with draw_ids, path of the index file)
         """
+        draws = np.unique(draw_ids)
+        index = self.index.draw_folds(lottery_name) if incremental else None
+
+        if index is None:
+            folds = hash_folds(lottery_name, draws, self._ratios())
+            output_path = self.index.write_draws(lottery_name, draws, folds)
+            index = pd.DataFrame({'draw_id': draws, 'fold': folds})
+        else:
+            new_draws = draws[~np.isin(draws, index['draw_id'].to_numpy())]
+            output_path = self.index.path(lottery_name)
+            if len(new_draws):
+                new_folds = hash_folds(lottery_name, new_draws, self._ratios())
+                output_path = self.index.append_draws(lottery_name, new_draws, new_folds)
+                index = pd.concat([index, pd.DataFrame({'draw_id': new_draws, 'fold': new_folds})], ignore_index=True)
+            print(f"  [OK] {len(new_draws)} new draws hashed")
+
+        return SplitIndex.row_folds(index, draw_ids), output_path
+
+    def _export_split(self, df_split: pd.DataFrame, lottery_name: str, split_name: str, incremental: bool):
+        """Write a materialized split file, appending only rows of new draws to a hash split when possible."""
+        name = f"{lottery_name}_{split_name}"
+
+        if incremental and self.split_method == 'hash' and self.output_store.exists(name):
+            df_existing = self.output_store.read(name)
+            is_new = ~df_split['draw_id'].isin(df_existing['draw_id']).to_numpy()
+
+            # Existing rows never move under hash splitting, but rebuilt features (e.g. after a
+            # corrected historical draw) change their values: only append when they are identical.
+            # Appended rows follow earlier ones, so rows are matched by key rather than position.
+            if _by_key(df_existing).equals(_by_key(df_split[~is_new])):
+                if not is_new.any():
+                    print(f"  [OK] {split_name} up to date")
+                    return
+                output_path = self.output_store.append(df_split[is_new], name)
+                print(f"  [OK] Appended {is_new.sum()} rows to {output_path.name}")
+                return
+
+        output_path = self.output_store.write(df_split, name)
+        print(f"  [OK] Exported {split_name} -> {output_path.name}")
+
+    def load_split(self, lottery_name: str, split_name: str) -> SplitView:
+        """
+        Lazy view of a saved split.
+
+        Args:
+            lottery_name: Name of the lottery
+            split_name: 'train', 'val' or 'test'
+
+        Returns:
+            SplitView; call .read(columns, numbers) to materialize it
+        """
+        return self.index.view(lottery_name, split_name)
+
+    def _split_rows(
+        self,
+        df_target: pd.DataFrame,
+        lottery_name: str,
+        folds: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Assign rows of a single lottery dataset to splits.
+
+        Splits row positions rather than the frame, so nothing is copied; the
+        stratified assignment (and order) is identical to splitting the frame
+        itself. Hash assignment keeps rows in featured order within each split.
+
+        Args:
+            df_target: 'appeared' column of the featured dataset
+            lottery_name: Name of the lottery
+            folds: Fold code of every row for hash splits (see _hash_index)
+
+        Returns:
+            Dictionary with 'train', 'val', 'test' row positions
+        """
+        appeared = df_target['appeared'].to_numpy()
+
         # Calculate class distribution
-        class_dist = df['appeared'].value_counts()
-        pos_count = class_dist.get(1, 0)
-        neg_count = class_dist.get(0, 0)
-        total = len(df)
+        pos_count = int((appeared == 1).sum())
+        neg_count = int((appeared == 0).sum())
+        total = len(appeared)
 
         imbalance_ratio = neg_count / pos_count if pos_count > 0 else 0
 
@@ -118,11 +307,39 @@ class DataSplitter:
         print(f"    Negative (appeared=0): {neg_count:,} ({neg_count/total*100:.2f}%)")
         print(f"    Imbalance ratio: 1:{imbalance_ratio:.2f}")
 
+        if folds is not None:
+            train_rows, val_rows, test_rows = (np.flatnonzero(folds == fold) for fold in range(len(SPLIT_NAMES)))
+        else:
+            train_rows, val_rows, test_rows = self._stratified_rows(appeared)
+
+        # Store statistics
+        self.split_stats[lottery_name] = {
+            'total_records': total,
+            'positive_count': pos_count,
+            'negative_count': neg_count,
+            'imbalance_ratio': float(imbalance_ratio),
+            'positive_ratio': float(pos_count / total),
+            'train_size': len(train_rows),
+            'val_size': len(val_rows),
+            'test_size': len(test_rows),
+            'train_positive': int((appeared[train_rows] == 1).sum()),
+            'val_positive': int((appeared[val_rows] == 1).sum()),
+            'test_positive': int((appeared[test_rows] == 1).sum())
+        }
+
+        return {
+            'train': train_rows,
+            'val': val_rows,
+            'test': test_rows
+        }
+
+    def _stratified_rows(self, appeared: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Random stratified train/val/test row positions."""
         # First split: train + val vs test
-        train_val_df, test_df = train_test_split(
-            df,
+        train_val_rows, test_rows = train_test_split(
+            np.arange(len(appeared)),
             test_size=self.test_ratio,
-            stratify=df['appeared'],
+            stratify=appeared,
             random_state=self.random_state
         )
 
@@ -130,33 +347,14 @@ class DataSplitter:
         # Adjust val_ratio to account for already removed test set
         val_ratio_adjusted = self.val_ratio / (self.train_ratio + self.val_ratio)
 
-        train_df, val_df = train_test_split(
-            train_val_df,
+        train_rows, val_rows = train_test_split(
+            train_val_rows,
             test_size=val_ratio_adjusted,
-            stratify=train_val_df['appeared'],
+            stratify=appeared[train_val_rows],
             random_state=self.random_state
         )
 
-        # Store statistics
-        self.split_stats[lottery_name] = {
-            'total_records': total,
-            'positive_count': int(pos_count),
-            'negative_count': int(neg_count),
-            'imbalance_ratio': float(imbalance_ratio),
-            'positive_ratio': float(pos_count / total),
-            'train_size': len(train_df),
-            'val_size': len(val_df),
-            'test_size': len(test_df),
-            'train_positive': int((train_df['appeared'] == 1).sum()),
-            'val_positive': int((val_df['appeared'] == 1).sum()),
-            'test_positive': int((test_df['appeared'] == 1).sum())
-        }
-
-        return {
-            'train': train_df,
-            'val': val_df,
-            'test': test_df
-        }
+        return train_rows, val_rows, test_rows
 
     def _save_statistics(self):
         """Save split statistics to JSON file."""
@@ -165,7 +363,8 @@ class DataSplitter:
                 'train_ratio': self.train_ratio,
                 'val_ratio': self.val_ratio,
                 'test_ratio': self.test_ratio,
-                'random_state': self.random_state
+                'random_state': self.random_state,
+                'split_method': self.split_method
             },
             'lotteries': self.split_stats
         }
@@ -183,7 +382,7 @@ class DataSplitter:
             'overall_positive_ratio': total_positive / total_records if total_records > 0 else 0
         }
 
-        output_path = Path('outputs/statistics/split_stats.json')
+        output_path = self.stats_path
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(output_path, 'w') as f:
@@ -199,7 +398,7 @@ class DataSplitter:
 
         if not self.split_stats:
             # Load from JSON if not in memory
-            stats_file = Path('outputs/statistics/split_stats.json')
+            stats_file = self.stats_path
             if stats_file.exists():
                 with open(stats_file, 'r') as f:
                     stats = json.load(f)
@@ -249,13 +448,17 @@ class DataSplitter:
 
 
 if __name__ == '__main__':
+    import sys
+
     splitter = DataSplitter(
         input_dir='data/processed',
         output_dir='data/splits',
         train_ratio=0.70,
         val_ratio=0.15,
         test_ratio=0.15,
-        random_state=42
+        random_state=42,
+        export_splits='--no-export-splits' not in sys.argv,
+        split_method='hash' if '--hash' in sys.argv else 'stratified'
     )
 
     splitter.split_all()
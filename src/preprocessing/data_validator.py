@@ -6,10 +6,14 @@ Validates data quality, checks for missing values, duplicates, and outliers.
 
 import pandas as pd
 import numpy as np
+import json
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+from .data_cleaner import parse_draws
+from ..storage import DatasetCatalog
+
 
 class DataValidator:
     """Validates lottery data for quality and consistency."""
@@ -38,6 +42,11 @@ class DataValidator:
         'jaya_sampatha': (0, 80),  # 4 numbers from 0-80
     }
 
+    CRITICAL_COLUMNS = ['draw_date', 'draw_id', 'numbers']
+
+    # Gaps between consecutive draws longer than this are reported
+    GAP_THRESHOLD_DAYS = 14
+
     def __init__(self, data_dir: str = 'data/raw'):
         """
         Initialize the data validator.
@@ -47,6 +56,8 @@ class DataValidator:
         """
         self.data_dir = Path(data_dir)
         self.validation_results = {}
+        self.numbers_count = self._load_numbers_count()
+        self.catalog = DatasetCatalog(data_dir)
 
     def validate_all(self) -> Dict:
         """
@@ -59,51 +70,71 @@ class DataValidator:
         print("DATA VALIDATION REPORT")
         print("="*70)
 
-        csv_files = list(self.data_dir.glob('*.csv'))
-        # Exclude prize files
-        csv_files = [f for f in csv_files if '_with_prizes' not in f.name]
+        for lottery_name in self.catalog.lotteries():  # e.g., 'nlb_mahajana_sampatha'
+            self.validate_lottery(lottery_name)
+
+        self._print_summary()
+        return self.validation_results
+
+    def validate_lottery(self, lottery_name: str) -> Dict:
+        """
+        Validate a single lottery CSV from the data directory.
+
+        Args:
+            lottery_name: Name of the lottery (file stem)
 
-        for csv_file in sorted(csv_files):
-            lottery_name = csv_file.stem  # e.g., 'nlb_mahajana_sampatha'
-            print(f"\nValidating {lottery_name}...")
+        Returns:
+            Dictionary with validation results (or an 'error' entry)
+        """
+        print(f"\nValidating {lottery_name}...")
 
-            try:
-                df = pd.read_csv(csv_file)
-                result = self._validate_lottery(df, lottery_name)
-                self.validation_results[lottery_name] = result
+        try:
+            df = self.catalog.frame(lottery_name)
+            result = self._validate_lottery(df, lottery_name, self.catalog.arrays(lottery_name))
+            self.validation_results[lottery_name] = result
 
-                self._print_lottery_report(lottery_name, result)
+            self._print_lottery_report(lottery_name, result)
 
-            except Exception as e:
-                print(f"  [ERROR] Failed to validate: {e}")
-                self.validation_results[lottery_name] = {'error': str(e)}
+        except Exception as e:
+            print(f"  [ERROR] Failed to validate: {e}")
+            self.validation_results[lottery_name] = {'error': str(e)}
 
-        self._print_summary()
-        return self.validation_results
+        return self.validation_results[lottery_name]
 
-    def _validate_lottery(self, df: pd.DataFrame, lottery_name: str) -> Dict:
+    def _validate_lottery(self, df: pd.DataFrame, lottery_name: str, parsed: Optional[Dict] = None) -> Dict:
         """
         Validate a single lottery dataset.
 
+        The frame is parsed once into arrays (see parse_draws) and every rule
+        is evaluated as a boolean row mask over them. The caller's frame is
+        not modified.
+
         Args:
             df: DataFrame containing lottery data
             lottery_name: Name of the lottery
+            parsed: Arrays from parse_draws, if already available
 
         Returns:
-            Dictionary with validation results
+            Dictionary with validation results, including the index labels of
+            every offending row per rule under 'offending_rows'
         """
+        parsed = parsed if parsed is not None else parse_draws(df)
+        masks = self._rule_masks(df, parsed, lottery_name)
+
         result = {
             'total_rows': len(df),
-            'date_range': self._check_date_range(df),
-            'missing_values': self._check_missing_values(df),
-            'duplicates': self._check_duplicates(df),
-            'number_ranges': self._check_number_ranges(df, lottery_name),
-            'date_gaps': self._check_date_gaps(df),
+            'date_range': self._check_date_range(parsed),
+            'missing_values': self._check_missing_values(df, masks),
+            'duplicates': self._check_duplicates(masks),
+            'number_ranges': self._check_number_ranges(parsed, masks, lottery_name),
+            'number_counts': self._check_number_counts(masks, lottery_name),
+            'date_gaps': self._check_date_gaps(parsed, masks),
+            'offending_rows': {rule: df.index[mask].tolist() for rule, mask in masks.items()},
             'status': 'pass'
         }
 
         # Determine overall status
-        if result['duplicates']['count'] > 0:
+        if result['duplicates']['count'] > 0 or result['number_counts']['invalid_count'] > 0:
             result['status'] = 'warning'
         if result['missing_values']['critical_missing'] > 0:
             result['status'] = 'fail'
@@ -112,99 +143,159 @@ class DataValidator:
 
         return result
 
-    def _check_date_range(self, df: pd.DataFrame) -> Dict:
+    def _rule_masks(self, df: pd.DataFrame, parsed: Dict[str, np.ndarray], lottery_name: str) -> Dict[str, np.ndarray]:
+        """
+        Evaluate every validation rule as a boolean mask over the rows.
+
+        Returns:
+            Rule name -> boolean array (True = offending row)
+        """
+        low, high = self._expected_range(lottery_name)
+        numbers, counts = parsed['numbers'], parsed['counts']
+
+        # Padding positions of short draws are not numbers
+        present = np.arange(numbers.shape[1]) < counts[:, None]
+        out_of_range = ((numbers < low) | (numbers > high)) & present
+
+        expected_count = self._expected_count(lottery_name)
+        wrong_count = parsed['numbers_valid'] & (counts != expected_count) if expected_count else np.zeros(len(df), dtype=bool)
+
+        critical_cols = [col for col in self.CRITICAL_COLUMNS if col in df.columns]
+
+        return {
+            'missing_critical': df[critical_cols].isna().any(axis=1).to_numpy(),
+            'invalid_dates': pd.isna(parsed['dates']) & df['draw_date'].notna().to_numpy(),
+            'unparseable_numbers': ~parsed['numbers_valid'],
+            'out_of_range': out_of_range.any(axis=1),
+            'wrong_number_count': wrong_count,
+            'duplicate_ids': df['draw_id'].duplicated().to_numpy(),
+            'duplicate_dates': df['draw_date'].duplicated().to_numpy(),
+            'duplicate_draws': df.duplicated(subset=['draw_id', 'numbers']).to_numpy(),
+            'large_gaps': self._gap_days(parsed['dates']) > self.GAP_THRESHOLD_DAYS,
+        }
+
+    def _expected_range(self, lottery_name: str) -> Tuple[int, int]:
+        """Expected (min, max) number for a lottery."""
+        # Extract lottery type and name
+        parts = lottery_name.split('_', 1)
+        source = parts[0]  # 'nlb' or 'dlb'
+        game = parts[1] if len(parts) > 1 else lottery_name
+
+        if source == 'nlb':
+            return self.NLB_RANGES.get(game, (0, 80))
+        return self.DLB_RANGES.get(game, (0, 80))
+
+    def _expected_count(self, lottery_name: str) -> Optional[int]:
+        """Numbers per draw from the scraper configuration (None if unknown)."""
+        return self.numbers_count.get(lottery_name)
+
+    @staticmethod
+    def _load_numbers_count() -> Dict[str, int]:
+        """Read numbers_count per lottery from the scraper configurations."""
+        try:
+            from ..scrapers import NLBScraper, DLBScraper
+        except ImportError:
+            # Scraper dependencies (requests, bs4) are optional for validation
+            return {}
+
+        counts = {f"nlb_{game}": config['numbers_count'] for game, config in NLBScraper.LOTTERIES.items()}
+        counts.update({f"dlb_{game}": config['numbers_count'] for game, config in DLBScraper.LOTTERIES.items()})
+        return counts
+
+    @staticmethod
+    def _gap_days(dates: np.ndarray) -> np.ndarray:
+        """
+        Days since the previous draw in date order, aligned with the rows.
+
+        Returns:
+            Float array with NaN for the earliest draw and unparseable dates
+        """
+        gaps = np.full(len(dates), np.nan)
+        order = np.argsort(dates, kind='stable')
+        order = order[~pd.isna(dates[order])]
+
+        if len(order) > 1:
+            days = dates[order].astype('datetime64[D]').astype(np.int64)
+            gaps[order[1:]] = np.diff(days)
+        return gaps
+
+    def _check_date_range(self, parsed: Dict[str, np.ndarray]) -> Dict:
         """Check date range coverage."""
-        df['draw_date'] = pd.to_datetime(df['draw_date'])
+        dates = parsed['dates'][~pd.isna(parsed['dates'])]
+        if len(dates) == 0:
+            return {'min_date': None, 'max_date': None, 'total_days': 0}
 
+        min_date, max_date = pd.Timestamp(dates.min()), pd.Timestamp(dates.max())
         return {
-            'min_date': df['draw_date'].min().strftime('%Y-%m-%d'),
-            'max_date': df['draw_date'].max().strftime('%Y-%m-%d'),
-            'total_days': (df['draw_date'].max() - df['draw_date'].min()).days
+            'min_date': min_date.strftime('%Y-%m-%d'),
+            'max_date': max_date.strftime('%Y-%m-%d'),
+            'total_days': (max_date - min_date).days
         }
 
-    def _check_missing_values(self, df: pd.DataFrame) -> Dict:
+    def _check_missing_values(self, df: pd.DataFrame, masks: Dict[str, np.ndarray]) -> Dict:
         """Check for missing values in critical columns."""
-        critical_cols = ['draw_date', 'draw_id', 'numbers']
-        optional_cols = ['letter']
+        critical_cols = [col for col in self.CRITICAL_COLUMNS if col in df.columns]
 
-        critical_missing = df[critical_cols].isnull().sum().sum()
-        optional_missing = df[optional_cols].isnull().sum().sum() if 'letter' in df.columns else 0
+        critical_missing = df[critical_cols].isna().to_numpy().sum()
+        optional_missing = df['letter'].isna().sum() if 'letter' in df.columns else 0
 
         return {
             'critical_missing': int(critical_missing),
+            'critical_rows': int(masks['missing_critical'].sum()),
             'optional_missing': int(optional_missing),
-            'total_missing': int(df.isnull().sum().sum())
+            'total_missing': int(df.isna().to_numpy().sum())
         }
 
-    def _check_duplicates(self, df: pd.DataFrame) -> Dict:
+    def _check_duplicates(self, masks: Dict[str, np.ndarray]) -> Dict:
         """Check for duplicate draws."""
-        # Duplicate draw IDs
-        dup_ids = df['draw_id'].duplicated().sum()
-
-        # Duplicate dates
-        dup_dates = df['draw_date'].duplicated().sum()
-
-        # Duplicate draw_id + numbers combination
-        dup_complete = df.duplicated(subset=['draw_id', 'numbers']).sum()
-
         return {
-            'count': int(dup_complete),
-            'duplicate_ids': int(dup_ids),
-            'duplicate_dates': int(dup_dates)
+            'count': int(masks['duplicate_draws'].sum()),
+            'duplicate_ids': int(masks['duplicate_ids'].sum()),
+            'duplicate_dates': int(masks['duplicate_dates'].sum())
         }
 
-    def _check_number_ranges(self, df: pd.DataFrame, lottery_name: str) -> Dict:
+    def _check_number_ranges(self, parsed: Dict[str, np.ndarray], masks: Dict[str, np.ndarray], lottery_name: str) -> Dict:
         """Validate that numbers are within expected ranges."""
-        # Extract lottery type and name
-        parts = lottery_name.split('_', 1)
-        source = parts[0]  # 'nlb' or 'dlb'
-        game = parts[1] if len(parts) > 1 else lottery_name
+        expected_range = self._expected_range(lottery_name)
+        invalid = masks['out_of_range'] | masks['unparseable_numbers']
 
-        # Get expected range
-        if source == 'nlb':
-            expected_range = self.NLB_RANGES.get(game, (0, 80))
-        else:
-            expected_range = self.DLB_RANGES.get(game, (0, 80))
-
-        # Parse numbers and check ranges
-        invalid_count = 0
-        out_of_range = []
-
-        for idx, row in df.iterrows():
-            numbers_str = str(row['numbers'])
-            try:
-                numbers = [int(n) for n in numbers_str.split(';')]
-                for num in numbers:
-                    if num < expected_range[0] or num > expected_range[1]:
-                        invalid_count += 1
-                        out_of_range.append((idx, num))
-                        break  # Only count once per row
-            except:
-                invalid_count += 1
+        # First out-of-range number of the first offending rows
+        rows = np.flatnonzero(masks['out_of_range'])[:5]
+        low, high = expected_range
+        sample = parsed['numbers'][rows]
+        first_bad = ((sample < low) | (sample > high)).argmax(axis=1)
 
         return {
-            'valid': invalid_count == 0,
+            'valid': not invalid.any(),
             'expected_range': expected_range,
-            'invalid_count': invalid_count,
-            'sample_errors': out_of_range[:5]  # First 5 errors
+            'invalid_count': int(invalid.sum()),
+            'sample_errors': [(int(row), int(sample[i, col])) for i, (row, col) in enumerate(zip(rows, first_bad))]
         }
 
-    def _check_date_gaps(self, df: pd.DataFrame) -> Dict:
-        """Check for gaps in draw dates."""
-        df_sorted = df.sort_values('draw_date').copy()
-        df_sorted['draw_date'] = pd.to_datetime(df_sorted['draw_date'])
+    def _check_number_counts(self, masks: Dict[str, np.ndarray], lottery_name: str) -> Dict:
+        """Check the count of numbers per draw against the scraper configuration."""
+        return {
+            'expected_count': self._expected_count(lottery_name),
+            'invalid_count': int(masks['wrong_number_count'].sum())
+        }
 
-        # Calculate gaps between consecutive draws
-        df_sorted['date_diff'] = df_sorted['draw_date'].diff().dt.days
+    def _check_date_gaps(self, parsed: Dict[str, np.ndarray], masks: Dict[str, np.ndarray]) -> Dict:
+        """Check for gaps in draw dates."""
+        gaps = self._gap_days(parsed['dates'])
+        valid_gaps = gaps[~np.isnan(gaps)]
 
-        # Find large gaps (> 14 days)
-        large_gaps = df_sorted[df_sorted['date_diff'] > 14]
+        # First large gaps in date order
+        large = np.flatnonzero(masks['large_gaps'])
+        large = large[np.argsort(parsed['dates'][large], kind='stable')][:3]
 
         return {
-            'max_gap_days': int(df_sorted['date_diff'].max()) if len(df_sorted) > 1 else 0,
-            'mean_gap_days': float(df_sorted['date_diff'].mean()) if len(df_sorted) > 1 else 0,
-            'large_gaps_count': len(large_gaps),
-            'large_gaps': large_gaps[['draw_date', 'date_diff']].head(3).to_dict('records') if len(large_gaps) > 0 else []
+            'max_gap_days': int(valid_gaps.max()) if len(valid_gaps) else 0,
+            'mean_gap_days': float(valid_gaps.mean()) if len(valid_gaps) else 0,
+            'large_gaps_count': int(masks['large_gaps'].sum()),
+            'large_gaps': [
+                {'draw_date': pd.Timestamp(parsed['dates'][row]).strftime('%Y-%m-%d'), 'date_diff': int(gaps[row])}
+                for row in large
+            ]
         }
 
     def _print_lottery_report(self, lottery_name: str, result: Dict):
@@ -224,7 +315,8 @@ class DataValidator:
         print(f"    Missing values: {result['missing_values']['critical_missing']} critical, {result['missing_values']['optional_missing']} optional")
         print(f"    Duplicates: {result['duplicates']['count']} complete, {result['duplicates']['duplicate_dates']} dates")
         print(f"    Number range: {result['number_ranges']['expected_range']} - {result['number_ranges']['invalid_count']} invalid")
-        print(f"    Date gaps: max {result['date_gaps']['max_gap_days']} days, {result['date_gaps']['large_gaps_count']} large gaps (>14 days)")
+        print(f"    Number count: {result['number_counts']['expected_count']} expected - {result['number_counts']['invalid_count']} invalid")
+        print(f"    Date gaps: max {result['date_gaps']['max_gap_days']} days, {result['date_gaps']['large_gaps_count']} large gaps (>{self.GAP_THRESHOLD_DAYS} days)")
 
     def _print_summary(self):
         """Print overall validation summary."""
@@ -248,7 +340,12 @@ class DataValidator:
         print(f"\nTotal draws: {total_draws:,}")
 
     def save_report(self, output_path: str = 'outputs/validation_report.txt'):
-        """Save validation report to file."""
+        """
+        Save validation report to file.
+
+        A machine-readable JSON report with the full offending-row indices
+        is written next to it (same path with a .json suffix).
+        """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -269,10 +366,31 @@ class DataValidator:
                     f.write(f"  Missing values: {result['missing_values']}\n")
                     f.write(f"  Duplicates: {result['duplicates']}\n")
                     f.write(f"  Number ranges: {result['number_ranges']}\n")
+                    f.write(f"  Number counts: {result['number_counts']}\n")
                     f.write(f"  Date gaps: {result['date_gaps']}\n")
+                    offending = {rule: len(rows) for rule, rows in result['offending_rows'].items() if rows}
+                    f.write(f"  Offending rows: {offending}\n")
 
         print(f"\nValidation report saved to: {output_path}")
 
+        self.save_json_report(output_path.with_suffix('.json'))
+
+    def save_json_report(self, output_path: str = 'outputs/validation_report.json'):
+        """Save the validation results as JSON."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        report = {
+            'generated_at': datetime.now().isoformat(),
+            'gap_threshold_days': self.GAP_THRESHOLD_DAYS,
+            'lotteries': self.validation_results
+        }
+
+        with open(output_path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+
+        print(f"JSON validation report saved to: {output_path}")
+
 
 if __name__ == '__main__':
     validator = DataValidator('data/raw')
@@ -7,8 +7,9 @@ Generates 20-25 features from raw lottery data for ML model training.
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import List, Optional, Tuple
+
+from ..storage import FEATURED_SCHEMA, DatasetStore, DrawDatabase, compact, memory_stats
 
 
 class FeatureEngineer:
@@ -22,45 +23,59 @@ class FeatureEngineer:
     - Hot/Cold features (4): temperature scoring
     """
 
-    def __init__(self, input_dir: str = 'data/processed', output_dir: str = 'data/processed'):
+    def __init__(
+        self,
+        input_dir: str = 'data/processed',
+        output_dir: str = 'data/processed',
+        storage_format: str = 'parquet',
+        export_csv: bool = True,
+        db_path: Optional[str] = None
+    ):
         """
         Initialize the feature engineer.
 
         Args:
-            input_dir: Directory containing cleaned CSV files
+            input_dir: Directory containing cleaned data files
             output_dir: Directory to save featured data
+            storage_format: 'parquet' or 'csv' for the featured files
+            export_csv: Also write CSV copies when storing Parquet
+            db_path: Also load feature rows into this draw database
         """
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
+        self.input_store = DatasetStore(self.input_dir, storage_format, export_csv)
+        self.output_store = DatasetStore(self.output_dir, storage_format, export_csv)
+        self.db = DrawDatabase(db_path) if db_path else None
+        self.memory_stats = {}
+
+    def engineer_all(self, streaming: bool = False, chunk_size: int = 500):
+        """
+        Engineer features for all lottery datasets.
 
-    def engineer_all(self):
-        """Engineer features for all lottery datasets."""
+        Args:
+            streaming: Process each lottery in fixed-size chunks of draws and
+                append rows to the output instead of building it in memory
+            chunk_size: Number of draws per chunk in streaming mode
+        """
         print("="*70)
         print("FEATURE ENGINEERING")
         print("="*70)
+        if streaming:
+            print(f"Streaming mode: {chunk_size} draws per chunk")
 
-        csv_files = list(self.input_dir.glob('*_cleaned.csv'))
+        cleaned_names = self.input_store.names('*_cleaned')
 
         engineered_count = 0
         total_records = 0
 
-        for csv_file in sorted(csv_files):
-            lottery_name = csv_file.stem.replace('_cleaned', '')
-            print(f"\nEngineering features for {lottery_name}...")
+        for cleaned_name in cleaned_names:
+            lottery_name = cleaned_name.replace('_cleaned', '')
 
             try:
-                df = pd.read_csv(csv_file)
-                df_featured = self._engineer_lottery(df, lottery_name)
-
-                # Save featured data
-                output_path = self.output_dir / f"{lottery_name}_featured.csv"
-                df_featured.to_csv(output_path, index=False)
-
-                print(f"  [OK] Generated {len(df_featured)} records with {len(df_featured.columns)} columns")
-                print(f"  [OK] Saved to {output_path}")
+                n_records, _ = self.engineer_lottery(lottery_name, streaming, chunk_size)
 
                 engineered_count += 1
-                total_records += len(df_featured)
+                total_records += n_records
 
             except Exception as e:
                 print(f"  [ERROR] Failed to engineer features: {e}")
@@ -69,10 +84,56 @@ class FeatureEngineer:
 
         print(f"\n" + "="*70)
         print(f"Feature engineering complete:")
-        print(f"  - Lotteries processed: {engineered_count}/{len(csv_files)}")
+        print(f"  - Lotteries processed: {engineered_count}/{len(cleaned_names)}")
         print(f"  - Total records generated: {total_records:,}")
         print("="*70)
 
+    def engineer_lottery(
+        self,
+        lottery_name: str,
+        streaming: bool = False,
+        chunk_size: int = 500
+    ) -> Tuple[int, int]:
+        """
+        Engineer and save features for one cleaned lottery dataset.
+
+        Args:
+            lottery_name: Name of the lottery
+            streaming: Process the lottery in chunks of draws
+            chunk_size: Number of draws per chunk in streaming mode
+
+        Returns:
+            Tuple of (records written, number of columns)
+        """
+        print(f"\nEngineering features for {lottery_name}...")
+
+        cleaned_name = f"{lottery_name}_cleaned"
+        featured_name = f"{lottery_name}_featured"
+        output_path = self.output_store.path(featured_name)
+
+        if streaming:
+            n_records, n_columns = self._engineer_lottery_streaming(
+                cleaned_name, lottery_name, featured_name, chunk_size
+            )
+        else:
+            df = self.input_store.read(cleaned_name)
+            df_featured = self._engineer_lottery(df, lottery_name)
+            df_featured, self.memory_stats[lottery_name] = compact(df_featured, 'featured')
+
+            # Save featured data
+            self.output_store.write(df_featured, featured_name)
+            if self.db is not None:
+                self.db.load_features(df_featured, lottery_name)
+            n_records, n_columns = len(df_featured), len(df_featured.columns)
+
+        print(f"  [OK] Generated {n_records} records with {n_columns} columns")
+        print(f"  [OK] Memory: {self.memory_stats[lottery_name]['before_mb']:.2f} MB -> "
+              f"{self.memory_stats[lottery_name]['after_mb']:.2f} MB "
+              f"({self.memory_stats[lottery_name]['ratio']:.1f}x smaller)")
+        print(f"  [OK] Saved to {output_path}")
+
+        return n_records, n_columns
+
     def _engineer_lottery(self, df: pd.DataFrame, lottery_name: str) -> pd.DataFrame:
         """
         Engineer features for a single lottery.
@@ -84,6 +145,24 @@ class FeatureEngineer:
         Returns:
             DataFrame with engineered features
         """
+        df_expanded = self._expand_draws(df, lottery_name)
+
+        # Now engineer features for each number
+        df_featured = self._add_all_features(df_expanded)
+
+        return df_featured
+
+    def _expand_draws(self, df: pd.DataFrame, lottery_name: str) -> pd.DataFrame:
+        """
+        Expand cleaned draws into one row per (draw, number) with the target.
+
+        Args:
+            df: Cleaned lottery DataFrame
+            lottery_name: Name of the lottery
+
+        Returns:
+            DataFrame with lottery, draw_date, draw_id, draw_sequence, number, appeared
+        """
         # Parse numbers into a list column for easier processing
         df['numbers_list'] = df['numbers'].apply(lambda x: [int(n) for n in str(x).split(';')])
 
@@ -128,8 +207,180 @@ class FeatureEngineer:
 
         print(f"    Expanded to {len(df_expanded)} records (draws × numbers)")
 
-        # Now engineer features for each number
-        df_featured = self._add_all_features(df_expanded)
+        return df_expanded
+
+    def _engineer_lottery_streaming(
+        self,
+        cleaned_name: str,
+        lottery_name: str,
+        featured_name: str,
+        chunk_size: int = 500
+    ) -> Tuple[int, int]:
+        """
+        Engineer features for a single lottery in fixed-size chunks of draws.
+
+        Rolling-window, cumulative and gap state for every number is carried
+        across chunk boundaries, so only one chunk of draws is held in memory
+        at a time. Rows are appended in (draw_sequence, number) order; sorted
+        by (number, draw_sequence) they match the batch output.
+
+        Args:
+            cleaned_name: Name of the cleaned dataset (sorted by draw_sequence)
+            lottery_name: Name of the lottery
+            featured_name: Name of the featured dataset to write
+            chunk_size: Number of draws per chunk
+
+        Returns:
+            Tuple of (records written, number of columns)
+        """
+        all_numbers = self._scan_numbers(cleaned_name, chunk_size)
+        if not all_numbers:
+            # No draws yet: write an empty featured dataset with the usual columns
+            df_empty = pd.DataFrame(columns=list(FEATURED_SCHEMA))
+            self.output_store.write(df_empty, featured_name)
+            if self.db is not None:
+                self.db.load_features(df_empty, lottery_name)
+            self.memory_stats[lottery_name] = memory_stats(0, 0)
+            print("    No draws to stream")
+            return 0, len(df_empty.columns)
+
+        print(f"    Found {len(all_numbers)} unique numbers: {min(all_numbers)}-{max(all_numbers)}")
+
+        state = _FeatureStreamState(all_numbers)
+        n_chunks = 0
+        n_columns = 0
+        mb_before = 0.0
+        mb_after = 0.0
+
+        with self.output_store.writer(featured_name) as writer:
+            for chunk in self.input_store.iter_chunks(cleaned_name, chunk_size):
+                df_chunk = self._engineer_chunk(chunk, lottery_name, state)
+                df_chunk, chunk_stats = compact(df_chunk, 'featured')
+                mb_before += chunk_stats['before_mb']
+                mb_after += chunk_stats['after_mb']
+                writer.write(df_chunk)
+                if self.db is not None:
+                    self.db.load_features(df_chunk, lottery_name, replace=n_chunks == 0)
+                n_chunks += 1
+                n_columns = len(df_chunk.columns)
+
+        print(f"    Streamed {writer.rows_written} records (draws × numbers) in {n_chunks} chunk(s)")
+        self.memory_stats[lottery_name] = memory_stats(mb_before * 1024 * 1024, mb_after * 1024 * 1024)
+
+        return writer.rows_written, n_columns
+
+    def _scan_numbers(self, cleaned_name: str, chunk_size: int) -> List[int]:
+        """Collect the sorted set of numbers drawn in a lottery, reading only the numbers column."""
+        all_numbers = set()
+        for chunk in self.input_store.iter_chunks(cleaned_name, chunk_size, columns=['numbers']):
+            for numbers_str in chunk['numbers']:
+                all_numbers.update(int(n) for n in str(numbers_str).split(';'))
+        return sorted(all_numbers)
+
+    def _engineer_chunk(
+        self,
+        chunk: pd.DataFrame,
+        lottery_name: str,
+        state: '_FeatureStreamState'
+    ) -> pd.DataFrame:
+        """
+        Engineer features for one chunk of draws, advancing the stream state.
+
+        Args:
+            chunk: Consecutive cleaned draws
+            lottery_name: Name of the lottery
+            state: Per-number state carried over from earlier chunks
+
+        Returns:
+            DataFrame with one row per (draw, number) in the chunk
+        """
+        n_draws = len(chunk)
+        n_numbers = len(state.numbers)
+
+        draw_dates = pd.to_datetime(chunk['draw_date']).values
+        draw_days = draw_dates.astype('datetime64[D]').astype(np.int64)
+        draw_sequence = chunk['draw_sequence'].to_numpy()
+
+        # appeared[i, j]: did number j appear in draw i of this chunk
+        appeared = np.zeros((n_draws, n_numbers), dtype=np.int64)
+        for i, numbers_str in enumerate(chunk['numbers']):
+            cols = [state.position[int(n)] for n in str(numbers_str).split(';')]
+            appeared[i, cols] = 1
+
+        # Frequency features: windows end at the previous draw
+        history = np.vstack([state.recent, appeared])
+        csum = np.vstack([np.zeros((1, n_numbers), dtype=np.int64), np.cumsum(history, axis=0)])
+        rows = np.arange(len(state.recent), len(history))
+
+        features = {}
+        for window in state.WINDOWS:
+            lower = np.maximum(rows - window, 0)
+            features[f'frequency_last_{window}'] = (csum[rows] - csum[lower]).astype(float)
+
+        frequency_all_time = state.total + np.cumsum(appeared, axis=0) - appeared
+        features['frequency_all_time'] = frequency_all_time.astype(float)
+        features['appearance_rate'] = (
+            frequency_all_time / np.where(draw_sequence == 0, 1, draw_sequence)[:, None]
+        )
+
+        # Last appearance strictly before each draw
+        marked = np.where(appeared == 1, draw_days[:, None], state.NEVER)
+        last_seen = np.maximum.accumulate(np.vstack([state.last_seen, marked]), axis=0)
+        prev_seen = last_seen[:-1]
+        has_prev = prev_seen != state.NEVER
+        days_since_last = np.where(has_prev, draw_days[:, None] - prev_seen, 999)
+        features['days_since_last'] = days_since_last
+
+        # Gaps close on each appearance that follows an earlier one
+        has_gap = (appeared == 1) & has_prev
+        gap = np.where(has_gap, days_since_last, 0)
+
+        gap_count = state.gap_count + np.cumsum(has_gap, axis=0) - has_gap
+        gap_sum = state.gap_sum + np.cumsum(gap, axis=0) - gap
+        gap_sumsq = state.gap_sumsq + np.cumsum(gap * gap, axis=0) - gap * gap
+        gap_min = np.minimum.accumulate(
+            np.vstack([state.gap_min, np.where(has_gap, gap, state.NO_MIN)]), axis=0
+        )[:-1]
+        gap_max = np.maximum.accumulate(
+            np.vstack([state.gap_max, np.where(has_gap, gap, 0)]), axis=0
+        )[:-1]
+
+        # Advance state to the end of this chunk
+        state.recent = history[-max(state.WINDOWS):]
+        state.total = state.total + appeared.sum(axis=0)
+        state.last_seen = last_seen[-1]
+        state.gap_count = gap_count[-1] + has_gap[-1]
+        state.gap_sum = gap_sum[-1] + gap[-1]
+        state.gap_sumsq = gap_sumsq[-1] + gap[-1] * gap[-1]
+        state.gap_min = np.minimum(gap_min[-1], np.where(has_gap[-1], gap[-1], state.NO_MIN))
+        state.gap_max = np.maximum(gap_max[-1], np.where(has_gap[-1], gap[-1], 0))
+
+        # Assemble draw-major rows
+        df_featured = pd.DataFrame({
+            'lottery': lottery_name,
+            'draw_date': np.repeat(draw_dates, n_numbers),
+            'draw_id': np.repeat(chunk['draw_id'].to_numpy(), n_numbers),
+            'draw_sequence': np.repeat(draw_sequence, n_numbers),
+            'number': np.tile(state.numbers, n_draws),
+            'appeared': appeared.ravel(),
+        })
+        for col_name, values in features.items():
+            df_featured[col_name] = values.ravel()
+
+        df_featured = self._add_temporal_features(df_featured)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_gap = np.where(gap_count > 0, gap_sum / gap_count, 0.0)
+            variance = (gap_count * gap_sumsq - gap_sum * gap_sum) / (gap_count * gap_count)
+            std_gap = np.where(gap_count > 1, np.sqrt(np.maximum(variance, 0)), 0.0)
+
+        df_featured['mean_gap'] = mean_gap.ravel()
+        df_featured['std_gap'] = std_gap.ravel()
+        df_featured['min_gap'] = np.where(gap_count > 0, gap_min, 0).astype(float).ravel()
+        df_featured['max_gap'] = np.where(gap_count > 0, gap_max, 0).astype(float).ravel()
+        df_featured['current_gap'] = df_featured['days_since_last']
+
+        df_featured = self._add_hot_cold_features(df_featured)
 
         return df_featured
 
@@ -175,15 +426,17 @@ class FeatureEngineer:
                 df_featured.groupby('number')['appeared']
                 .rolling(window=window, min_periods=1)
                 .sum()
-                .shift(1)  # Shift to avoid data leakage
-                .fillna(0)
                 .reset_index(level=0, drop=True)
+                .groupby(df_featured['number'])
+                .shift(1)  # Shift within each number to avoid data leakage
+                .fillna(0)
             )
 
         # All-time frequency (cumulative sum up to current draw)
         df_featured['frequency_all_time'] = (
             df_featured.groupby('number')['appeared']
             .cumsum()
+            .groupby(df_featured['number'])
             .shift(1)
             .fillna(0)
         )
@@ -396,6 +649,34 @@ class FeatureEngineer:
         return df_featured
 
 
+class _FeatureStreamState:
+    """Per-number state carried between chunks by the streaming feature path."""
+
+    WINDOWS = (10, 30, 50)
+    NEVER = np.iinfo(np.int64).min  # Sentinel for "no appearance yet"
+    NO_MIN = np.iinfo(np.int64).max  # Sentinel for "no gap yet"
+
+    def __init__(self, numbers: List[int]):
+        n_numbers = len(numbers)
+
+        self.numbers = np.asarray(numbers, dtype=np.int64)
+        self.position = {number: i for i, number in enumerate(numbers)}
+
+        # Appearance rows of the most recent draws (up to the largest window)
+        self.recent = np.zeros((0, n_numbers), dtype=np.int64)
+        self.total = np.zeros(n_numbers, dtype=np.int64)
+
+        # Last appearance (days since epoch) and running gap statistics
+        self.last_seen = np.full(n_numbers, self.NEVER, dtype=np.int64)
+        self.gap_count = np.zeros(n_numbers, dtype=np.int64)
+        self.gap_sum = np.zeros(n_numbers, dtype=np.int64)
+        self.gap_sumsq = np.zeros(n_numbers, dtype=np.int64)
+        self.gap_min = np.full(n_numbers, self.NO_MIN, dtype=np.int64)
+        self.gap_max = np.zeros(n_numbers, dtype=np.int64)
+
+
 if __name__ == '__main__':
+    import sys
+
     engineer = FeatureEngineer('data/processed', 'data/processed')
-    engineer.engineer_all()
+    engineer.engineer_all(streaming='--streaming' in sys.argv)
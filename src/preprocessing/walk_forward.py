@@ -0,0 +1,182 @@
+"""
+Walk-forward (rolling-origin) splits for lottery datasets.
+
+Unlike DataSplitter's random stratified split, every row of a draw lands in
+the same fold and a model is only ever tested on draws after the ones it was
+trained on. Folds are keyed on 'draw_sequence' and yielded lazily as row
+position arrays; rows are sorted by draw once, so each fold is a slice (a
+view) of that single ordering and no fold copies any data.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class WalkForwardSplitter:
+    """
+    Time-ordered train/test folds over draws.
+
+    The last n_splits * test_draws draws are cut into consecutive test folds.
+    Each fold trains on the draws before its test fold, minus `gap` draws
+    between the two: all of them ('expanding') or only the last
+    `train_draws` ('sliding').
+
+    Implements split() / get_n_splits() like scikit-learn's splitters, so it
+    can be passed as `cv=` to cross_validate and friends (pass the
+    'draw_sequence' column as `groups=` when X holds only features).
+    """
+
+    WINDOWS = ('expanding', 'sliding')
+
+    def __init__(
+        self,
+        n_splits: int = 5,
+        test_draws: Optional[int] = None,
+        window: str = 'expanding',
+        train_draws: Optional[int] = None,
+        gap: int = 0,
+        min_train_draws: int = 1
+    ):
+        """
+        Initialize the walk-forward splitter.
+
+        Args:
+            n_splits: Number of folds
+            test_draws: Draws per test fold (default: draws // (n_splits + 1))
+            window: 'expanding' (train on all earlier draws) or 'sliding'
+            train_draws: Draws in each training window (required for 'sliding',
+                caps the window for 'expanding')
+            gap: Draws left out between the training window and the test fold
+            min_train_draws: Minimum draws in the first training window
+        """
+        if window not in self.WINDOWS:
+            raise ValueError(f"Unknown window: {window}. Use one of {self.WINDOWS}")
+        if window == 'sliding' and not train_draws:
+            raise ValueError("A sliding window needs train_draws")
+        if n_splits < 1 or gap < 0 or min_train_draws < 1:
+            raise ValueError("n_splits and min_train_draws must be >= 1 and gap >= 0")
+
+        self.n_splits = n_splits
+        self.test_draws = test_draws
+        self.window = window
+        self.train_draws = train_draws
+        self.gap = gap
+        self.min_train_draws = min_train_draws
+
+    def get_n_splits(self, X=None, y=None, groups=None) -> int:
+        return self.n_splits
+
+    def split(self, X, y=None, groups=None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield (train_rows, test_rows) for each fold, oldest first.
+
+        Args:
+            X: DataFrame with a 'draw_sequence' column, or the draw sequence
+                of every row as an array
+            y: Ignored
+            groups: Draw sequence of every row; takes precedence over X, so
+                X can hold only model features (cross_validate(..., groups=...))
+
+        Yields:
+            Row positions of the training and test rows, in draw order
+        """
+        order, bounds = self._order(X if groups is None else groups)
+        for train, test in self._windows(len(bounds) - 1):
+            yield order[bounds[train[0]]:bounds[train[1]]], order[bounds[test[0]]:bounds[test[1]]]
+
+    def folds(self, X) -> List[Dict]:
+        """
+        Describe each fold without materializing its rows.
+
+        Args:
+            X: DataFrame with a 'draw_sequence' column, or the draw sequence of every row
+
+        Returns:
+            List with the draw_sequence range and row count of each fold's train and test part
+        """
+        sequences = self._sequences(X)
+        draws = np.unique(sequences)
+        counts = np.bincount(np.searchsorted(draws, sequences), minlength=len(draws))
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+
+        folds = []
+        for fold, (train, test) in enumerate(self._windows(len(draws))):
+            folds.append({
+                'fold': fold,
+                'train_draws': [int(draws[train[0]]), int(draws[train[1] - 1])],
+                'test_draws': [int(draws[test[0]]), int(draws[test[1] - 1])],
+                'train_rows': int(bounds[train[1]] - bounds[train[0]]),
+                'test_rows': int(bounds[test[1]] - bounds[test[0]]),
+            })
+        return folds
+
+    @staticmethod
+    def _sequences(X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            X = X['draw_sequence']
+        return np.asarray(X)
+
+    def _order(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows sorted by draw, and the start of every draw in that ordering."""
+        sequences = self._sequences(X)
+        order = np.argsort(sequences, kind='stable')
+        sorted_sequences = sequences[order]
+        starts = np.flatnonzero(sorted_sequences[1:] != sorted_sequences[:-1]) + 1
+        bounds = np.concatenate([[0], starts, [len(order)]])
+        return order, bounds
+
+    def _windows(self, n_draws: int) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Half-open draw ranges ((train_start, train_end), (test_start, test_end)) per fold."""
+        test_draws = self.test_draws or n_draws // (self.n_splits + 1)
+        first_test = n_draws - self.n_splits * test_draws
+
+        if test_draws < 1 or first_test - self.gap < self.min_train_draws:
+            raise ValueError(
+                f"Not enough draws ({n_draws}) for {self.n_splits} folds of {test_draws} test draws "
+                f"with gap={self.gap} and min_train_draws={self.min_train_draws}"
+            )
+
+        for fold in range(self.n_splits):
+            test_start = first_test + fold * test_draws
+            train_end = test_start - self.gap
+            train_start = 0
+            if self.train_draws:
+                train_start = max(0, train_end - self.train_draws)
+            yield (train_start, train_end), (test_start, test_start + test_draws)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from ..storage import DatasetStore
+
+    parser = argparse.ArgumentParser(description='Show walk-forward folds of a featured lottery dataset')
+    parser.add_argument('lottery', help='Lottery name, e.g. nlb_govisetha')
+    parser.add_argument('--n-splits', type=int, default=5)
+    parser.add_argument('--test-draws', type=int, default=None)
+    parser.add_argument('--window', choices=WalkForwardSplitter.WINDOWS, default='expanding')
+    parser.add_argument('--train-draws', type=int, default=None)
+    parser.add_argument('--gap', type=int, default=0)
+    args = parser.parse_args()
+
+    splitter = WalkForwardSplitter(
+        n_splits=args.n_splits,
+        test_draws=args.test_draws,
+        window=args.window,
+        train_draws=args.train_draws,
+        gap=args.gap
+    )
+    df = DatasetStore('data/processed').read(f"{args.lottery}_featured", columns=['draw_sequence'])
+
+    print("="*70)
+    print(f"WALK-FORWARD FOLDS: {args.lottery} ({args.window}, gap={args.gap})")
+    print("="*70)
+    print(f"{'Fold':<6} {'Train draws':<16} {'Test draws':<16} {'Train rows':<12} {'Test rows':<12}")
+    print("-"*70)
+    for fold in splitter.folds(df):
+        train = f"{fold['train_draws'][0]}-{fold['train_draws'][1]}"
+        test = f"{fold['test_draws'][0]}-{fold['test_draws'][1]}"
+        print(f"{fold['fold']:<6} {train:<16} {test:<16} {fold['train_rows']:<12,} {fold['test_rows']:<12,}")
+    print("="*70)
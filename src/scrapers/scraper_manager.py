@@ -7,7 +7,7 @@ import csv
 import os
 import time
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from .nlb_scraper import NLBScraper
 from .dlb_scraper import DLBScraper
@@ -16,11 +16,17 @@ from .dlb_scraper import DLBScraper
 class ScraperManager:
     """Manages scraping operations for all lotteries"""
 
-    def __init__(self, output_dir: str = "data/raw"):
+    def __init__(self, output_dir: str = "data/raw", db_path: Optional[str] = None):
         self.output_dir = output_dir
         self.nlb_scraper = NLBScraper()
         self.dlb_scraper = DLBScraper()
 
+        # Optional indexed draw database (see src/storage/draw_db.py)
+        self.db = None
+        if db_path:
+            from ..storage import DrawDatabase
+            self.db = DrawDatabase(db_path)
+
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
 
@@ -53,6 +59,7 @@ class ScraperManager:
 
                 if save_individual and results:
                     self._save_to_csv(results, f"nlb_{game}.csv")
+                    self._save_to_db(results, f"nlb_{game}")
 
                 # Rate limiting
                 time.sleep(1)
@@ -73,6 +80,7 @@ class ScraperManager:
 
                 if save_individual and results:
                     self._save_to_csv(results, f"dlb_{game}.csv")
+                    self._save_to_db(results, f"dlb_{game}")
 
                 # Rate limiting
                 time.sleep(1)
@@ -115,6 +123,7 @@ class ScraperManager:
 
         if save and results:
             self._save_to_csv(results, filename)
+            self._save_to_db(results, filename[:-len('.csv')])
 
         return results
 
@@ -136,46 +145,48 @@ class ScraperManager:
 
         print(f"  Saved {len(data)} draws to {filepath}")
 
+    def _save_to_db(self, data: List[Dict], lottery: str) -> None:
+        """Upsert scraped draws into the draw database, if one is configured"""
+        if self.db is None or not data:
+            return
+
+        import pandas as pd
+        count = self.db.load_draws(pd.DataFrame(data), lottery)
+        print(f"  Loaded {count} draws into {self.db.db_path}")
+
     def generate_summary_report(self) -> None:
         """Generate a summary report of collected data"""
         print("\nGenerating data collection summary...")
 
-        csv_files = [f for f in os.listdir(self.output_dir) if f.endswith('.csv')]
+        # Row counts and date ranges come from the dataset catalog manifest
+        from ..storage import DatasetCatalog
+        summaries = DatasetCatalog(self.output_dir).summaries(include_prizes=True)
 
-        if not csv_files:
+        if not summaries:
             print("No data files found!")
             return
 
         summary = []
         total_draws = 0
 
-        for csv_file in sorted(csv_files):
-            filepath = os.path.join(self.output_dir, csv_file)
-
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-
-                if rows:
-                    lottery_name = rows[0].get('game_name', csv_file)
-                    draw_count = len(rows)
-                    total_draws += draw_count
-
-                    # Get date range
-                    dates = [r.get('draw_date') for r in rows if r.get('draw_date')]
-                    if dates:
-                        min_date = min(dates)
-                        max_date = max(dates)
-                        date_range = f"{min_date} to {max_date}"
-                    else:
-                        date_range = "N/A"
-
-                    summary.append({
-                        'Lottery': lottery_name,
-                        'Draws': draw_count,
-                        'Date Range': date_range,
-                        'File': csv_file
-                    })
+        for name, stats in summaries.items():
+            if stats['rows']:
+                lottery_name = stats['game_name'] or f"{name}.csv"
+                draw_count = stats['rows']
+                total_draws += draw_count
+
+                # Get date range
+                if stats.get('min_date'):
+                    date_range = f"{stats['min_date']} to {stats['max_date']}"
+                else:
+                    date_range = "N/A"
+
+                summary.append({
+                    'Lottery': lottery_name,
+                    'Draws': draw_count,
+                    'Date Range': date_range,
+                    'File': f"{name}.csv"
+                })
 
         # Print summary table
         print("\n" + "=" * 100)
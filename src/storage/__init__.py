@@ -0,0 +1,50 @@
+"""
+Storage layer for processed, featured and split lottery datasets.
+"""
+
+from .catalog import DatasetCatalog
+from .dataset_store import DatasetStore, DatasetWriter
+from .draw_db import DrawDatabase
+from .feature_snapshots import FeatureSnapshot, FeatureSnapshotStore
+from .result_cache import ResultCache
+from .schema import (
+    CLEANED_SCHEMA,
+    FEATURED_SCHEMA,
+    MODEL_FEATURES,
+    SCHEMAS,
+    SPLIT_INDEX_SCHEMA,
+    TREND_CODES,
+    TREND_DTYPE,
+    apply_schema,
+    compact,
+    memory_stats,
+    schema_for,
+)
+from .shap_store import ShapStore
+from .shared_arrays import SharedArrays
+from .split_index import SplitIndex, SplitView
+
+__all__ = [
+    'DatasetCatalog',
+    'DatasetStore',
+    'DatasetWriter',
+    'DrawDatabase',
+    'FeatureSnapshot',
+    'FeatureSnapshotStore',
+    'ResultCache',
+    'ShapStore',
+    'SharedArrays',
+    'SplitIndex',
+    'SplitView',
+    'CLEANED_SCHEMA',
+    'FEATURED_SCHEMA',
+    'MODEL_FEATURES',
+    'SCHEMAS',
+    'SPLIT_INDEX_SCHEMA',
+    'TREND_CODES',
+    'TREND_DTYPE',
+    'apply_schema',
+    'compact',
+    'memory_stats',
+    'schema_for',
+]
@@ -0,0 +1,266 @@
+"""
+Shared catalog of raw lottery datasets.
+
+Each raw CSV is read and parsed at most once per process: the DataFrame, the
+parsed date/number arrays and a summary (rows, date range, number range and
+distribution, missing cells) are cached and keyed by the file's mtime and
+size, so a rewritten file is picked up automatically. Summaries are also
+persisted to a JSON manifest next to the data, which lets reports be answered
+from file metadata alone when nothing changed.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Process-wide cache: resolved path -> (signature, frame, parsed arrays)
+_CACHE: Dict[str, Tuple[Tuple[int, int], pd.DataFrame, Optional[Dict[str, np.ndarray]]]] = {}
+
+
+def _signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DatasetCatalog:
+    """Load raw lottery CSVs once and answer summary questions from a manifest."""
+
+    MANIFEST_NAME = 'catalog_manifest.json'
+
+    # Bump when summarize_frame changes so older manifests are recomputed
+    MANIFEST_VERSION = 3
+
+    def __init__(self, data_dir: str = 'data/raw', manifest_path: Optional[str] = None):
+        """
+        Initialize the catalog.
+
+        Args:
+            data_dir: Directory containing raw CSV files
+            manifest_path: JSON manifest of summaries (default: <data_dir>/catalog_manifest.json)
+        """
+        self.data_dir = Path(data_dir)
+        self.manifest_path = Path(manifest_path) if manifest_path else self.data_dir / self.MANIFEST_NAME
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                return {}
+            if manifest.get('version') == self.MANIFEST_VERSION:
+                return manifest.get('lotteries', {})
+        return {}
+
+    def save_manifest(self):
+        """Write the manifest atomically (safe with parallel pipeline workers)."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': self.MANIFEST_VERSION, 'lotteries': self.manifest}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def path(self, lottery_name: str) -> Path:
+        """Raw CSV path of a lottery."""
+        return self.data_dir / f"{lottery_name}.csv"
+
+    def lotteries(self, include_prizes: bool = False) -> List[str]:
+        """
+        List lotteries with a raw CSV.
+
+        Args:
+            include_prizes: Also list '*_with_prizes' files
+
+        Returns:
+            Sorted file stems
+        """
+        return sorted(
+            f.stem for f in self.data_dir.glob('*.csv')
+            if include_prizes or '_with_prizes' not in f.name
+        )
+
+    def frame(self, lottery_name: str) -> pd.DataFrame:
+        """
+        Raw DataFrame of a lottery, read once per process while the file is unchanged.
+
+        The frame is shared between callers; copy it before modifying.
+        """
+        path = self.path(lottery_name)
+        key = str(path.resolve())
+        signature = _signature(path)
+
+        cached = _CACHE.get(key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, pd.read_csv(path), None)
+            _CACHE[key] = cached
+
+        return cached[1]
+
+    def arrays(self, lottery_name: str) -> Dict[str, np.ndarray]:
+        """
+        Parsed arrays of a lottery, aligned with the rows of frame().
+
+        Returns:
+            Dictionary with 'dates' (datetime64, NaT if unparseable),
+            'numbers' (int64 matrix, zero-padded), 'counts' (numbers per draw,
+            0 if unparseable) and 'numbers_valid' (parseable rows)
+        """
+        # Imported here: the preprocessing package itself imports the storage layer
+        from ..preprocessing.data_cleaner import parse_draws
+
+        df = self.frame(lottery_name)
+        key = str(self.path(lottery_name).resolve())
+        signature, _, parsed = _CACHE[key]
+
+        if parsed is None:
+            parsed = parse_draws(df)
+            _CACHE[key] = (signature, df, parsed)
+
+        return parsed
+
+    def summary(self, lottery_name: str) -> Dict:
+        """
+        Summary stats of a lottery.
+
+        Served from the manifest when the file's mtime and size match,
+        otherwise computed from the parsed arrays and recorded in the
+        manifest (call save_manifest to persist).
+
+        Returns:
+            Dictionary of stats (see summarize_frame)
+        """
+        signature = list(_signature(self.path(lottery_name)))
+        entry = self.manifest.get(lottery_name)
+        if entry is not None and entry.get('signature') == signature:
+            return entry['summary']
+
+        summary = self._compute_summary(lottery_name)
+        self.manifest[lottery_name] = {'signature': signature, 'summary': summary}
+        return summary
+
+    def summaries(self, include_prizes: bool = False, max_workers: Optional[int] = 1) -> Dict[str, Dict]:
+        """
+        Summary stats of every lottery, persisting the manifest if anything was recomputed.
+
+        Args:
+            include_prizes: Also summarize '*_with_prizes' files
+            max_workers: Worker processes for files that need a (single-pass)
+                recompute; 1 computes in-process and reuses cached frames,
+                None uses one worker per CPU
+
+        Returns:
+            Lottery name -> summary
+        """
+        names = self.lotteries(include_prizes)
+        signatures = {name: list(_signature(self.path(name))) for name in names}
+        stale = [
+            name for name in names
+            if self.manifest.get(name, {}).get('signature') != signatures[name]
+        ]
+
+        if len(stale) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                computed = executor.map(_summarize_file, [str(self.path(name)) for name in stale])
+                for name, summary in zip(stale, computed):
+                    self.manifest[name] = {'signature': signatures[name], 'summary': summary}
+        else:
+            for name in stale:
+                self.summary(name)
+
+        if stale:
+            self.save_manifest()
+        return {name: self.manifest[name]['summary'] for name in names}
+
+    def _compute_summary(self, lottery_name: str) -> Dict:
+        df = self.frame(lottery_name)
+        parsed = self.arrays(lottery_name) if {'numbers', 'draw_date'} <= set(df.columns) else None
+        return summarize_frame(df, parsed)
+
+
+def _summarize_file(path: str) -> Dict:
+    """Read and summarize one raw CSV (runs in a worker process)."""
+    from ..preprocessing.data_cleaner import parse_draws
+
+    df = pd.read_csv(path)
+    parsed = parse_draws(df) if {'numbers', 'draw_date'} <= set(df.columns) else None
+    return summarize_frame(df, parsed)
+
+
+def summarize_frame(df: pd.DataFrame, parsed: Optional[Dict[str, np.ndarray]]) -> Dict:
+    """
+    Summary stats of a raw lottery frame, computed in one pass over its arrays.
+
+    Args:
+        df: Raw DataFrame
+        parsed: Arrays from parse_draws (None for files without draw columns)
+
+    Returns:
+        Dictionary with rows, game_name, has_letter (first draw has a
+        letter), numbers_per_draw, min_date, max_date, date_span_days,
+        missing_cells, total_cells and the number distribution:
+        numbers_drawn, unique_numbers, min_number, max_number, mean_number,
+        median_number, std_number and number_histogram (counts per number
+        from min_number, via np.bincount)
+    """
+    first_letter = df['letter'].iloc[0] if 'letter' in df.columns and len(df) else None
+    summary = {
+        'rows': len(df),
+        'game_name': None,
+        'has_letter': bool(pd.notna(first_letter) and str(first_letter).strip() != ''),
+        'missing_cells': int(df.isna().to_numpy().sum()),
+        'total_cells': int(df.size),
+    }
+
+    if parsed is None:
+        # Files without draw columns (e.g. prize tables) only get cell counts
+        return summary
+
+    dates = parsed['dates'][~pd.isna(parsed['dates'])]
+    present = np.arange(parsed['numbers'].shape[1]) < parsed['counts'][:, None]
+    numbers = parsed['numbers'][present]
+
+    summary.update({
+        'game_name': str(df['game_name'].iloc[0]) if 'game_name' in df.columns and len(df) else None,
+        'numbers_per_draw': int(parsed['counts'][0]) if len(df) else 0,
+        'min_date': None,
+        'max_date': None,
+        'date_span_days': 0,
+        'numbers_drawn': int(len(numbers)),
+        'unique_numbers': 0,
+        'min_number': None,
+        'max_number': None,
+        'mean_number': None,
+        'median_number': None,
+        'std_number': None,
+        'number_histogram': [],
+    })
+
+    if len(dates):
+        min_date, max_date = pd.Timestamp(dates.min()), pd.Timestamp(dates.max())
+        summary.update({
+            'min_date': min_date.strftime('%Y-%m-%d'),
+            'max_date': max_date.strftime('%Y-%m-%d'),
+            'date_span_days': (max_date - min_date).days,
+        })
+
+    if len(numbers):
+        min_number = int(numbers.min())
+        histogram = np.bincount(numbers - min_number)
+        summary.update({
+            'unique_numbers': int(np.count_nonzero(histogram)),
+            'min_number': min_number,
+            'max_number': int(numbers.max()),
+            'mean_number': float(numbers.mean()),
+            'median_number': float(np.median(numbers)),
+            'std_number': float(numbers.std()),
+            'number_histogram': histogram.tolist(),
+        })
+
+    return summary
@@ -0,0 +1,374 @@
+"""
+Columnar storage for processed, featured and split lottery data.
+
+Datasets are written as compressed Parquet files with a fixed schema and read
+back with column projection and predicate pushdown. When a Parquet file is not
+available (or pyarrow is not installed) the store falls back to the CSV file of
+the same name, so existing data keeps working.
+
+Rows appended to a Parquet dataset go to part files in '<name>.parts/', which
+are read after the main file, so an append never rewrites existing rows. The
+next full write folds them back into one file.
+"""
+
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .schema import apply_schema, schema_for
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+    HAS_PYARROW = False
+
+
+class DatasetStore:
+    """
+    Read and write lottery datasets in one directory.
+
+    Datasets are addressed by file stem ('nlb_govisetha_featured',
+    'dlb_jayoda_test', ...). Writes go to '<name>.parquet' and, when
+    export_csv is set, also to '<name>.csv' for notebooks and other tools
+    that still expect CSV.
+    """
+
+    ROW_GROUP_SIZE = 16_384
+
+    # Appends beyond this many part files compact the dataset into one file
+    MAX_PARTS = 16
+
+    def __init__(
+        self,
+        directory: str,
+        storage_format: str = 'parquet',
+        export_csv: bool = True,
+        compression: str = 'zstd'
+    ):
+        """
+        Initialize the dataset store.
+
+        Args:
+            directory: Directory holding the dataset files
+            storage_format: 'parquet' or 'csv' (parquet needs pyarrow; falls back to csv)
+            export_csv: Also write a CSV copy when storing Parquet
+            compression: Parquet compression codec
+        """
+        if storage_format not in ('parquet', 'csv'):
+            raise ValueError(f"Unknown storage format: {storage_format}. Use 'parquet' or 'csv'")
+
+        self.directory = Path(directory)
+        self.storage_format = storage_format if HAS_PYARROW else 'csv'
+        self.export_csv = export_csv or self.storage_format == 'csv'
+        self.compression = compression
+
+    def path(self, name: str, storage_format: Optional[str] = None) -> Path:
+        """Path of a dataset file in the given format (default: the store's format)."""
+        suffix = storage_format or self.storage_format
+        return self.directory / f"{name}.{suffix}"
+
+    def source_path(self, name: str) -> Path:
+        """Path the dataset will be read from: Parquet if present and readable, else CSV."""
+        parquet_path = self.path(name, 'parquet')
+        if HAS_PYARROW and parquet_path.exists():
+            return parquet_path
+        return self.path(name, 'csv')
+
+    def part_paths(self, name: str) -> List[Path]:
+        """Parquet part files appended to a dataset since its last full write, in append order."""
+        if not HAS_PYARROW:
+            return []
+        return sorted((self.directory / f"{name}.parts").glob(f"{name}.part-*.parquet"))
+
+    def _parquet_files(self, name: str) -> List[Path]:
+        return [self.path(name, 'parquet')] + self.part_paths(name)
+
+    def _remove_parts(self, name: str):
+        shutil.rmtree(self.directory / f"{name}.parts", ignore_errors=True)
+
+    def exists(self, name: str) -> bool:
+        """Check whether a dataset exists in any readable format."""
+        return self.source_path(name).exists()
+
+    def names(self, pattern: str = '*') -> List[str]:
+        """
+        List dataset names in the directory matching a glob pattern.
+
+        Args:
+            pattern: Glob on the file stem, e.g. '*_featured'
+
+        Returns:
+            Sorted dataset names found as Parquet or CSV
+        """
+        stems = {f.stem for f in self.directory.glob(f"{pattern}.csv")}
+        if HAS_PYARROW:
+            stems.update(f.stem for f in self.directory.glob(f"{pattern}.parquet"))
+        return sorted(stems)
+
+    def count_rows(self, name: str) -> int:
+        """Number of rows in a dataset (Parquet: from the file metadata, without reading data)."""
+        path = self.source_path(name)
+        if path.suffix == '.parquet':
+            return sum(pq.ParquetFile(file).metadata.num_rows for file in self._parquet_files(name))
+
+        with open(path, 'rb') as f:
+            return max(sum(1 for _ in f) - 1, 0)
+
+    def column_range(self, name: str, column: str) -> Tuple:
+        """
+        Minimum and maximum of a column.
+
+        Parquet: from the row group statistics, without reading data (falls
+        back to reading the column when statistics are missing).
+
+        Returns:
+            Tuple of (min, max); (None, None) for an empty dataset
+        """
+        path = self.source_path(name)
+        if path.suffix == '.parquet':
+            stats = []
+            for file in self._parquet_files(name):
+                metadata = pq.ParquetFile(file).metadata
+                index = metadata.schema.names.index(column)
+                stats += [metadata.row_group(i).column(index).statistics for i in range(metadata.num_row_groups)]
+            if all(stat is not None and stat.has_min_max for stat in stats):
+                if not stats:
+                    return None, None
+                return min(stat.min for stat in stats), max(stat.max for stat in stats)
+
+        values = self.read(name, columns=[column])[column]
+        if values.empty:
+            return None, None
+        return values.min(), values.max()
+
+    def write(self, df: pd.DataFrame, name: str) -> Path:
+        """
+        Write a dataset, casting it to its schema.
+
+        Args:
+            df: DataFrame to store
+            name: Dataset name
+
+        Returns:
+            Path of the primary file written
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        df = apply_schema(df.copy(), schema_for(name))
+
+        if self.storage_format == 'parquet':
+            df.to_parquet(
+                self.path(name, 'parquet'),
+                index=False,
+                compression=self.compression,
+                row_group_size=self.ROW_GROUP_SIZE
+            )
+            self._remove_parts(name)
+        if self.export_csv:
+            df.to_csv(self.path(name, 'csv'), index=False)
+
+        return self.path(name)
+
+    def append(self, df: pd.DataFrame, name: str) -> Path:
+        """
+        Append rows to a dataset without rewriting the rows already stored.
+
+        Parquet: the rows are written to a new part file. Once MAX_PARTS part
+        files exist the dataset is compacted into one file instead. CSV: the
+        rows are appended to the file. A dataset (or CSV copy) that does not
+        exist yet is written in full.
+
+        Args:
+            df: Rows to append (same columns as the dataset)
+            name: Dataset name
+
+        Returns:
+            Path of the primary file of the dataset
+        """
+        csv_path = self.path(name, 'csv')
+        if not self.exists(name) or (self.export_csv and not csv_path.exists()):
+            df_existing = self.read(name) if self.exists(name) else df.iloc[:0]
+            return self.write(pd.concat([df_existing, df], ignore_index=True), name)
+
+        df = apply_schema(df.copy(), schema_for(name))
+
+        if self.storage_format == 'parquet':
+            parts = self.part_paths(name)
+            if len(parts) >= self.MAX_PARTS:
+                return self.write(pd.concat([self.read(name), df], ignore_index=True), name)
+
+            index = int(parts[-1].stem.rsplit('-', 1)[1]) + 1 if parts else 1
+            part_path = self.directory / f"{name}.parts" / f"{name}.part-{index:05d}.parquet"
+            part_path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(part_path, index=False, compression=self.compression,
+                          row_group_size=self.ROW_GROUP_SIZE)
+        if self.export_csv:
+            df.to_csv(csv_path, mode='a', header=False, index=False)
+
+        return self.path(name)
+
+    def writer(self, name: str) -> 'DatasetWriter':
+        """Open an appending writer for a dataset produced in chunks."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._remove_parts(name)
+        return DatasetWriter(self, name)
+
+    def read(
+        self,
+        name: str,
+        columns: Optional[Sequence[str]] = None,
+        numbers: Optional[Sequence[int]] = None,
+        lotteries: Optional[Sequence[str]] = None,
+        filters: Optional[List[tuple]] = None
+    ) -> pd.DataFrame:
+        """
+        Read a dataset with optional column projection and row filters.
+
+        With Parquet, filters are pushed down to row groups; with CSV they are
+        applied after parsing.
+
+        Args:
+            name: Dataset name
+            columns: Columns to load (default: all)
+            numbers: Keep only rows whose 'number' is in this list
+            lotteries: Keep only rows whose 'lottery' is in this list
+            filters: Extra pyarrow-style filters, e.g. [('draw_sequence', '>=', 100)]
+
+        Returns:
+            DataFrame cast to the dataset schema
+        """
+        predicates = list(filters or [])
+        if numbers is not None:
+            predicates.append(('number', 'in', list(numbers)))
+        if lotteries is not None:
+            predicates.append(('lottery', 'in', list(lotteries)))
+
+        path = self.source_path(name)
+        if not path.exists():
+            raise FileNotFoundError(f"Dataset not found: {name} in {self.directory}")
+
+        if path.suffix == '.parquet':
+            frames = [
+                pd.read_parquet(
+                    file,
+                    columns=list(columns) if columns is not None else None,
+                    filters=predicates or None
+                )
+                for file in self._parquet_files(name)
+            ]
+            df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        else:
+            usecols = None
+            if columns is not None:
+                usecols = list(dict.fromkeys(list(columns) + [p[0] for p in predicates]))
+            df = pd.read_csv(path, usecols=usecols)
+            df = _filter_frame(df, predicates)
+            if columns is not None:
+                df = df[list(columns)]
+
+        return apply_schema(df, schema_for(name)).reset_index(drop=True)
+
+    def iter_chunks(
+        self,
+        name: str,
+        chunk_size: int,
+        columns: Optional[Sequence[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over a dataset in chunks of rows without loading it whole.
+
+        Args:
+            name: Dataset name
+            chunk_size: Rows per chunk
+            columns: Columns to load (default: all)
+
+        Yields:
+            DataFrames of at most chunk_size rows, in file order
+        """
+        path = self.source_path(name)
+        schema = schema_for(name)
+        columns = list(columns) if columns is not None else None
+
+        if path.suffix == '.parquet':
+            # Chunks do not span files, so the last chunk of each file may be short
+            for file in self._parquet_files(name):
+                for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_size, columns=columns):
+                    yield apply_schema(batch.to_pandas(), schema)
+        else:
+            for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_size):
+                yield apply_schema(chunk, schema)
+
+
+class DatasetWriter:
+    """Append DataFrame chunks to a dataset, keeping a single schema."""
+
+    def __init__(self, store: DatasetStore, name: str):
+        self.store = store
+        self.name = name
+        self.schema = schema_for(name)
+        self.rows_written = 0
+        self._parquet_writer = None
+        self._csv_started = False
+
+    def write(self, df: pd.DataFrame):
+        """Append one chunk of rows."""
+        df = apply_schema(df.copy(), self.schema)
+
+        if self.store.storage_format == 'parquet':
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(
+                    self.store.path(self.name, 'parquet'),
+                    table.schema,
+                    compression=self.store.compression
+                )
+            self._parquet_writer.write_table(table.cast(self._parquet_writer.schema),
+                                             row_group_size=self.store.ROW_GROUP_SIZE)
+
+        if self.store.export_csv:
+            df.to_csv(
+                self.store.path(self.name, 'csv'),
+                mode='a' if self._csv_started else 'w',
+                header=not self._csv_started,
+                index=False
+            )
+            self._csv_started = True
+
+        self.rows_written += len(df)
+
+    def close(self):
+        """Finish the dataset file."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _filter_frame(df: pd.DataFrame, predicates: List[tuple]) -> pd.DataFrame:
+    """Apply pyarrow-style (column, op, value) predicates to a DataFrame."""
+    operators = {
+        '==': lambda s, v: s == v,
+        '=': lambda s, v: s == v,
+        '!=': lambda s, v: s != v,
+        '<': lambda s, v: s < v,
+        '<=': lambda s, v: s <= v,
+        '>': lambda s, v: s > v,
+        '>=': lambda s, v: s >= v,
+        'in': lambda s, v: s.isin(v),
+        'not in': lambda s, v: ~s.isin(v),
+    }
+
+    for col, op, value in predicates:
+        df = df[operators[op](df[col], value)]
+
+    return df
@@ -0,0 +1,367 @@
+"""
+Embedded SQLite database of draws, drawn numbers and features for all lotteries.
+
+Gives the scrapers, preprocessing stages and API indexed point and range
+lookups (e.g. "latest features for number 7 in govisetha") instead of
+scanning CSV files.
+
+Tables:
+- draws:        one row per (lottery, draw_id), indexed on (lottery, draw_sequence)
+- draw_numbers: one row per drawn number, indexed on (lottery, number, draw_sequence)
+- features:     one row per (lottery, number, draw_sequence), plus an index on
+                (lottery, draw_sequence)
+
+Usage:
+    python -m src.storage.draw_db            # build data/lottery.db from data/
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from .dataset_store import DatasetStore
+from .schema import FEATURED_SCHEMA
+
+FEATURE_COLUMNS = [col for col in FEATURED_SCHEMA if col != 'lottery']
+
+SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS draws (
+    lottery TEXT NOT NULL,
+    draw_id INTEGER NOT NULL,
+    draw_date TEXT NOT NULL,
+    draw_sequence INTEGER,
+    letter TEXT,
+    numbers TEXT NOT NULL,
+    source TEXT,
+    PRIMARY KEY (lottery, draw_id)
+);
+CREATE INDEX IF NOT EXISTS idx_draws_sequence ON draws (lottery, draw_sequence);
+
+CREATE TABLE IF NOT EXISTS draw_numbers (
+    lottery TEXT NOT NULL,
+    draw_id INTEGER NOT NULL,
+    draw_sequence INTEGER,
+    number INTEGER NOT NULL,
+    PRIMARY KEY (lottery, draw_id, number)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_draw_numbers_number ON draw_numbers (lottery, number, draw_sequence);
+
+CREATE TABLE IF NOT EXISTS features (
+    lottery TEXT NOT NULL,
+    {', '.join(f'{col} {"TEXT" if col in ("draw_date", "trend") else "REAL" if FEATURED_SCHEMA[col].startswith("float") else "INTEGER"}' for col in FEATURE_COLUMNS)},
+    PRIMARY KEY (lottery, number, draw_sequence)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_features_sequence ON features (lottery, draw_sequence);
+"""
+
+
+def _parse_numbers(numbers_str) -> Optional[List[int]]:
+    """Drawn numbers of a '05;12;33' string, or None if it is missing or any entry is not an integer."""
+    if pd.isna(numbers_str):
+        return None
+    try:
+        return [int(n) for n in str(numbers_str).split(';')]
+    except ValueError:
+        return None
+
+
+class DrawDatabase:
+    """Indexed local store of lottery draws and features."""
+
+    def __init__(self, db_path: str = 'data/lottery.db'):
+        """
+        Open (and create if needed) the draw database.
+
+        Args:
+            db_path: Path of the SQLite file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+            conn.executescript(SCHEMA_SQL)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Bulk loads
+    # ------------------------------------------------------------------
+
+    def load_draws(self, df: pd.DataFrame, lottery: str, replace: bool = False) -> int:
+        """
+        Upsert draws for a lottery from a raw or cleaned DataFrame.
+
+        Raw scraped rows have no draw_sequence; loading the cleaned data later
+        fills it in. Drawn numbers are re-indexed for every loaded draw. Rows
+        with a missing draw_id, an unparseable date or numbers are skipped,
+        as DataCleaner drops them.
+
+        Args:
+            df: DataFrame with draw_date, draw_id, numbers (and optionally
+                draw_sequence, letter, source)
+            lottery: Lottery name, e.g. 'nlb_govisetha'
+            replace: Drop the lottery's existing draws first, so draws that
+                are no longer in df do not survive a full reload
+
+        Returns:
+            Number of draws loaded
+        """
+        draw_dates = pd.to_datetime(df['draw_date'], errors='coerce').dt.strftime('%Y-%m-%d')
+        sequences = df['draw_sequence'] if 'draw_sequence' in df.columns else pd.Series(None, index=df.index)
+        letters = df['letter'] if 'letter' in df.columns else pd.Series(None, index=df.index)
+        sources = df['source'] if 'source' in df.columns else pd.Series(None, index=df.index)
+
+        draw_rows = []
+        number_rows = []
+        for draw_id, draw_date, sequence, letter, numbers_str, source in zip(
+            df['draw_id'], draw_dates, sequences, letters, df['numbers'], sources
+        ):
+            numbers = _parse_numbers(numbers_str)
+            if pd.isna(draw_id) or pd.isna(draw_date) or numbers is None:
+                continue
+
+            draw_id = int(draw_id)
+            sequence = None if pd.isna(sequence) else int(sequence)
+            letter = None if pd.isna(letter) or letter == '' else str(letter)
+            source = None if pd.isna(source) else str(source)
+
+            draw_rows.append((lottery, draw_id, draw_date, sequence, letter, str(numbers_str), source))
+            for n in set(numbers):
+                number_rows.append((lottery, draw_id, sequence, n))
+
+        with self._connect() as conn:
+            if replace:
+                conn.execute("DELETE FROM draws WHERE lottery = ?", (lottery,))
+                conn.execute("DELETE FROM draw_numbers WHERE lottery = ?", (lottery,))
+            conn.executemany(
+                """
+                INSERT INTO draws (lottery, draw_id, draw_date, draw_sequence, letter, numbers, source)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (lottery, draw_id) DO UPDATE SET
+                    draw_date = excluded.draw_date,
+                    draw_sequence = COALESCE(excluded.draw_sequence, draws.draw_sequence),
+                    letter = excluded.letter,
+                    numbers = excluded.numbers,
+                    source = excluded.source
+                """,
+                draw_rows
+            )
+            conn.executemany(
+                "DELETE FROM draw_numbers WHERE lottery = ? AND draw_id = ?",
+                [(lottery, row[1]) for row in draw_rows]
+            )
+            conn.executemany(
+                "INSERT INTO draw_numbers (lottery, draw_id, draw_sequence, number) VALUES (?, ?, ?, ?)",
+                number_rows
+            )
+            # Carry sequences onto numbers of draws loaded raw before cleaning
+            conn.execute(
+                """
+                UPDATE draw_numbers SET draw_sequence = (
+                    SELECT d.draw_sequence FROM draws d
+                    WHERE d.lottery = draw_numbers.lottery AND d.draw_id = draw_numbers.draw_id
+                )
+                WHERE lottery = ? AND draw_sequence IS NULL
+                """,
+                (lottery,)
+            )
+
+        return len(draw_rows)
+
+    def load_features(self, df: pd.DataFrame, lottery: str, replace: bool = True) -> int:
+        """
+        Load feature rows of a lottery.
+
+        Args:
+            df: Featured DataFrame (one row per draw and number)
+            lottery: Lottery name
+            replace: Drop the lottery's existing feature rows first; pass False
+                to append further chunks of a streamed lottery
+
+        Returns:
+            Number of feature rows loaded
+        """
+        columns = [col for col in FEATURE_COLUMNS if col in df.columns]
+        df_load = df[columns].copy()
+        if 'draw_date' in df_load.columns:
+            df_load['draw_date'] = pd.to_datetime(df_load['draw_date']).dt.strftime('%Y-%m-%d')
+        if 'trend' in df_load.columns:
+            df_load['trend'] = df_load['trend'].astype(str)
+
+        placeholders = ', '.join('?' for _ in range(len(columns) + 1))
+        rows = [(lottery, *row) for row in df_load.itertuples(index=False, name=None)]
+
+        with self._connect() as conn:
+            if replace:
+                conn.execute("DELETE FROM features WHERE lottery = ?", (lottery,))
+            conn.executemany(
+                f"INSERT OR REPLACE INTO features (lottery, {', '.join(columns)}) VALUES ({placeholders})",
+                [tuple(v.item() if hasattr(v, 'item') else v for v in row) for row in rows]
+            )
+
+        return len(rows)
+
+    def build(self, data_dir: str = 'data') -> Dict[str, Dict[str, int]]:
+        """
+        Bulk-load all cleaned draws and featured data from the pipeline outputs.
+
+        Args:
+            data_dir: Data root containing processed/
+
+        Returns:
+            Per-lottery counts of loaded draws and feature rows
+        """
+        store = DatasetStore(Path(data_dir) / 'processed')
+        counts = {}
+
+        for cleaned_name in store.names('*_cleaned'):
+            lottery = cleaned_name.replace('_cleaned', '')
+            counts[lottery] = {'draws': self.load_draws(store.read(cleaned_name), lottery, replace=True)}
+
+            featured_name = f"{lottery}_featured"
+            if store.exists(featured_name):
+                counts[lottery]['features'] = self.load_features(store.read(featured_name), lottery)
+
+        return counts
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=list(params))
+
+    def lotteries(self) -> List[str]:
+        """List lotteries with at least one draw."""
+        return self._query("SELECT DISTINCT lottery FROM draws ORDER BY lottery")['lottery'].tolist()
+
+    def latest_draw(self, lottery: str) -> Optional[Dict]:
+        """Most recent draw of a lottery by draw_sequence (or draw date for raw-only draws)."""
+        df = self._query(
+            """
+            SELECT * FROM draws WHERE lottery = ?
+            ORDER BY draw_sequence DESC, draw_date DESC LIMIT 1
+            """,
+            (lottery,)
+        )
+        return df.iloc[0].to_dict() if len(df) else None
+
+    def draws(
+        self,
+        lottery: str,
+        start_sequence: Optional[int] = None,
+        end_sequence: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Range query on draws of a lottery by draw_sequence (inclusive bounds).
+
+        With only a limit, returns the latest `limit` draws.
+        """
+        sql = "SELECT * FROM draws WHERE lottery = ?"
+        params = [lottery]
+        if start_sequence is not None:
+            sql += " AND draw_sequence >= ?"
+            params.append(start_sequence)
+        if end_sequence is not None:
+            sql += " AND draw_sequence <= ?"
+            params.append(end_sequence)
+
+        if limit is not None:
+            sql = f"SELECT * FROM ({sql} ORDER BY draw_sequence DESC LIMIT ?) ORDER BY draw_sequence"
+            params.append(limit)
+        else:
+            sql += " ORDER BY draw_sequence"
+
+        return self._query(sql, params)
+
+    def number_appearances(
+        self,
+        lottery: str,
+        number: int,
+        start_sequence: Optional[int] = None,
+        end_sequence: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Draws in which a number appeared, in draw order."""
+        sql = """
+            SELECT n.draw_sequence, n.draw_id, d.draw_date
+            FROM draw_numbers n JOIN draws d ON d.lottery = n.lottery AND d.draw_id = n.draw_id
+            WHERE n.lottery = ? AND n.number = ?
+        """
+        params = [lottery, number]
+        if start_sequence is not None:
+            sql += " AND n.draw_sequence >= ?"
+            params.append(start_sequence)
+        if end_sequence is not None:
+            sql += " AND n.draw_sequence <= ?"
+            params.append(end_sequence)
+
+        return self._query(sql + " ORDER BY n.draw_sequence", params)
+
+    def features(
+        self,
+        lottery: str,
+        number: int,
+        start_sequence: Optional[int] = None,
+        end_sequence: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Feature rows of one number over a draw_sequence range."""
+        sql = "SELECT * FROM features WHERE lottery = ? AND number = ?"
+        params = [lottery, number]
+        if start_sequence is not None:
+            sql += " AND draw_sequence >= ?"
+            params.append(start_sequence)
+        if end_sequence is not None:
+            sql += " AND draw_sequence <= ?"
+            params.append(end_sequence)
+
+        return self._query(sql + " ORDER BY draw_sequence", params)
+
+    def latest_features(self, lottery: str, numbers: Optional[Sequence[int]] = None) -> pd.DataFrame:
+        """
+        Latest feature row per number of a lottery.
+
+        Args:
+            lottery: Lottery name
+            numbers: Restrict to these numbers (default: all)
+
+        Returns:
+            DataFrame with one row per number, ordered by number
+        """
+        sql = """
+            SELECT f.* FROM features f
+            JOIN (
+                SELECT number, MAX(draw_sequence) AS draw_sequence
+                FROM features WHERE lottery = ? GROUP BY number
+            ) latest ON latest.number = f.number AND latest.draw_sequence = f.draw_sequence
+            WHERE f.lottery = ?
+        """
+        params = [lottery, lottery]
+        if numbers is not None:
+            sql += f" AND f.number IN ({', '.join('?' for _ in numbers)})"
+            params.extend(int(n) for n in numbers)
+
+        return self._query(sql + " ORDER BY f.number", params)
+
+
+if __name__ == '__main__':
+    db = DrawDatabase('data/lottery.db')
+    counts = db.build('data')
+
+    print(f"\n{'Lottery':<30} {'Draws':<10} {'Features':<10}")
+    print("-"*50)
+    for lottery, c in sorted(counts.items()):
+        print(f"{lottery:<30} {c['draws']:<10} {c.get('features', 0):<10}")
+    print(f"\nDatabase saved to: {db.db_path}")
@@ -0,0 +1,248 @@
+"""
+In-memory feature snapshots for serving predictions.
+
+A snapshot holds, for one lottery, the feature row served for every number
+(the last row of that number in the test split) as one contiguous float32
+matrix plus a number -> row lookup, so a request is answered with an array
+lookup instead of reading and scanning the split. Snapshots are built on
+first use, kept in LRU order under a memory budget and rebuilt when the
+split's source files change on disk.
+
+With a shared directory, publish() writes the snapshots of every lottery
+once as memory-mapped arrays (SharedArrays). Stores in other processes (for
+example uvicorn workers) then map them read-only instead of each reading the
+splits and holding private copies. A published snapshot is only used while
+its lottery's source files are unchanged; otherwise the store falls back
+to building its own.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .shared_arrays import SharedArrays
+from .split_index import SplitIndex
+
+
+class FeatureSnapshot:
+    """Latest feature row per number of one lottery."""
+
+    def __init__(self, numbers: np.ndarray, matrix: np.ndarray, version: str = '', shared: bool = False):
+        """
+        Args:
+            numbers: Numbers covered, aligned with the matrix rows
+            matrix: float32 feature matrix (one row per number)
+            version: Identifies the source data (changes whenever it is rewritten)
+            shared: Arrays are views of a shared memory-mapped bundle
+        """
+        self.version = version
+        self.shared = shared
+        self.numbers = numbers
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        self.row_of = {int(number): row for row, number in enumerate(numbers)}
+
+    @property
+    def nbytes(self) -> int:
+        """Private memory held by the arrays (0 when they are shared)."""
+        return 0 if self.shared else self.matrix.nbytes + self.numbers.nbytes
+
+    def row(self, number: int) -> Optional[np.ndarray]:
+        """Feature row (1-D view) of a number, or None if it is not covered."""
+        row = self.row_of.get(number)
+        return None if row is None else self.matrix[row]
+
+    def rows(self, numbers: Sequence[int]) -> Tuple[List[int], np.ndarray]:
+        """
+        Feature rows of the covered numbers among `numbers`.
+
+        Args:
+            numbers: Requested numbers (order is kept, unknown numbers are dropped)
+
+        Returns:
+            Tuple of (numbers found, their feature matrix)
+        """
+        found = [number for number in numbers if number in self.row_of]
+        return found, self.matrix[[self.row_of[number] for number in found]]
+
+
+class FeatureSnapshotStore:
+    """Lazily built, LRU-evicted FeatureSnapshot per lottery."""
+
+    DEFAULT_SHARED_DIR = 'data/serving'
+
+    def __init__(
+        self,
+        split_index: SplitIndex,
+        feature_cols: Sequence[str],
+        categorical_maps: Optional[Dict[str, Dict[str, float]]] = None,
+        memory_budget_mb: float = 64,
+        split_name: str = 'test',
+        shared_dir: Optional[str] = None
+    ):
+        """
+        Initialize the snapshot store.
+
+        Args:
+            split_index: Split reader the snapshots are built from
+            feature_cols: Feature columns, in model order
+            categorical_maps: Column -> {category: code}; unmapped values become 0
+            memory_budget_mb: Evict least recently used snapshots above this size
+            split_name: Split whose rows are served
+            shared_dir: Directory of the snapshots published with publish() (None = private only)
+        """
+        self.split_index = split_index
+        self.feature_cols = list(feature_cols)
+        self.categorical_maps = categorical_maps or {}
+        self.memory_budget = int(memory_budget_mb * 1024**2)
+        self.split_name = split_name
+
+        # lottery -> (source signature, snapshot), least recently used first
+        self._snapshots: 'OrderedDict[str, Tuple[Tuple, FeatureSnapshot]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Published snapshots, re-mapped whenever a new bundle is published
+        self.shared = SharedArrays(shared_dir, f"feature_snapshots_{split_name}") if shared_dir else None
+        self._shared_signature = None
+        self._shared_meta: Dict = {}
+        self._shared_arrays: Dict[str, np.ndarray] = {}
+
+    def exists(self, lottery_name: str) -> bool:
+        return self.split_index.exists(lottery_name, self.split_name)
+
+    def get(self, lottery_name: str) -> FeatureSnapshot:
+        """
+        Snapshot of a lottery, building it on first use or when its sources changed.
+
+        Args:
+            lottery_name: Name of the lottery
+
+        Returns:
+            FeatureSnapshot
+        """
+        signature = self._signature(lottery_name)
+
+        with self._lock:
+            cached = self._snapshots.get(lottery_name)
+            if cached is not None and cached[0] == signature:
+                self._snapshots.move_to_end(lottery_name)
+                return cached[1]
+
+        snapshot = self._attach(lottery_name, signature) or self._build(lottery_name, signature)
+
+        with self._lock:
+            self._snapshots[lottery_name] = (signature, snapshot)
+            self._snapshots.move_to_end(lottery_name)
+            self._evict()
+        return snapshot
+
+    def publish(self, lottery_names: Optional[List[str]] = None) -> Path:
+        """
+        Build snapshots from the splits and publish them for every process to map.
+
+        Args:
+            lottery_names: Lotteries to publish (default: every lottery with this split)
+
+        Returns:
+            Path of the published manifest
+        """
+        if self.shared is None:
+            raise ValueError("FeatureSnapshotStore was created without a shared_dir")
+
+        names = lottery_names or self.split_index.lotteries(self.split_name)
+        snapshots = {name: self._build(name, self._signature(name)) for name in names}
+
+        lotteries = {}
+        offset = 0
+        for name, snapshot in snapshots.items():
+            lotteries[name] = {'offset': offset, 'rows': len(snapshot.numbers), 'version': snapshot.version}
+            offset += len(snapshot.numbers)
+
+        empty = np.empty((0, len(self.feature_cols)), dtype=np.float32)
+        arrays = {
+            'numbers': np.concatenate([s.numbers for s in snapshots.values()] or [np.empty(0, np.int16)]),
+            'matrix': np.concatenate([s.matrix for s in snapshots.values()] or [empty]),
+        }
+        return self.shared.publish(arrays, meta={**self._layout(), 'lotteries': lotteries})
+
+    def stats(self) -> Dict:
+        """Cached lotteries and memory use."""
+        with self._lock:
+            return {
+                'lotteries': list(self._snapshots),
+                'shared_lotteries': [name for name, (_, s) in self._snapshots.items() if s.shared],
+                'memory_bytes': sum(snapshot.nbytes for _, snapshot in self._snapshots.values()),
+                'memory_budget_bytes': self.memory_budget
+            }
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+    def _evict(self):
+        """Drop least recently used snapshots until within budget (the newest one always stays)."""
+        total = sum(snapshot.nbytes for _, snapshot in self._snapshots.values())
+        while total > self.memory_budget and len(self._snapshots) > 1:
+            _, (_, snapshot) = self._snapshots.popitem(last=False)
+            total -= snapshot.nbytes
+
+    def _signature(self, lottery_name: str) -> Tuple:
+        # File names rather than paths, so processes opening the same data
+        # through different (relative/absolute) paths agree on the version
+        signature = []
+        for path in self.split_index.sources(lottery_name, self.split_name):
+            stat = Path(path).stat()
+            signature.append((Path(path).name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _layout(self) -> Dict:
+        """Settings a published snapshot must have been built with."""
+        return {
+            'split_name': self.split_name,
+            'feature_cols': self.feature_cols,
+            'categorical_maps': {column: dict(mapping) for column, mapping in self.categorical_maps.items()}
+        }
+
+    def _attach(self, lottery_name: str, signature: Tuple) -> Optional[FeatureSnapshot]:
+        """Published snapshot of a lottery, if there is one for its current source files."""
+        if self.shared is None:
+            return None
+
+        shared_signature = self.shared.signature()
+        with self._lock:
+            if shared_signature != self._shared_signature:
+                attached = self.shared.attach() if shared_signature is not None else None
+                meta, arrays = attached or ({}, {})
+                if meta and {key: meta.get(key) for key in self._layout()} != self._layout():
+                    meta, arrays = {}, {}
+                self._shared_signature, self._shared_meta, self._shared_arrays = shared_signature, meta, arrays
+            entry = self._shared_meta.get('lotteries', {}).get(lottery_name)
+            arrays = self._shared_arrays
+
+        if entry is None or entry['version'] != self._version(signature):
+            return None
+
+        rows = slice(entry['offset'], entry['offset'] + entry['rows'])
+        return FeatureSnapshot(arrays['numbers'][rows], arrays['matrix'][rows], entry['version'], shared=True)
+
+    @staticmethod
+    def _version(signature: Tuple) -> str:
+        return hashlib.sha1(repr(signature).encode()).hexdigest()[:16]
+
+    def _build(self, lottery_name: str, signature: Tuple) -> FeatureSnapshot:
+        df = self.split_index.read(lottery_name, self.split_name, columns=['number'] + self.feature_cols)
+
+        for column, mapping in self.categorical_maps.items():
+            if column in df.columns:
+                df[column] = df[column].astype(object).map(mapping).fillna(0)
+
+        # Last row of each number, in split order
+        numbers = df['number'].to_numpy()
+        unique, last_reversed = np.unique(numbers[::-1], return_index=True)
+        last = len(numbers) - 1 - last_reversed
+
+        matrix = df[self.feature_cols].to_numpy(dtype=np.float32)[last]
+        return FeatureSnapshot(unique.astype(np.int16), matrix, self._version(signature))
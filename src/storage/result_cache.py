@@ -0,0 +1,78 @@
+"""
+In-memory cache for served model results.
+
+Keys are tuples that include the versions the value depends on (model
+fingerprint, lottery data version, ...), so a new model or new data never
+hits a stale entry; old entries simply age out. Entries are evicted least
+recently used beyond max_entries and expire after ttl_seconds.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class ResultCache:
+    """Thread-safe LRU + TTL cache with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: Optional[float] = 3600):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Evict least recently used entries beyond this count
+            ttl_seconds: Expire entries this long after they were stored (None = never)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (stored_at, value), least recently used first
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value, or None on a miss (absent or expired)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None \
+                    and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Entry count and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
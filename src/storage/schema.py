@@ -0,0 +1,178 @@
+"""
+Schema registry for lottery datasets.
+
+Declares the narrowest dtype for every column the pipeline produces. Every
+stage casts its frames through apply_schema (DatasetStore does it on each
+read and write), so data in memory and on disk share one compact layout:
+int8 flags, uint8 numbers, float32 statistics, categorical lottery/trend and
+datetime64 dates.
+"""
+
+from typing import Dict, Optional, Tuple, Union
+
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+# Fixed categories keep codes identical across lotteries and streamed chunks
+TREND_DTYPE = CategoricalDtype(['cooling_down', 'stable', 'heating_up'])
+
+DtypeSpec = Union[str, CategoricalDtype]
+
+# Cleaned draws: one row per draw
+CLEANED_SCHEMA: Dict[str, DtypeSpec] = {
+    'draw_date': 'datetime64[ns]',
+    'draw_id': 'int32',
+    'game': 'category',
+    'game_name': 'category',
+    'letter': 'category',
+    'numbers': 'object',
+    'raw_text': 'object',
+    'source': 'category',
+    'url': 'category',
+    'draw_sequence': 'int16',
+}
+
+# Featured / split data: one row per (draw, number)
+FEATURED_SCHEMA: Dict[str, DtypeSpec] = {
+    'lottery': 'category',
+    'draw_date': 'datetime64[ns]',
+    'draw_id': 'int32',
+    'draw_sequence': 'int16',
+    'number': 'uint8',
+    'appeared': 'int8',
+    'frequency_last_10': 'uint8',
+    'frequency_last_30': 'uint8',
+    'frequency_last_50': 'uint8',
+    'frequency_all_time': 'int16',
+    'appearance_rate': 'float32',
+    'days_since_last': 'int16',
+    'day_of_week': 'int8',
+    'is_weekend': 'int8',
+    'month': 'int8',
+    'week_of_year': 'int8',
+    'mean_gap': 'float32',
+    'std_gap': 'float32',
+    'min_gap': 'float32',
+    'max_gap': 'float32',
+    'current_gap': 'int16',
+    'temperature_score': 'float32',
+    'is_hot': 'int8',
+    'is_cold': 'int8',
+    'trend': TREND_DTYPE,
+}
+
+# Split index: row positions into the featured dataset grouped by fold, or
+# (hash splits) the fold of every draw_id
+SPLIT_INDEX_SCHEMA: Dict[str, DtypeSpec] = {
+    'row': 'int32',
+    'draw_id': 'int32',
+    'fold': 'uint8',
+}
+
+SCHEMAS: Dict[str, Dict[str, DtypeSpec]] = {
+    'cleaned': CLEANED_SCHEMA,
+    'featured': FEATURED_SCHEMA,
+    'split_index': SPLIT_INDEX_SCHEMA,
+}
+
+SPLIT_NAMES = ('train', 'val', 'test')
+
+# Model inputs in training order; 'trend' is encoded with TREND_CODES
+MODEL_FEATURES = [
+    'draw_id', 'draw_sequence', 'current_gap', 'mean_gap', 'std_gap',
+    'min_gap', 'max_gap', 'days_since_last', 'appearance_rate',
+    'frequency_last_10', 'frequency_last_30', 'frequency_last_50',
+    'frequency_all_time', 'temperature_score', 'trend', 'is_hot',
+    'is_cold', 'day_of_week', 'month', 'week_of_year', 'is_weekend'
+]
+
+TREND_CODES = {
+    'heating_up': 1,
+    'cooling_down': -1,
+    'stable': 0
+}
+
+
+def schema_for(name: str) -> Optional[Dict[str, DtypeSpec]]:
+    """
+    Pick the schema for a dataset from its name or kind.
+
+    Args:
+        name: Dataset name ('nlb_govisetha_cleaned', 'dlb_jayoda_test', ...)
+            or a kind from SCHEMAS ('cleaned', 'featured', 'split_index')
+
+    Returns:
+        Column -> dtype mapping, or None for datasets without a fixed schema
+    """
+    if name in SCHEMAS:
+        return SCHEMAS[name]
+    if name.endswith('_cleaned'):
+        return CLEANED_SCHEMA
+    if name.endswith('_split_index'):
+        return SPLIT_INDEX_SCHEMA
+    if name.endswith('_featured') or name.rsplit('_', 1)[-1] in SPLIT_NAMES:
+        return FEATURED_SCHEMA
+    return None
+
+
+def apply_schema(df: pd.DataFrame, schema: Optional[Dict[str, DtypeSpec]]) -> pd.DataFrame:
+    """
+    Cast the columns of a DataFrame to a schema.
+
+    Columns missing from the schema are left untouched, and schema columns
+    missing from the DataFrame are ignored (e.g. after column projection).
+
+    Args:
+        df: DataFrame to cast (modified in place)
+        schema: Column -> dtype mapping
+
+    Returns:
+        The same DataFrame with casted columns
+    """
+    if not schema:
+        return df
+
+    for col, dtype in schema.items():
+        if col not in df.columns or _has_dtype(df[col], dtype):
+            continue
+        if isinstance(dtype, str) and dtype.startswith('datetime64'):
+            df[col] = pd.to_datetime(df[col])
+        elif isinstance(dtype, CategoricalDtype) and isinstance(df[col].dtype, CategoricalDtype):
+            df[col] = df[col].astype(object).astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+
+    return df
+
+
+def _has_dtype(series: pd.Series, dtype: DtypeSpec) -> bool:
+    if isinstance(dtype, CategoricalDtype):
+        return series.dtype == dtype
+    return str(series.dtype) == dtype
+
+
+def compact(df: pd.DataFrame, name: str) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Cast a DataFrame to its registered schema and measure the memory saved.
+
+    Args:
+        df: DataFrame as produced by a stage (modified in place)
+        name: Dataset name or kind passed to schema_for
+
+    Returns:
+        Tuple of (casted DataFrame, memory stats with before/after MB and ratio)
+    """
+    before = df.memory_usage(deep=True).sum()
+    df = apply_schema(df, schema_for(name))
+    after = df.memory_usage(deep=True).sum()
+
+    return df, memory_stats(before, after)
+
+
+def memory_stats(before_bytes: int, after_bytes: int) -> Dict[str, float]:
+    """Summarize a before/after memory measurement."""
+    return {
+        'before_mb': round(float(before_bytes) / 1024 / 1024, 3),
+        'after_mb': round(float(after_bytes) / 1024 / 1024, 3),
+        'ratio': round(float(before_bytes) / float(after_bytes), 2) if after_bytes else 0.0
+    }
@@ -0,0 +1,150 @@
+"""
+Precomputed SHAP explanations.
+
+For every (lottery, number) feature row the backend serves, a SharedArrays
+bundle holds the model's probability and its SHAP contributions: a float32
+(rows x features) matrix plus lottery/number index arrays. Every process
+maps the arrays read-only instead of loading a private copy. The manifest
+records the fingerprint of the model they were computed with and, per
+lottery, the feature snapshot version, so a lookup only answers when both
+still match and callers fall back to computing the explanation on demand
+otherwise. Written by `python -m src.utils.precompute_shap`.
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .shared_arrays import SharedArrays
+
+
+class ShapStore:
+    """Read (and write) precomputed per-number SHAP explanations."""
+
+    DEFAULT_PATH = 'models/shap_precomputed'
+    BUNDLE_NAME = 'shap_values'
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Initialize the store; the arrays are (re)mapped lazily whenever they are republished.
+
+        Args:
+            path: Directory written by ShapStore.save
+        """
+        self.path = Path(path)
+        self.shared = SharedArrays(self.path, self.BUNDLE_NAME)
+        self._lock = threading.Lock()
+        self._signature = None
+        self._index: Dict[Tuple[str, int], int] = {}
+        self._versions: Dict[str, str] = {}
+        self._model_fingerprint: Optional[str] = None
+        self._probabilities = np.empty(0)
+        self._values = np.empty((0, 0), dtype=np.float32)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def save(
+        path: str,
+        model_fingerprint: str,
+        feature_cols: Sequence[str],
+        lotteries: Dict[str, Tuple[str, np.ndarray, np.ndarray, np.ndarray]]
+    ) -> Path:
+        """
+        Publish precomputed explanations atomically.
+
+        Args:
+            path: Output directory
+            model_fingerprint: Fingerprint of the model used
+            feature_cols: Feature columns, in model order
+            lotteries: Lottery -> (snapshot version, numbers, probabilities, SHAP values)
+
+        Returns:
+            Path of the published manifest
+        """
+        names = sorted(lotteries)
+        sizes = [len(lotteries[name][1]) for name in names]
+        arrays = {
+            'lottery_codes': np.repeat(np.arange(len(names), dtype=np.int16), sizes),
+            'numbers': np.concatenate([lotteries[name][1] for name in names]).astype(np.int16),
+            'probabilities': np.concatenate([lotteries[name][2] for name in names]).astype(np.float64),
+            'values': np.concatenate([lotteries[name][3] for name in names]).astype(np.float32),
+        }
+        meta = {
+            'model_fingerprint': model_fingerprint,
+            'feature_cols': list(feature_cols),
+            'lotteries': names,
+            'versions': [lotteries[name][0] for name in names],
+        }
+        return SharedArrays(path, ShapStore.BUNDLE_NAME).publish(arrays, meta)
+
+    def lookup(
+        self,
+        lottery_name: str,
+        number: int,
+        version: str,
+        model_fingerprint: str
+    ) -> Optional[Tuple[float, np.ndarray]]:
+        """
+        Precomputed explanation of a number.
+
+        Args:
+            lottery_name: Name of the lottery
+            number: Number (snapshot row) to explain
+            version: Current snapshot version of the lottery
+            model_fingerprint: Fingerprint of the currently loaded model
+
+        Returns:
+            Tuple of (probability of appearing, float32 SHAP values in feature
+            order), or None when missing or computed from other data or model
+        """
+        self._reload_if_changed()
+
+        with self._lock:
+            row = self._index.get((lottery_name, number))
+            if (row is None or self._model_fingerprint != model_fingerprint
+                    or self._versions.get(lottery_name) != version):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return float(self._probabilities[row]), self._values[row]
+
+    def stats(self) -> Dict:
+        """Loaded rows and hit/miss counters."""
+        with self._lock:
+            return {
+                'path': str(self.path),
+                'loaded': self._signature is not None,
+                'rows': len(self._probabilities),
+                'lotteries': len(self._versions),
+                'model_fingerprint': self._model_fingerprint,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def _reload_if_changed(self):
+        signature = self.shared.signature()
+        if signature == self._signature:
+            return
+
+        attached = self.shared.attach() if signature is not None else None
+
+        with self._lock:
+            if attached is None:
+                self._index, self._versions, self._model_fingerprint = {}, {}, None
+                self._probabilities = np.empty(0)
+                self._values = np.empty((0, 0), dtype=np.float32)
+            else:
+                meta, arrays = attached
+                names = meta['lotteries']
+                self._model_fingerprint = meta['model_fingerprint']
+                self._versions = dict(zip(names, meta['versions']))
+                self._index = {
+                    (names[code], int(number)): row
+                    for row, (code, number) in enumerate(zip(arrays['lottery_codes'], arrays['numbers']))
+                }
+                self._probabilities = arrays['probabilities']
+                self._values = arrays['values']
+            self._signature = signature
@@ -0,0 +1,115 @@
+"""
+Arrays published once and memory-mapped read-only by every process.
+
+A bundle is a JSON manifest `<name>.json` next to a directory
+`<name>.<digest>/` holding one .npy file per array. Publishing writes the
+(content-addressed) directory first and then replaces the manifest with an
+atomic rename, so readers see either the old or the new bundle, never a mix.
+Readers open the .npy files with np.load(mmap_mode='r'): all worker
+processes share the same page-cache pages instead of each holding a private
+copy, and only pages that are actually touched are read.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+class SharedArrays:
+    """Publish and attach a named bundle of read-only, memory-mapped arrays."""
+
+    def __init__(self, directory: str, name: str):
+        """
+        Args:
+            directory: Directory holding the bundle
+            name: Bundle name (manifest `<name>.json`)
+        """
+        self.directory = Path(directory)
+        self.name = name
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / f"{self.name}.json"
+
+    def signature(self) -> Optional[Tuple[int, int]]:
+        """mtime and size of the manifest (changes on every publish), or None if not published."""
+        try:
+            stat = self.manifest_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def publish(self, arrays: Dict[str, np.ndarray], meta: Optional[Dict] = None) -> Path:
+        """
+        Write a new bundle and make it current.
+
+        Args:
+            arrays: Array name -> array (numeric dtypes)
+            meta: JSON-serializable metadata stored in the manifest
+
+        Returns:
+            Path of the manifest
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        digest = hashlib.sha1(json.dumps(meta or {}, sort_keys=True).encode())
+        for key in sorted(arrays):
+            array = np.ascontiguousarray(arrays[key])
+            digest.update(f"{key}:{array.dtype.str}:{array.shape}".encode())
+            digest.update(array.tobytes())
+        bundle = f"{self.name}.{digest.hexdigest()[:16]}"
+
+        # Identical content is already published under the same directory
+        bundle_path = self.directory / bundle
+        if not bundle_path.exists():
+            tmp_path = self.directory / f"{bundle}.tmp-{os.getpid()}"
+            tmp_path.mkdir()
+            for key, array in arrays.items():
+                np.save(tmp_path / f"{key}.npy", np.ascontiguousarray(array))
+            try:
+                os.replace(tmp_path, bundle_path)
+            except OSError:
+                # Published concurrently by another process
+                shutil.rmtree(tmp_path, ignore_errors=True)
+
+        manifest = {'bundle': bundle, 'arrays': sorted(arrays), 'meta': meta or {}}
+        tmp_manifest = self.manifest_path.with_name(f"{self.manifest_path.name}.tmp-{os.getpid()}")
+        tmp_manifest.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp_manifest, self.manifest_path)
+
+        self._remove_old_bundles(keep=bundle)
+        return self.manifest_path
+
+    def attach(self) -> Optional[Tuple[Dict, Dict[str, np.ndarray]]]:
+        """
+        Map the current bundle read-only.
+
+        Returns:
+            Tuple of (manifest metadata, array name -> read-only memmap),
+            or None if nothing is published
+        """
+        for _ in range(3):
+            try:
+                manifest = json.loads(self.manifest_path.read_text())
+                bundle_path = self.directory / manifest['bundle']
+                arrays = {
+                    key: np.load(bundle_path / f"{key}.npy", mmap_mode='r')
+                    for key in manifest['arrays']
+                }
+                return manifest['meta'], arrays
+            except FileNotFoundError:
+                # Not published, or a newer publish removed the bundle we read: retry
+                if not self.manifest_path.exists():
+                    return None
+        return None
+
+    def _remove_old_bundles(self, keep: str):
+        # Processes that still map an old bundle keep their (unlinked) pages
+        for path in self.directory.glob(f"{self.name}.*"):
+            if path.is_dir() and path.name != keep and '.tmp-' not in path.name:
+                shutil.rmtree(path, ignore_errors=True)
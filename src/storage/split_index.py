@@ -0,0 +1,244 @@
+"""
+Index-based train/val/test splits.
+
+Instead of three materialized copies of each featured dataset, a split is
+stored as one small '<lottery>_split_index' dataset: the int32 row positions
+into '<lottery>_featured' with a uint8 fold code (0 = train, 1 = val,
+2 = test), in split order. Hash splits store the fold of every draw_id
+instead, which does not depend on the row order of the featured data, so the
+folds of new draws are appended as part files. Splits are read as lazy views
+that project and filter the single featured dataset on demand. Materialized
+split files ('<lottery>_train', ...) remain an optional export and are still
+read when no index exists.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .dataset_store import DatasetStore
+from .schema import SPLIT_NAMES
+
+
+class SplitView:
+    """Lazy view of one split; nothing is read until read() is called."""
+
+    def __init__(self, index: 'SplitIndex', lottery_name: str, split_name: str):
+        self.index = index
+        self.lottery_name = lottery_name
+        self.split_name = split_name
+
+    def __len__(self) -> int:
+        return len(self.index.rows(self.lottery_name, self.split_name))
+
+    def __repr__(self) -> str:
+        return f"SplitView({self.lottery_name!r}, {self.split_name!r})"
+
+    def read(self, columns: Optional[Sequence[str]] = None, numbers: Optional[Sequence[int]] = None) -> pd.DataFrame:
+        """Materialize the view (see SplitIndex.read)."""
+        return self.index.read(self.lottery_name, self.split_name, columns, numbers)
+
+
+class SplitIndex:
+    """Persist and read train/val/test splits as row positions into featured data."""
+
+    def __init__(
+        self,
+        splits_dir: str = 'data/splits',
+        processed_dir: str = 'data/processed',
+        storage_format: str = 'parquet'
+    ):
+        """
+        Initialize the split index.
+
+        Args:
+            splits_dir: Directory holding split indices (and exported split files)
+            processed_dir: Directory holding the featured datasets
+            storage_format: 'parquet' or 'csv' for the index files
+        """
+        self.split_store = DatasetStore(splits_dir, storage_format, export_csv=False)
+        self.featured_store = DatasetStore(processed_dir, storage_format)
+
+    @staticmethod
+    def index_name(lottery_name: str) -> str:
+        return f"{lottery_name}_split_index"
+
+    def path(self, lottery_name: str) -> Path:
+        """Path of a lottery's index file."""
+        return self.split_store.path(self.index_name(lottery_name))
+
+    def has_index(self, lottery_name: str) -> bool:
+        return self.split_store.exists(self.index_name(lottery_name))
+
+    def exists(self, lottery_name: str, split_name: str = 'test') -> bool:
+        """Check whether a split can be read (from an index or an exported file)."""
+        return self.has_index(lottery_name) or self.split_store.exists(f"{lottery_name}_{split_name}")
+
+    def sources(self, lottery_name: str, split_name: str = 'test') -> List[Path]:
+        """Files a split is read from (to detect when a cached copy went stale)."""
+        if self.has_index(lottery_name):
+            return [
+                self.split_store.source_path(self.index_name(lottery_name)),
+                *self.split_store.part_paths(self.index_name(lottery_name)),
+                self.featured_store.source_path(f"{lottery_name}_featured")
+            ]
+        return [self.split_store.source_path(f"{lottery_name}_{split_name}")]
+
+    def lotteries(self, split_name: Optional[str] = None) -> List[str]:
+        """
+        Lotteries with a split index.
+
+        Args:
+            split_name: Also include lotteries with an exported file for this split
+        """
+        names = {name[:-len('_split_index')] for name in self.split_store.names('*_split_index')}
+        if split_name is not None:
+            suffix = f"_{split_name}"
+            names.update(name[:-len(suffix)] for name in self.split_store.names(f"*{suffix}"))
+        return sorted(names)
+
+    def write(self, lottery_name: str, rows: Dict[str, np.ndarray]) -> Path:
+        """
+        Persist the row positions of each split.
+
+        Args:
+            lottery_name: Name of the lottery
+            rows: Split name -> row positions into the featured dataset
+
+        Returns:
+            Path of the index file written
+        """
+        index = pd.DataFrame({
+            'row': np.concatenate([rows[name] for name in SPLIT_NAMES]),
+            'fold': np.repeat(np.arange(len(SPLIT_NAMES)), [len(rows[name]) for name in SPLIT_NAMES]),
+        })
+        return self.split_store.write(index, self.index_name(lottery_name))
+
+    def write_draws(self, lottery_name: str, draw_ids: np.ndarray, folds: np.ndarray) -> Path:
+        """
+        Persist the fold of each draw (hash splits).
+
+        Args:
+            lottery_name: Name of the lottery
+            draw_ids: Distinct draw identifiers
+            folds: Fold code (index into SPLIT_NAMES) of each draw
+
+        Returns:
+            Path of the index file written
+        """
+        return self.split_store.write(pd.DataFrame({'draw_id': draw_ids, 'fold': folds}), self.index_name(lottery_name))
+
+    def append_draws(self, lottery_name: str, draw_ids: np.ndarray, folds: np.ndarray) -> Path:
+        """Add the folds of new draws to a draw index without rewriting it."""
+        return self.split_store.append(pd.DataFrame({'draw_id': draw_ids, 'fold': folds}), self.index_name(lottery_name))
+
+    def draw_folds(self, lottery_name: str) -> Optional[pd.DataFrame]:
+        """Stored 'draw_id' -> 'fold' index of a lottery, or None if it has no draw index."""
+        if not self.has_index(lottery_name):
+            return None
+        index = self.split_store.read(self.index_name(lottery_name))
+        return index if 'draw_id' in index.columns else None
+
+    @staticmethod
+    def row_folds(index: pd.DataFrame, draw_ids: np.ndarray) -> np.ndarray:
+        """
+        Fold code of every row, looked up by its draw in a draw index.
+
+        Args:
+            index: 'draw_id' -> 'fold' index
+            draw_ids: draw_id of every row
+
+        Returns:
+            Fold codes aligned with draw_ids
+        """
+        order = np.argsort(index['draw_id'].to_numpy(), kind='stable')
+        known = index['draw_id'].to_numpy()[order]
+        folds = index['fold'].to_numpy()[order]
+
+        positions = np.searchsorted(known, draw_ids)
+        found = positions < len(known)
+        found[found] = known[positions[found]] == draw_ids[found]
+        if not found.all():
+            raise ValueError("Split index is missing draws of the featured data; rerun DataSplitter")
+        return folds[positions]
+
+    def rows(self, lottery_name: str, split_name: str) -> np.ndarray:
+        """Row positions of a split into the featured dataset, in split order."""
+        index = self.split_store.read(self.index_name(lottery_name))
+        if 'draw_id' in index.columns:
+            featured = self.featured_store.read(f"{lottery_name}_featured", columns=['draw_id'])
+            return self._rows(index, split_name, featured['draw_id'].to_numpy())
+        return self._rows(index, split_name)
+
+    @classmethod
+    def _rows(cls, index: pd.DataFrame, split_name: str, draw_ids: Optional[np.ndarray] = None) -> np.ndarray:
+        fold = SPLIT_NAMES.index(split_name)
+        if draw_ids is not None:
+            return np.flatnonzero(cls.row_folds(index, draw_ids) == fold)
+        return index['row'].to_numpy()[index['fold'].to_numpy() == fold]
+
+    def view(self, lottery_name: str, split_name: str) -> SplitView:
+        """Lazy view of a split."""
+        if split_name not in SPLIT_NAMES:
+            raise ValueError(f"Unknown split: {split_name}. Use one of {SPLIT_NAMES}")
+        return SplitView(self, lottery_name, split_name)
+
+    def views(self, lottery_name: str) -> Dict[str, SplitView]:
+        """Lazy views of all splits of a lottery."""
+        return {name: self.view(lottery_name, name) for name in SPLIT_NAMES}
+
+    def read(
+        self,
+        lottery_name: str,
+        split_name: str,
+        columns: Optional[Sequence[str]] = None,
+        numbers: Optional[Sequence[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Read a split.
+
+        With an index, only the requested columns of the featured dataset are
+        read and the split rows are taken from them; the number filter is
+        applied to the row positions before any rows are gathered. Without an
+        index, the exported split file is read.
+
+        Args:
+            lottery_name: Name of the lottery
+            split_name: 'train', 'val' or 'test'
+            columns: Columns to read (default: all)
+            numbers: Only rows for these numbers
+
+        Returns:
+            Split DataFrame in split order with a fresh RangeIndex
+        """
+        if not self.has_index(lottery_name):
+            return self.split_store.read(f"{lottery_name}_{split_name}", columns=columns, numbers=numbers)
+
+        index = self.split_store.read(self.index_name(lottery_name))
+        by_draw = 'draw_id' in index.columns
+
+        read_columns = list(columns) if columns is not None else None
+        if numbers is not None and read_columns is not None and 'number' not in read_columns:
+            read_columns.append('number')
+        if by_draw and read_columns is not None and 'draw_id' not in read_columns:
+            read_columns.append('draw_id')
+
+        featured = self.featured_store.read(f"{lottery_name}_featured", columns=read_columns)
+        if by_draw:
+            rows = self._rows(index, split_name, featured['draw_id'].to_numpy())
+        elif len(featured) != len(index):
+            raise ValueError(
+                f"Split index of {lottery_name} does not match its featured data; rerun DataSplitter"
+            )
+        else:
+            rows = self._rows(index, split_name)
+
+        if numbers is not None:
+            rows = rows[np.isin(featured['number'].to_numpy()[rows], list(numbers))]
+
+        df = featured.take(rows).reset_index(drop=True)
+        if columns is not None:
+            df = df[list(columns)]
+        return df
@@ -1,16 +1,35 @@
 """
 Generate comprehensive data quality report for all lottery datasets.
+
+Usage:
+    python -m src.utils.generate_reports
+    python -m src.utils.generate_reports --workers 4
 """
 
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from datetime import datetime
+import argparse
 import json
+from typing import Optional
+
+from src.storage import DatasetCatalog
+
 
+def generate_comprehensive_report(max_workers: Optional[int] = None):
+    """
+    Generate a comprehensive data quality report.
 
-def generate_comprehensive_report():
-    """Generate a comprehensive data quality report."""
+    Every section is answered from one summary per lottery. The dataset
+    catalog computes it in a single pass over each raw CSV, in parallel
+    across lotteries, and serves unchanged files from its manifest without
+    reading them.
+
+    Args:
+        max_workers: Worker processes for lotteries that need a recompute
+            (default: one per CPU)
+    """
 
     print("="*70)
     print("COMPREHENSIVE DATA QUALITY REPORT")
@@ -18,9 +37,12 @@ def generate_comprehensive_report():
     print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
 
-    data_dir = Path('data/raw')
-    csv_files = list(data_dir.glob('*.csv'))
-    csv_files = [f for f in csv_files if '_with_prizes' not in f.name]
+    catalog = DatasetCatalog('data/raw')
+    summaries = catalog.summaries(max_workers=max_workers)
+
+    nlb_lotteries = sum(1 for name in summaries if name.startswith('nlb_'))
+    dlb_lotteries = sum(1 for name in summaries if name.startswith('dlb_'))
+    total_lotteries = len(summaries)
 
     # Overall statistics
     total_draws = 0
@@ -33,12 +55,9 @@ def generate_comprehensive_report():
     print("1. DATASET OVERVIEW")
     print("="*70)
 
-    for csv_file in sorted(csv_files):
-        lottery_name = csv_file.stem
-        df = pd.read_csv(csv_file)
-
+    for lottery_name, summary in summaries.items():
         source = lottery_name.split('_')[0]  # 'nlb' or 'dlb'
-        draw_count = len(df)
+        draw_count = summary['rows']
 
         total_draws += draw_count
         if source == 'nlb':
@@ -46,24 +65,14 @@ def generate_comprehensive_report():
         else:
             dlb_draws += draw_count
 
-        # Parse numbers to get count
-        sample_numbers = df.iloc[0]['numbers'].split(';')
-        numbers_count = len(sample_numbers)
-
-        # Date range
-        df['draw_date'] = pd.to_datetime(df['draw_date'])
-        min_date = df['draw_date'].min().strftime('%Y-%m-%d')
-        max_date = df['draw_date'].max().strftime('%Y-%m-%d')
-        date_span = (df['draw_date'].max() - df['draw_date'].min()).days
-
         lottery_stats.append({
             'lottery': lottery_name,
             'source': source.upper(),
             'draws': draw_count,
-            'numbers_per_draw': numbers_count,
-            'min_date': min_date,
-            'max_date': max_date,
-            'date_span_days': date_span
+            'numbers_per_draw': summary['numbers_per_draw'],
+            'min_date': summary['min_date'],
+            'max_date': summary['max_date'],
+            'date_span_days': summary['date_span_days']
         })
 
     # Print table
@@ -84,19 +93,19 @@ def generate_comprehensive_report():
     print("="*70)
 
     print(f"\nNational Lotteries Board (NLB):")
-    print(f"  - Number of lotteries: 8")
+    print(f"  - Number of lotteries: {nlb_lotteries}")
     print(f"  - Total draws: {nlb_draws:,}")
-    print(f"  - Average draws per lottery: {nlb_draws/8:.1f}")
+    print(f"  - Average draws per lottery: {nlb_draws / max(nlb_lotteries, 1):.1f}")
 
     print(f"\nDevelopment Lotteries Board (DLB):")
-    print(f"  - Number of lotteries: 9")
+    print(f"  - Number of lotteries: {dlb_lotteries}")
     print(f"  - Total draws: {dlb_draws:,}")
-    print(f"  - Average draws per lottery: {dlb_draws/9:.1f}")
+    print(f"  - Average draws per lottery: {dlb_draws / max(dlb_lotteries, 1):.1f}")
 
     print(f"\nOverall:")
-    print(f"  - Total lotteries: 17")
+    print(f"  - Total lotteries: {total_lotteries}")
     print(f"  - Total draws: {total_draws:,}")
-    print(f"  - Average draws per lottery: {total_draws/17:.1f}")
+    print(f"  - Average draws per lottery: {total_draws / max(total_lotteries, 1):.1f}")
 
     print("\n" + "="*70)
     print("3. DATA COMPLETENESS")
@@ -105,12 +114,9 @@ def generate_comprehensive_report():
     total_cells = 0
     total_missing = 0
 
-    for csv_file in sorted(csv_files):
-        lottery_name = csv_file.stem
-        df = pd.read_csv(csv_file)
-
-        cells = df.size
-        missing = df.isnull().sum().sum()
+    for lottery_name, summary in summaries.items():
+        cells = summary['total_cells']
+        missing = summary['missing_cells']
 
         total_cells += cells
         total_missing += missing
@@ -130,15 +136,8 @@ def generate_comprehensive_report():
     print("4. DATE COVERAGE ANALYSIS")
     print("="*70)
 
-    all_dates = []
-    for csv_file in csv_files:
-        df = pd.read_csv(csv_file)
-        df['draw_date'] = pd.to_datetime(df['draw_date'])
-        all_dates.extend(df['draw_date'].tolist())
-
-    all_dates = pd.Series(all_dates)
-    global_min = all_dates.min()
-    global_max = all_dates.max()
+    global_min = pd.Timestamp(min(stat['min_date'] for stat in lottery_stats))
+    global_max = pd.Timestamp(max(stat['max_date'] for stat in lottery_stats))
     global_span = (global_max - global_min).days
 
     print(f"\nGlobal Date Range:")
@@ -162,25 +161,27 @@ def generate_comprehensive_report():
     print("5. NUMBER DISTRIBUTION ANALYSIS")
     print("="*70)
 
-    for csv_file in sorted(csv_files)[:3]:  # Sample first 3 lotteries
-        lottery_name = csv_file.stem
-        df = pd.read_csv(csv_file)
-
-        # Parse all numbers
-        all_numbers = []
-        for numbers_str in df['numbers']:
-            nums = [int(n) for n in str(numbers_str).split(';')]
-            all_numbers.extend(nums)
+    for lottery_name, summary in summaries.items():
+        if not summary['numbers_drawn']:
+            continue
 
-        all_numbers = np.array(all_numbers)
+        # Full distribution from the per-number histogram
+        histogram = np.array(summary['number_histogram'])
+        numbers = np.arange(len(histogram)) + summary['min_number']
+        drawn = histogram > 0
+        order = np.argsort(-histogram[drawn], kind='stable')
+        most = ', '.join(f"{n:02d} ({c})" for n, c in zip(numbers[drawn][order[:3]], histogram[drawn][order[:3]]))
+        least = ', '.join(f"{n:02d} ({c})" for n, c in zip(numbers[drawn][order[::-1][:3]], histogram[drawn][order[::-1][:3]]))
 
         print(f"\n{lottery_name}:")
-        print(f"  - Total numbers drawn: {len(all_numbers)}")
-        print(f"  - Unique numbers: {len(np.unique(all_numbers))}")
-        print(f"  - Range: {all_numbers.min()} to {all_numbers.max()}")
-        print(f"  - Mean: {all_numbers.mean():.2f}")
-        print(f"  - Median: {np.median(all_numbers):.2f}")
-        print(f"  - Std Dev: {all_numbers.std():.2f}")
+        print(f"  - Total numbers drawn: {summary['numbers_drawn']}")
+        print(f"  - Unique numbers: {summary['unique_numbers']}")
+        print(f"  - Range: {summary['min_number']} to {summary['max_number']}")
+        print(f"  - Mean: {summary['mean_number']:.2f}")
+        print(f"  - Median: {summary['median_number']:.2f}")
+        print(f"  - Std Dev: {summary['std_number']:.2f}")
+        print(f"  - Most drawn: {most}")
+        print(f"  - Least drawn: {least}")
 
     print("\n" + "="*70)
     print("6. SUMMARY")
@@ -188,7 +189,7 @@ def generate_comprehensive_report():
 
     print(f"""
 Dataset Collection Summary:
-- Successfully scraped 17 Sri Lankan lotteries (8 NLB + 9 DLB)
+- Successfully scraped {total_lotteries} Sri Lankan lotteries ({nlb_lotteries} NLB + {dlb_lotteries} DLB)
 - Total draws collected: {total_draws:,}
 - Data completeness: {completeness_rate:.2f}%
 - Date coverage: {global_span} days ({global_span/30:.1f} months)
@@ -209,7 +210,7 @@ Ready for Feature Engineering: YES
     # Save statistics to JSON
     stats_output = {
         'generated_at': datetime.now().isoformat(),
-        'total_lotteries': 17,
+        'total_lotteries': total_lotteries,
         'total_draws': total_draws,
         'nlb_draws': nlb_draws,
         'dlb_draws': dlb_draws,
@@ -232,4 +233,9 @@ Ready for Feature Engineering: YES
 
 
 if __name__ == '__main__':
-    generate_comprehensive_report()
+    parser = argparse.ArgumentParser(description='Comprehensive data quality report')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Parallel lottery workers (default: CPU count, 1 = no subprocesses)')
+    args = parser.parse_args()
+
+    generate_comprehensive_report(max_workers=args.workers)
@@ -0,0 +1,67 @@
+"""
+Report memory saved by the schema registry for every lottery dataset.
+
+Loads each cleaned, featured and split CSV the way consumers used to
+(plain pd.read_csv with default dtypes) and again through the registry
+schema, and records resident size before and after.
+
+Usage:
+    python -m src.utils.memory_report
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from src.storage import compact, memory_stats
+
+
+def generate_memory_report(data_dir: str = 'data', output_path: str = 'outputs/statistics/memory_report.json'):
+    """Measure default vs compact in-memory size of every dataset and save a JSON report."""
+    print("="*70)
+    print("SCHEMA MEMORY REPORT")
+    print("="*70)
+
+    report = {'datasets': {}, 'lotteries': {}}
+    total_before = 0.0
+    total_after = 0.0
+
+    print(f"\n{'Dataset':<40} {'Default MB':>11} {'Compact MB':>11} {'Ratio':>7}")
+    print("-"*72)
+
+    for subdir in ['processed', 'splits']:
+        for csv_file in sorted((Path(data_dir) / subdir).glob('*.csv')):
+            name = csv_file.stem
+            _, stats = compact(pd.read_csv(csv_file), name)
+            report['datasets'][f"{subdir}/{name}"] = stats
+
+            lottery = name.rsplit('_', 1)[0]
+            lottery_stats = report['lotteries'].setdefault(lottery, {'before_mb': 0.0, 'after_mb': 0.0})
+            lottery_stats['before_mb'] += stats['before_mb']
+            lottery_stats['after_mb'] += stats['after_mb']
+
+            total_before += stats['before_mb']
+            total_after += stats['after_mb']
+
+            print(f"{subdir + '/' + name:<40} {stats['before_mb']:>11.2f} {stats['after_mb']:>11.2f} {stats['ratio']:>6.1f}x")
+
+    for lottery, stats in report['lotteries'].items():
+        report['lotteries'][lottery] = memory_stats(stats['before_mb'] * 1024 * 1024, stats['after_mb'] * 1024 * 1024)
+
+    report['overall'] = memory_stats(total_before * 1024 * 1024, total_after * 1024 * 1024)
+
+    print("-"*72)
+    print(f"{'TOTAL':<40} {total_before:>11.2f} {total_after:>11.2f} {report['overall']['ratio']:>6.1f}x")
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nMemory report saved to: {output_path}")
+    return report
+
+
+if __name__ == '__main__':
+    generate_memory_report()
@@ -0,0 +1,97 @@
+"""
+One-shot migration of existing processed, featured and split CSVs to Parquet.
+
+Writes '<name>.parquet' next to every '<name>.csv' in data/processed and
+data/splits using the fixed storage schemas. CSV files are kept unless
+--delete-csv is given.
+
+Usage:
+    python -m src.utils.migrate_to_parquet
+    python -m src.utils.migrate_to_parquet --delete-csv
+"""
+
+import argparse
+from pathlib import Path
+
+from src.storage import DatasetStore
+from src.storage.dataset_store import HAS_PYARROW
+
+
+def migrate_directory(directory: Path, delete_csv: bool = False) -> tuple:
+    """
+    Convert every CSV dataset in a directory to Parquet.
+
+    Args:
+        directory: Directory containing CSV datasets
+        delete_csv: Remove each CSV after a successful conversion
+
+    Returns:
+        Tuple of (CSV bytes, Parquet bytes, datasets converted)
+    """
+    source = DatasetStore(directory, storage_format='csv')
+    target = DatasetStore(directory, storage_format='parquet', export_csv=False)
+
+    csv_bytes = 0
+    parquet_bytes = 0
+    converted = 0
+
+    for csv_file in sorted(directory.glob('*.csv')):
+        name = csv_file.stem
+        df = source.read(name)
+        parquet_path = target.write(df, name)
+
+        csv_size = csv_file.stat().st_size
+        parquet_size = parquet_path.stat().st_size
+        csv_bytes += csv_size
+        parquet_bytes += parquet_size
+        converted += 1
+
+        print(f"  [OK] {name:<40} {csv_size / 1024:>9.1f} KB -> {parquet_size / 1024:>8.1f} KB")
+
+        if delete_csv:
+            csv_file.unlink()
+
+    return csv_bytes, parquet_bytes, converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate lottery CSV datasets to Parquet')
+    parser.add_argument('--data-dir', type=str, default='data',
+                        help='Data root containing processed/ and splits/ (default: data)')
+    parser.add_argument('--delete-csv', action='store_true',
+                        help='Delete CSV files after conversion')
+    args = parser.parse_args()
+
+    if not HAS_PYARROW:
+        raise SystemExit("pyarrow is required for Parquet storage: pip install pyarrow")
+
+    print("="*70)
+    print("CSV -> PARQUET MIGRATION")
+    print("="*70)
+
+    total_csv = 0
+    total_parquet = 0
+    total_converted = 0
+
+    for subdir in ['processed', 'splits']:
+        directory = Path(args.data_dir) / subdir
+        if not directory.exists():
+            continue
+
+        print(f"\n{directory}:")
+        csv_bytes, parquet_bytes, converted = migrate_directory(directory, args.delete_csv)
+        total_csv += csv_bytes
+        total_parquet += parquet_bytes
+        total_converted += converted
+
+    print("\n" + "="*70)
+    print(f"Converted {total_converted} datasets")
+    print(f"  - CSV:     {total_csv / 1024 / 1024:.1f} MB")
+    print(f"  - Parquet: {total_parquet / 1024 / 1024:.1f} MB")
+    if total_parquet:
+        print(f"  - Ratio:   {total_csv / total_parquet:.1f}x smaller")
+    print("="*70)
+
+
+if __name__ == '__main__':
+    main()
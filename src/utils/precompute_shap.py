@@ -0,0 +1,114 @@
+"""
+Precompute SHAP explanations for every number the backend serves.
+
+Builds the same feature snapshots as the backend (last test-split row per
+number and lottery), scores and explains all rows in one batched
+predict_proba / shap_values call and stores them with ShapStore, so
+GET /explain becomes a lookup. Rerun after the model or the feature data
+changes; stale entries are ignored by the backend until then.
+
+Usage:
+    python -m src.utils.precompute_shap
+    python -m src.utils.precompute_shap --lotteries nlb_govisetha dlb_jayoda
+    python -m src.utils.precompute_shap --engine tree   # shap.TreeExplainer
+    python -m src.utils.run_pipeline --explain      # run after the pipeline
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from src.explainability import SHAP_ENGINES, create_shap_engine
+from src.pipeline.orchestrator import file_hash
+from src.storage import FeatureSnapshotStore, MODEL_FEATURES, ShapStore, SplitIndex, TREND_CODES
+
+DEFAULT_MODEL_PATH = 'models/best_model.cbm'
+
+
+def precompute_shap(
+    model_path: str = DEFAULT_MODEL_PATH,
+    data_dir: str = 'data',
+    output_path: str = ShapStore.DEFAULT_PATH,
+    lotteries: Optional[List[str]] = None,
+    engine: str = 'catboost'
+) -> Path:
+    """
+    Compute and store probabilities and SHAP values of every served feature row.
+
+    Args:
+        model_path: CatBoost model file
+        data_dir: Data root containing splits/ and processed/
+        output_path: ShapStore directory to publish to
+        lotteries: Only these lotteries (default: every lottery with a test split)
+        engine: SHAP engine, one of SHAP_ENGINES
+
+    Returns:
+        Path of the published manifest
+    """
+    # Imported here so the module can be imported without the model stack
+    from catboost import CatBoostClassifier
+
+    print("="*70)
+    print("PRECOMPUTING SHAP EXPLANATIONS")
+    print("="*70)
+
+    start = time.perf_counter()
+    model = CatBoostClassifier()
+    model.load_model(str(model_path))
+    explainer = create_shap_engine(model, engine)
+    print(f"[INFO] SHAP engine: {engine}")
+
+    split_index = SplitIndex(Path(data_dir) / 'splits', Path(data_dir) / 'processed')
+    snapshots = FeatureSnapshotStore(split_index, MODEL_FEATURES, categorical_maps={'trend': TREND_CODES})
+
+    names = lotteries or split_index.lotteries('test')
+    built = {}
+    for name in names:
+        try:
+            built[name] = snapshots.get(name)
+        except Exception as e:
+            print(f"  [ERROR] {name}: {e}")
+
+    if not built:
+        raise RuntimeError(f"No test splits found in {split_index.split_store.directory}")
+
+    # One batched call for every row of every lottery
+    matrix = np.concatenate([snapshot.matrix for snapshot in built.values()])
+    probabilities = model.predict_proba(matrix)[:, 1]
+
+    shap_values = explainer.shap_values(matrix)
+
+    entries = {}
+    offset = 0
+    for name, snapshot in built.items():
+        rows = slice(offset, offset + len(snapshot.numbers))
+        entries[name] = (snapshot.version, snapshot.numbers, probabilities[rows], shap_values[rows])
+        offset = rows.stop
+        print(f"  [OK] {name:<30} {len(snapshot.numbers):4d} numbers")
+
+    output_path = ShapStore.save(output_path, file_hash(Path(model_path))[:16], MODEL_FEATURES, entries)
+
+    print("-"*70)
+    print(f"[OK] {offset} rows from {len(entries)} lotteries in {time.perf_counter() - start:.2f}s")
+    print(f"[OK] Published to {output_path}")
+    print("="*70)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute SHAP explanations for the backend')
+    parser.add_argument('--lotteries', nargs='*', help='Only these lotteries (default: all with a test split)')
+    parser.add_argument('--model', type=str, default=DEFAULT_MODEL_PATH, help='CatBoost model file')
+    parser.add_argument('--data-dir', type=str, default='data', help='Data root directory (default: data)')
+    parser.add_argument('--output', type=str, default=ShapStore.DEFAULT_PATH, help='Output directory')
+    parser.add_argument('--engine', choices=sorted(SHAP_ENGINES), default='catboost', help='SHAP engine')
+    args = parser.parse_args()
+
+    precompute_shap(args.model, args.data_dir, args.output, args.lotteries, args.engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Publish the backend's feature snapshots as shared memory-mapped arrays.
+
+Builds the feature snapshot of every lottery (the last test-split row per
+number) once and writes them to data/serving, where every backend worker
+maps them read-only instead of reading the splits and holding a private
+copy. Rerun after the splits change; until then workers build private
+snapshots for lotteries whose split files no longer match.
+
+Usage:
+    python -m src.utils.publish_snapshots
+    python -m src.utils.publish_snapshots --lotteries nlb_govisetha dlb_jayoda
+    python -m src.utils.run_pipeline --publish      # run after the pipeline
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from src.storage import FeatureSnapshotStore, MODEL_FEATURES, SplitIndex, TREND_CODES
+
+
+def publish_snapshots(
+    data_dir: str = 'data',
+    shared_dir: Optional[str] = None,
+    lotteries: Optional[List[str]] = None
+) -> Path:
+    """
+    Build and publish the feature snapshots of every lottery.
+
+    Args:
+        data_dir: Data root containing splits/ and processed/
+        shared_dir: Directory to publish to (default: <data_dir>/serving)
+        lotteries: Only these lotteries (default: every lottery with a test split)
+
+    Returns:
+        Path of the published manifest
+    """
+    print("="*70)
+    print("PUBLISHING FEATURE SNAPSHOTS")
+    print("="*70)
+
+    start = time.perf_counter()
+    split_index = SplitIndex(Path(data_dir) / 'splits', Path(data_dir) / 'processed')
+    store = FeatureSnapshotStore(
+        split_index,
+        MODEL_FEATURES,
+        categorical_maps={'trend': TREND_CODES},
+        shared_dir=shared_dir or Path(data_dir) / 'serving'
+    )
+
+    names = lotteries or split_index.lotteries('test')
+    if not names:
+        raise RuntimeError(f"No test splits found in {split_index.split_store.directory}")
+
+    manifest = store.publish(names)
+
+    meta, arrays = store.shared.attach()
+    for name, entry in meta['lotteries'].items():
+        print(f"  [OK] {name:<30} {entry['rows']:4d} numbers")
+
+    print("-"*70)
+    print(f"[OK] {len(arrays['numbers'])} rows from {len(meta['lotteries'])} lotteries "
+          f"({arrays['matrix'].nbytes / 1024:.1f} KB) in {time.perf_counter() - start:.2f}s")
+    print(f"[OK] Published to {manifest}")
+    print("="*70)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Publish feature snapshots for the backend workers')
+    parser.add_argument('--lotteries', nargs='*', help='Only these lotteries (default: all with a test split)')
+    parser.add_argument('--data-dir', type=str, default='data', help='Data root directory (default: data)')
+    parser.add_argument('--output', type=str, help='Output directory (default: <data-dir>/serving)')
+    args = parser.parse_args()
+
+    publish_snapshots(args.data_dir, args.output, args.lotteries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+CLI to run the lottery data pipeline incrementally
+Usage:
+    python -m src.utils.run_pipeline                          # Recompute only what changed
+    python -m src.utils.run_pipeline --scrape                 # Scrape first, then refresh
+    python -m src.utils.run_pipeline --lotteries nlb_govisetha --force
+    python -m src.utils.run_pipeline --explain                # Also refresh precomputed SHAP values
+    python -m src.utils.run_pipeline --publish                # Also publish feature snapshots for the backend
+"""
+
+import argparse
+
+from src.pipeline import PipelineOrchestrator
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sri Lankan Lottery Data Pipeline')
+
+    parser.add_argument('--lotteries', nargs='*',
+                        help='Only run these lotteries (default: all)')
+
+    parser.add_argument('--scrape', action='store_true',
+                        help='Scrape the lottery websites before processing')
+
+    parser.add_argument('--force', action='store_true',
+                        help='Rerun every stage even if its inputs did not change')
+
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Parallel lottery workers (default: CPU count, 1 = no subprocesses)')
+
+    parser.add_argument('--incremental', action='store_true',
+                        help='Clean only newly scraped draws instead of rebuilding cleaned data')
+
+    parser.add_argument('--streaming', action='store_true',
+                        help='Use chunked streaming feature engineering')
+
+    parser.add_argument('--chunk-size', type=int, default=500,
+                        help='Draws per chunk in streaming mode (default: 500)')
+
+    parser.add_argument('--storage-format', choices=['parquet', 'csv'], default='parquet',
+                        help='Format of processed and split data (default: parquet)')
+
+    parser.add_argument('--no-csv', action='store_true',
+                        help='Do not export CSV copies next to Parquet files')
+
+    parser.add_argument('--no-export-splits', action='store_true',
+                        help='Write only the split index, not the train/val/test files the notebooks read')
+
+    parser.add_argument('--split-method', choices=['stratified', 'hash'], default='stratified',
+                        help='Random stratified split, or stable hash of (lottery, draw_id) (default: stratified)')
+
+    parser.add_argument('--db', type=str, default=None,
+                        help='Also load draws and features into this SQLite draw database')
+
+    parser.add_argument('--data-dir', type=str, default='data',
+                        help='Data root directory (default: data)')
+
+    parser.add_argument('--explain', action='store_true',
+                        help='Precompute SHAP explanations for the backend afterwards')
+
+    parser.add_argument('--publish', action='store_true',
+                        help='Publish feature snapshots for the backend workers afterwards')
+
+    args = parser.parse_args()
+
+    orchestrator = PipelineOrchestrator(
+        data_dir=args.data_dir,
+        scrape=args.scrape,
+        force=args.force,
+        max_workers=args.workers,
+        incremental=args.incremental,
+        streaming=args.streaming,
+        chunk_size=args.chunk_size,
+        storage_format=args.storage_format,
+        export_csv=not args.no_csv,
+        export_splits=not args.no_export_splits,
+        db_path=args.db,
+        split_params={'split_method': args.split_method}
+    )
+    orchestrator.run(args.lotteries)
+
+    if args.publish:
+        from src.utils.publish_snapshots import publish_snapshots
+        publish_snapshots(data_dir=args.data_dir)
+
+    if args.explain:
+        from src.utils.precompute_shap import precompute_shap
+        precompute_shap(data_dir=args.data_dir)
+
+
+if __name__ == "__main__":
+    main()
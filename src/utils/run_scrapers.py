@@ -29,6 +29,9 @@ def main():
     parser.add_argument('--output', type=str, default='data/raw',
                         help='Output directory (default: data/raw)')
 
+    parser.add_argument('--db', type=str, default=None,
+                        help='Also load draws into this SQLite draw database (e.g. data/lottery.db)')
+
     args = parser.parse_args()
 
     # List available lotteries
@@ -44,7 +47,7 @@ def main():
         return
 
     # Create scraper manager
-    manager = ScraperManager(output_dir=args.output)
+    manager = ScraperManager(output_dir=args.output, db_path=args.db)
 
     # Scrape all lotteries
     if args.all: